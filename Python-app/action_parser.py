@@ -0,0 +1,154 @@
+"""Single-pass, incremental parser for agent actions in LLM replies"""
+
+import re
+
+ACTIONS_MARKER = "ACTIONS:"
+# Actions the backend executes itself; only the first complete block of each is used
+BACKEND_ACTIONS = ["RECOMMEND_COURSES", "CREATE_LEARNING_PATH"]
+# Blocks of any other action type are ignored
+ACTION_TYPES = {"ADD_TO_CART", *BACKEND_ACTIONS}
+
+MAX_NAME_LEN = 64
+_TOKEN = re.compile(
+    r"ACTIONS:"
+    r"|\[(/?)ACTION:([A-Z][A-Z0-9_]{0,%d})\]"
+    r"|Learning Path:"
+    r"|Course Comparison" % (MAX_NAME_LEN - 1)
+)
+# Longest token the pattern can match; anything shorter than this from the end may still be incomplete
+MAX_TOKEN_LEN = len("[/ACTION:]") + MAX_NAME_LEN
+
+
+def _field(content, key):
+    """Value after `KEY:` up to the next `KEY:` (matches the original split-based parsing)"""
+    marker = key + ":"
+    start = content.find(marker)
+    if start == -1:
+        return None
+    start += len(marker)
+    end = content.find(marker, start)
+    return content[start:end if end != -1 else len(content)].strip()
+
+
+class ActionParser:
+    """Recognize every [ACTION:...] block and reply heuristic in one scan of the text
+
+    Text can be fed chunk by chunk as it streams in; each character is
+    tokenized once. close() returns the actions in the same order and shape
+    parse_actions has always produced: ADD_TO_CART blocks, RECOMMEND_COURSES,
+    CREATE_LEARNING_PATH, then the learning path and course comparison
+    detected from the reply body. Blocks only count inside the first
+    ACTIONS: section; blocks of other action types are ignored.
+    """
+
+    def __init__(self):
+        self._text = ""
+        self._scan_pos = 0
+        self._section_start = None
+        self._section_end = None
+        self._markers = []  # (position, end, is_close, action type) inside the ACTIONS section
+        self._learning_path_at = None
+        self._has_comparison = False
+
+    def feed(self, chunk):
+        self._text += chunk
+        self._scan(final=False)
+
+    def close(self):
+        self._scan(final=True)
+        return self._build_actions()
+
+    @classmethod
+    def parse(cls, text):
+        parser = cls()
+        parser.feed(text)
+        return parser.close()
+
+    def _scan(self, final):
+        limit = len(self._text) if final else len(self._text) - MAX_TOKEN_LEN
+        if limit <= self._scan_pos:
+            return
+        last_end = self._scan_pos
+        for match in _TOKEN.finditer(self._text, self._scan_pos):
+            if match.start() >= limit:
+                break
+            self._on_token(match)
+            last_end = match.end()
+        self._scan_pos = max(last_end, limit)
+
+    def _on_token(self, match):
+        token = match.group(0)
+        if token == ACTIONS_MARKER:
+            if self._section_start is None:
+                self._section_start = match.end()
+            elif self._section_end is None:
+                self._section_end = match.start()
+        elif token == "Learning Path:":
+            if self._learning_path_at is None:
+                self._learning_path_at = match.end()
+        elif token == "Course Comparison":
+            self._has_comparison = True
+        elif self._section_start is not None and self._section_end is None and match.group(2) in ACTION_TYPES:
+            self._markers.append((match.start(), match.end(), bool(match.group(1)), match.group(2)))
+
+    def _blocks(self):
+        """(action type, content) for each opening marker whose block holds a matching close, in text order"""
+        section_end = self._section_end if self._section_end is not None else len(self._text)
+        markers_by_type = {}
+        for marker in self._markers:
+            markers_by_type.setdefault(marker[3], []).append(marker)
+
+        blocks = []
+        for action_type, markers in markers_by_type.items():
+            opens = [m for m in markers if not m[2]]
+            for i, (start, end, _, _) in enumerate(opens):
+                block_end = opens[i + 1][0] if i + 1 < len(opens) else section_end
+                close = next((m for m in markers if m[2] and end <= m[0] and m[1] <= block_end), None)
+                if close is not None:
+                    blocks.append((start, action_type, self._text[end:close[0]]))
+        blocks.sort()
+        return [(action_type, content) for _, action_type, content in blocks]
+
+    def _build_actions(self):
+        client_actions = []
+        backend_actions = {}
+
+        if self._section_start is not None:
+            for action_type, content in self._blocks():
+                if action_type == "ADD_TO_CART":
+                    course_title = _field(content, "COURSE_TITLE")
+                    if course_title is not None:
+                        client_actions.append({"type": "ADD_TO_CART", "course_title": course_title})
+                elif action_type == "RECOMMEND_COURSES":
+                    backend_actions.setdefault(action_type, {
+                        "type": "RECOMMEND_COURSES",
+                        "executed": False  # Will be executed by backend
+                    })
+                elif action_type == "CREATE_LEARNING_PATH":
+                    backend_actions.setdefault(action_type, {
+                        "type": "CREATE_LEARNING_PATH",
+                        "career_goal": _field(content, "CAREER_GOAL") or "",
+                        "executed": False  # Will be executed by backend
+                    })
+
+        actions = client_actions
+        actions += [backend_actions[t] for t in BACKEND_ACTIONS if t in backend_actions]
+
+        if self._learning_path_at is not None:
+            start = self._learning_path_at
+            end = self._text.find("**", start)
+            if end == -1:
+                end = self._text.find("\n", start)
+            actions.append({
+                "type": "CREATE_LEARNING_PATH",
+                "career_goal": self._text[start:end].strip(),
+                "executed": True
+            })
+
+        if self._has_comparison:
+            actions.append({
+                "type": "COMPARE_COURSES",
+                "executed": True
+            })
+
+        return actions
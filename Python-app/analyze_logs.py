@@ -1,40 +1,111 @@
 #!/usr/bin/env python3
-"""AI Chatbot Log Analysis - Processes chat_logs.jsonl for AB report evaluation"""
+"""AI Chatbot Log Analysis - Processes chat_logs.jsonl and its sealed segments for AB report evaluation"""
 
+import os
 import json
+import re
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from pathlib import Path
 from collections import Counter
 
+from log_segments import list_segments, open_listed_segment, segment_id, overlaps, parse_timestamp
+from rollups import ActivityRollup, rollup_path, backfill
+from streaming_summary import StreamingSummary
+
 plt.style.use('seaborn-v0_8')
 sns.set_palette("husl")
 
+QUERY_TYPE_KEYWORDS = {
+    'Cart Action': ['add to cart', 'cart', 'buy', 'purchase', 'enroll'],
+    'Course Search': ['course', 'learn', 'recommend', 'show me', 'what courses'],
+    'General Question': ['what', 'how', 'why', 'help', 'explain'],
+    'Greeting': ['hello', 'hi', 'hey', 'good'],
+}
+QUERY_TYPE_PATTERNS = {
+    query_type: '|'.join(re.escape(kw) for kw in keywords)
+    for query_type, keywords in QUERY_TYPE_KEYWORDS.items()
+}
+# Nested per-row values, stored as JSON strings in the columnar cache
+NESTED_COLUMNS = ['db_context_summary', 'agent_actions', 'error']
+# Parallel loads split the live log into line-aligned ranges of at most this many bytes
+# (and at least MIN_CHUNK_BYTES, so small logs are not spread across the pool)
+CHUNK_BYTES = 32 * 1024 * 1024
+MIN_CHUNK_BYTES = 1024 * 1024
+LENGTH_QUANTILES = [0.5, 0.9, 0.95, 0.99]
+# Compact frames: low-cardinality strings as categoricals, nested values flattened into numeric columns
+CATEGORY_COLUMNS = ['user_email', 'user_name', 'status', 'query_type', 'date', 'error']
+TEXT_COLUMNS = ['user_prompt', 'model_response']
+TEXT_MODES = ('keep', 'drop', 'lazy')
+CONTEXT_PREFIX = 'context.'
+ACTION_PREFIX = 'actions.'
+
 class ChatLogAnalyzer:
-    def __init__(self, log_file_path="conversation_logs/chat_logs.jsonl"):
+    def __init__(self, log_file_path="conversation_logs/chat_logs.jsonl", cache_dir=None):
         self.log_file_path = Path(log_file_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else self.log_file_path.parent / ".analyzer_cache"
         self.df = None
+        self.rollup = None
+        self.memory_report = None
+        self._follow_state = None
         self.analysis_results = {}
         
-    def load_logs(self):
-        """Load and parse JSONL log file into DataFrame"""
-        logs = []
+    def load_logs(self, incremental=False, use_cache=False, columns=None, verify_hash=False,
+                  start=None, end=None, workers=1, compact=False, text='keep'):
+        """Load and parse the JSONL log and its rotated segments into a DataFrame
+
+        Rotated segments, sealed (compressed and listed in the manifest) or
+        not yet, are read in order before the live log file. `start` / `end`
+        keep only rows with start <= timestamp < end; sealed segments whose
+        manifest time range lies outside are not opened. With use_cache=True the parsed,
+        feature-extracted frame is kept as Parquet in cache_dir and reused
+        while the segments and the log's size and mtime (and SHA-1 with
+        verify_hash=True) are unchanged; `columns` then limits what is read
+        back. With incremental=True only lines appended or sealed since the
+        cached checkpoint are parsed and merged into the cached frame.
+        With workers > 1 the parsing runs in a process pool, one task per
+        segment and per line-aligned range of the live log.
+        
+        compact=True shrinks the loaded frame (see _compact) and reports its
+        memory before and after. `text` then decides what happens to the raw
+        prompt and response text: 'keep' stores it as Arrow strings, 'drop'
+        removes it, and 'lazy' removes it but keeps row ids so load_text()
+        can read it back from the Parquet cache (this implies use_cache).
+        """
+        if text not in TEXT_MODES:
+            raise ValueError(f"text must be one of {TEXT_MODES}, got {text!r}")
+        lazy_text = compact and text == 'lazy'
+        if incremental or use_cache or lazy_text:
+            loaded = self._load_cached(incremental, columns, verify_hash, start, end, workers, row_ids=lazy_text)
+        else:
+            loaded = self._load_plain(start, end, workers)
+        if loaded and compact:
+            try:
+                self.df = self._compact(self.df, text)
+            except Exception as e:
+                print(f"ERROR: Error compacting logs: {e}")
+                return False
+        return loaded
+    
+    def _load_plain(self, start=None, end=None, workers=1):
         try:
-            with open(self.log_file_path, 'r', encoding='utf-8') as f:
-                for line_num, line in enumerate(f, 1):
-                    try:
-                        logs.append(json.loads(line.strip()))
-                    except json.JSONDecodeError as e:
-                        print(f"Warning: Invalid JSON on line {line_num}: {e}")
+            sources = [(self.log_file_path, 0, 1, segment)
+                       for segment in list_segments(self.log_file_path) if overlaps(segment, start, end)]
+            if not sources and not self.log_file_path.exists():
+                raise FileNotFoundError(self.log_file_path)
+            sources.append((self.log_file_path, 0, 1, None))
+            frame, _, _, _ = self._parse_sources(sources, workers=workers)
             
-            if not logs:
+            if frame is None:
                 print("No logs found or all logs were invalid")
                 return False
                 
-            self.df = pd.DataFrame(logs)
-            self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
-            self._extract_features()
+            self.df = self._in_range(frame, start, end)
             
             print(f"Loaded {len(self.df)} conversation logs")
             return True
@@ -46,31 +117,494 @@ class ChatLogAnalyzer:
             print(f"ERROR: Error loading logs: {e}")
             return False
     
+    @staticmethod
+    def _in_range(df, start=None, end=None):
+        """Rows with start <= timestamp < end"""
+        if start is None and end is None:
+            return df
+        timestamps = df['timestamp']
+        keep = np.ones(len(df), dtype=bool)
+        for bound, before in ((start, False), (end, True)):
+            if bound is None:
+                continue
+            bound = pd.Timestamp(bound)
+            if bound.tzinfo is None:
+                bound = bound.tz_localize('UTC')
+            if timestamps.dt.tz is None:
+                bound = bound.tz_convert(None)
+            keep &= (timestamps < bound).to_numpy() if before else (timestamps >= bound).to_numpy()
+        df = df[keep].reset_index(drop=True)
+        for column in df.columns:
+            if isinstance(df[column].dtype, pd.CategoricalDtype):
+                df[column] = df[column].cat.remove_unused_categories()
+        return df
+    
+    def _compact(self, df, text='keep'):
+        """Memory-compact copy of an analyzer frame; prints and keeps (memory_report) its footprint
+
+        Low-cardinality strings become categoricals and counts are
+        downcast. db_context_summary becomes nullable Int32 `context.<key>`
+        columns and agent_actions becomes int16 `actions.<type>` counts,
+        with types in first-seen order. The raw text is handled as described
+        in load_logs.
+        """
+        before = df.memory_usage(deep=True)
+        df = df.copy()
+        for column in CATEGORY_COLUMNS:
+            if column in df.columns:
+                try:
+                    df[column] = df[column].astype('category')
+                except TypeError:
+                    # Unhashable values (e.g. structured errors) stay as objects
+                    pass
+        for column, dtype in (('hour', np.int8), ('action_count', np.int32),
+                              ('prompt_length', np.int32), ('response_length', np.int32)):
+            if column in df.columns and not df[column].isna().any():
+                df[column] = df[column].astype(dtype)
+        
+        if 'db_context_summary' in df.columns:
+            summaries = [summary if isinstance(summary, dict) else {} for summary in df['db_context_summary']]
+            keys = list(dict.fromkeys(key for summary in summaries for key in summary))
+            for key in keys:
+                df[CONTEXT_PREFIX + key] = pd.array([summary.get(key) for summary in summaries], dtype='Int32')
+            df = df.drop(columns='db_context_summary')
+        
+        if 'agent_actions' in df.columns:
+            rows, types = [], []
+            for row, actions in enumerate(df['agent_actions']):
+                for action in actions:
+                    rows.append(row)
+                    types.append(action.get('type', 'Unknown'))
+            codes, uniques = pd.factorize(pd.Series(types, dtype=object))
+            counts = np.zeros((len(df), len(uniques)), dtype=np.int16)
+            np.add.at(counts, (np.array(rows, dtype=np.int64), codes), 1)
+            for i, action_type in enumerate(uniques):
+                df[ACTION_PREFIX + str(action_type)] = counts[:, i]
+            df = df.drop(columns='agent_actions')
+        
+        for column in TEXT_COLUMNS:
+            if column in df.columns:
+                if text == 'keep':
+                    df[column] = df[column].astype('string[pyarrow]')
+                else:
+                    df = df.drop(columns=column)
+        
+        after = df.memory_usage(deep=True)
+        self.memory_report = pd.DataFrame({'before': before, 'after': after})
+        print(f"Compacted frame: {before.sum() / 1e6:.1f} MB -> {after.sum() / 1e6:.1f} MB "
+              f"({before.sum() / max(after.sum(), 1):.1f}x smaller, text={text})")
+        return df
+    
+    def load_text(self, columns=TEXT_COLUMNS):
+        """Raw text columns for the loaded rows, read back from the Parquet cache after a text='lazy' load"""
+        columns = list(columns)
+        if self.df is None:
+            print("ERROR: No data loaded. Call load_logs() first.")
+            return None
+        if all(column in self.df.columns for column in columns):
+            return self.df[columns]
+        if '_row' not in self.df.columns:
+            print("ERROR: Text was dropped; reload with text='keep' or text='lazy'")
+            return None
+        frame = pd.read_parquet(self.cache_dir / "frame.parquet", columns=columns)
+        return frame.iloc[self.df['_row'].to_numpy()].reset_index(drop=True)
+    
+    def _parse_lines(self, f, start_line=1, complete_only=False, source=None, errors=None):
+        """Parse JSON lines from a binary file object
+
+        Returns (logs, bytes consumed, next line number). With complete_only a
+        trailing line without a newline is left unconsumed, since the writer
+        may still be appending it. `source` names the segment in warnings;
+        with an `errors` list, (line number, message) pairs are collected
+        there instead of printed.
+        """
+        logs = []
+        consumed = 0
+        line_num = start_line
+        for line in f:
+            if complete_only and not line.endswith(b"\n"):
+                break
+            consumed += len(line)
+            try:
+                logs.append(json.loads(line.strip()))
+            except json.JSONDecodeError as e:
+                if errors is not None:
+                    errors.append((line_num, str(e)))
+                else:
+                    self._warn_invalid(line_num, source, e)
+            line_num += 1
+        return logs, consumed, line_num
+    
+    @staticmethod
+    def _warn_invalid(line_num, source, error):
+        where = f"line {line_num} of {source}" if source else f"line {line_num}"
+        print(f"Warning: Invalid JSON on {where}: {error}")
+    
+    def _parse_sources(self, sources, complete_only=False, workers=1):
+        """Parse (log path, byte offset, first line number, list_segments entry or None) sources into one frame
+
+        Returns (frame or None, rows parsed, live log offset, live log next
+        line number). complete_only applies to the live log. With workers > 1
+        the live log is split into line-aligned ranges and every range or
+        segment is parsed in a process pool; warnings are reported afterwards
+        with their line numbers in the whole file.
+        """
+        tasks = []
+        offset, line_num = 0, 1
+        for path, begin, first_line, segment in sources:
+            if segment:
+                tasks.append(((path, begin, None, segment, False), first_line))
+                continue
+            if not path.exists():
+                continue
+            end = path.stat().st_size
+            offset, line_num = begin, first_line
+            if end <= begin:
+                continue
+            parts = 1
+            if workers > 1:
+                parts = max(-(-(end - begin) // CHUNK_BYTES), min(workers * 4, (end - begin) // MIN_CHUNK_BYTES))
+            ranges = _line_ranges(path, begin, end, parts) if parts > 1 else [(begin, end)]
+            for i, (range_start, range_end) in enumerate(ranges):
+                last = i == len(ranges) - 1
+                tasks.append(((path, range_start, range_end, None, complete_only and last), first_line if i == 0 else None))
+        
+        if workers > 1 and len(tasks) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_parse_chunk, [task for task, _ in tasks]))
+        else:
+            results = [_parse_chunk(task) for task, _ in tasks]
+        
+        frames = []
+        rows = 0
+        next_line = 1
+        for ((path, range_start, _, segment, _), first_line), (frame, consumed, lines, errors) in zip(tasks, results):
+            if first_line is not None:
+                next_line = first_line
+            for relative_line, error in errors:
+                self._warn_invalid(next_line + relative_line - 1, segment and segment['file'], error)
+            next_line += lines
+            if frame is not None:
+                frames.append(frame)
+                rows += len(frame)
+            if segment is None:
+                offset, line_num = range_start + consumed, next_line
+        
+        if not frames:
+            return None, 0, offset, line_num
+        frame = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        return frame, rows, offset, line_num
+    
+    def _build_frame(self, logs):
+        df = pd.DataFrame(logs)
+        df['timestamp'] = pd.to_datetime(df['timestamp'])
+        previous, self.df = self.df, df
+        try:
+            self._extract_features()
+        finally:
+            df, self.df = self.df, previous
+        return df
+    
+    @staticmethod
+    def _head_fingerprint(path):
+        """Hash of a file's first complete line, which appends never change"""
+        try:
+            with open(path, 'rb') as f:
+                first_line = f.readline()
+        except FileNotFoundError:
+            return None
+        if not first_line.endswith(b"\n"):
+            return None
+        return hashlib.sha1(first_line).hexdigest()
+    
+    def _source_hash(self):
+        digest = hashlib.sha1()
+        with open(self.log_file_path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        return digest.hexdigest()
+    
+    def _read_cache_state(self):
+        state_path = self.cache_dir / "state.json"
+        if not state_path.exists() or not (self.cache_dir / "frame.parquet").exists():
+            return None
+        try:
+            with open(state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable cache state: {e}")
+            return None
+    
+    def _read_cached_frame(self, columns=None):
+        """Read the cached frame, decoding the JSON-encoded nested columns that were requested"""
+        df = pd.read_parquet(self.cache_dir / "frame.parquet", columns=columns)
+        for column in NESTED_COLUMNS:
+            if column in df.columns:
+                df[column] = [json.loads(value) for value in df[column]]
+        return df
+    
+    def _write_cache(self, state):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        frame = self.df.copy()
+        for column in NESTED_COLUMNS:
+            if column in frame.columns:
+                frame[column] = [json.dumps(value, ensure_ascii=False) for value in frame[column]]
+        frame_tmp = self.cache_dir / "frame.parquet.tmp"
+        state_tmp = self.cache_dir / "state.json.tmp"
+        frame.to_parquet(frame_tmp, index=False)
+        with open(state_tmp, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(frame_tmp, self.cache_dir / "frame.parquet")
+        os.replace(state_tmp, self.cache_dir / "state.json")
+    
+    def _sources_since(self, state, segments, head, size):
+        """Sources still to parse after a previous parse recorded in `state`
+
+        Returns (keep, sources): keep is True when the rows from that parse
+        are still valid and the sources only hold what was added since; it
+        is False (and sources is everything) with no state, or when segments
+        were rewritten or the live log was truncated or replaced.
+        """
+        names = [segment_id(segment['file']) for segment in segments]
+        # (log path, byte offset, first line number, segment or None for the live log)
+        all_sources = [(self.log_file_path, 0, 1, segment) for segment in segments]
+        all_sources.append((self.log_file_path, 0, 1, None))
+        if state is None:
+            return False, all_sources
+        known = [segment_id(name) for name in state.get('segments', [])]
+        new_segments = segments[len(known):]
+        
+        if known != names[:len(known)]:
+            print("Log segments changed; reloading from the start")
+            return False, all_sources
+        if not new_segments and state['head'] is not None and state['head'] == head and size >= state['offset']:
+            return True, [(self.log_file_path, state['offset'], state['line_num'], None)]
+        if new_segments and state['head'] is not None and new_segments[0].get('head') == state['head']:
+            print(f"Log rotated; reading remaining lines of {new_segments[0]['file']}")
+            first = all_sources[len(known)]
+            return True, [(first[0], state['offset'], state['line_num'], first[3])] + all_sources[len(known) + 1:]
+        if not state['offset']:
+            return True, all_sources[len(known):]
+        print("Log truncated or replaced; reloading from the start")
+        return False, all_sources
+    
+    def _load_cached(self, incremental, columns=None, verify_hash=False, start=None, end=None, workers=1,
+                     row_ids=False):
+        """Serve the cached frame if the logs are unchanged, otherwise (re)parse and refresh the cache
+
+        The cache always covers every segment, so time ranges are applied
+        to the frame. Incremental refreshes parse only segments sealed and
+        lines appended after the cached offset, handling rotation and
+        truncation. row_ids adds a `_row` column of positions in the cached
+        frame.
+        """
+        try:
+            state = self._read_cache_state()
+            segments = list_segments(self.log_file_path)
+            names = [segment_id(segment['file']) for segment in segments]
+            stat = self.log_file_path.stat() if self.log_file_path.exists() else None
+            size = stat.st_size if stat else 0
+            
+            known = [segment_id(name) for name in state.get('segments', [])] if state is not None else None
+            if known == names and state.get('source_size') == size \
+                    and state.get('source_mtime_ns') == (stat.st_mtime_ns if stat else None) \
+                    and (not verify_hash or state.get('source_sha1') == (self._source_hash() if stat else None)):
+                read_columns = columns
+                if columns is not None and (start is not None or end is not None) and 'timestamp' not in columns:
+                    read_columns = list(columns) + ['timestamp']
+                frame = self._read_cached_frame(read_columns)
+                if row_ids:
+                    frame['_row'] = np.arange(len(frame), dtype=np.int64)
+                self.df = self._in_range(frame, start, end)
+                if columns is not None:
+                    self.df = self.df[list(columns) + (['_row'] if row_ids else [])]
+                print(f"Loaded {len(self.df)} conversation logs from cache")
+                return True
+            
+            head = self._head_fingerprint(self.log_file_path)
+            keep, sources = self._sources_since(state if incremental else None, segments, head, size)
+            frame = self._read_cached_frame() if keep else None
+            
+            new_frame, new_rows, offset, line_num = self._parse_sources(sources, complete_only=True, workers=workers)
+            if new_frame is not None:
+                frame = new_frame if frame is None else pd.concat([frame, new_frame], ignore_index=True)
+            
+            if frame is None or frame.empty:
+                print("No logs found or all logs were invalid")
+                return False
+            
+            self.df = frame
+            self._write_cache({
+                'segments': names,
+                'head': head,
+                'offset': offset,
+                'line_num': line_num,
+                'source_size': size,
+                'source_mtime_ns': stat.st_mtime_ns if stat else None,
+                'source_sha1': self._source_hash() if verify_hash and stat else None,
+            })
+            if row_ids:
+                self.df = self.df.assign(_row=np.arange(len(self.df), dtype=np.int64))
+            self.df = self._in_range(self.df, start, end)
+            if columns is not None:
+                self.df = self.df[list(columns) + (['_row'] if row_ids else [])]
+            
+            print(f"Loaded {len(self.df)} conversation logs ({new_rows} new)")
+            return True
+            
+        except Exception as e:
+            print(f"ERROR: Error loading logs: {e}")
+            return False
+    
+    def follow_logs(self, columns=None):
+        """Append the rows written since the previous call to self.df, parsing only those
+
+        The first call loads every segment and the live log. Returns the
+        number of rows added (0 when the log is unchanged, checked with a
+        single stat) or None on error. If segments were rewritten or the log
+        was truncated or replaced, self.df is rebuilt and all its rows count
+        as added. Partial trailing lines wait for the next call.
+        """
+        try:
+            state = self._follow_state
+            stat = self.log_file_path.stat() if self.log_file_path.exists() else None
+            size = stat.st_size if stat else 0
+            mtime_ns = stat.st_mtime_ns if stat else None
+            if state is not None and state['source_size'] == size and state['source_mtime_ns'] == mtime_ns \
+                    and self.df is not None:
+                return 0
+            
+            segments = list_segments(self.log_file_path)
+            head = self._head_fingerprint(self.log_file_path)
+            keep, sources = self._sources_since(state, segments, head, size)
+            frame, rows, offset, line_num = self._parse_sources(sources, complete_only=True)
+            self._follow_state = {
+                'segments': [segment_id(segment['file']) for segment in segments],
+                'head': head,
+                'offset': offset,
+                'line_num': line_num,
+                'source_size': size,
+                'source_mtime_ns': mtime_ns,
+            }
+            if frame is not None and columns is not None:
+                frame = frame[columns]
+            if not keep or self.df is None:
+                self.df = frame
+            elif frame is not None:
+                self.df = pd.concat([self.df, frame], ignore_index=True)
+            return rows
+            
+        except Exception as e:
+            print(f"ERROR: Error following logs: {e}")
+            return None
+    
+    def load_rollup(self, rebuild=False):
+        """Load the write-time activity rollup instead of the raw log
+
+        generate_basic_stats, analyze_agent_actions and analyze_user_activity
+        answer from it while no frame is loaded. Rows logged since it was
+        last saved are counted in as well (without saving it; the writer
+        does that). Unique and top users are sketch estimates (see
+        ActivityRollup.error_bounds). rebuild=True recounts it from the raw
+        log and its segments first.
+        """
+        try:
+            if rebuild:
+                self.rollup = backfill(self.log_file_path)
+            else:
+                self.rollup = ActivityRollup.load(rollup_path(self.log_file_path))
+                self.rollup.catch_up(self.log_file_path)
+        except Exception as e:
+            print(f"ERROR: Error loading activity rollup: {e}")
+            return False
+        if not self.rollup.rows:
+            print("No conversations in the activity rollup")
+            self.rollup = None
+            return False
+        print(f"Loaded activity rollup of {self.rollup.rows} conversation logs")
+        return True
+    
+    def stream_logs(self, start=None, end=None):
+        """Summarize the log and its segments in one pass and bounded memory, without building a frame
+
+        Afterwards every analysis method and save_analysis_results answer
+        from the StreamingSummary. Unique users, top users and length
+        quantiles are sketch estimates (see StreamingSummary.error_bounds);
+        all other figures are exact. Segments outside start / end are
+        skipped as in load_logs.
+        """
+        summary = StreamingSummary(QUERY_TYPE_PATTERNS)
+        start_at = parse_timestamp(start) if start is not None else None
+        end_at = parse_timestamp(end) if end is not None else None
+        sources = [segment for segment in list_segments(self.log_file_path) if overlaps(segment, start, end)]
+        if self.log_file_path.exists() or not sources:
+            sources.append(None)
+        try:
+            for segment in sources:
+                name = segment and segment['file']
+                with (open_listed_segment(self.log_file_path, segment) if segment else open(self.log_file_path, 'rb')) as f:
+                    for line_num, line in enumerate(f, 1):
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError as e:
+                            self._warn_invalid(line_num, name, e)
+                            continue
+                        if (start_at is not None or end_at is not None) and entry.get('timestamp') is not None:
+                            when = parse_timestamp(entry['timestamp'])
+                            if (start_at is not None and when < start_at) or (end_at is not None and when >= end_at):
+                                continue
+                        summary.add(entry)
+        except FileNotFoundError:
+            print(f"ERROR: Log file not found: {self.log_file_path}")
+            return False
+        except Exception as e:
+            print(f"ERROR: Error streaming logs: {e}")
+            return False
+        
+        if not summary.rows:
+            print("No logs found or all logs were invalid")
+            return False
+        self.df = None
+        self.rollup = summary
+        print(f"Summarized {summary.rows} conversation logs in streaming mode")
+        return True
+    
+    def _from_rollup(self):
+        return self.df is None and self.rollup is not None
+    
     def _extract_features(self):
         """Extract additional features for analysis"""
-        def categorize_query(prompt):
-            prompt_lower = prompt.lower()
-            if any(kw in prompt_lower for kw in ['add to cart', 'cart', 'buy', 'purchase', 'enroll']):
-                return 'Cart Action'
-            elif any(kw in prompt_lower for kw in ['course', 'learn', 'recommend', 'show me', 'what courses']):
-                return 'Course Search'
-            elif any(kw in prompt_lower for kw in ['what', 'how', 'why', 'help', 'explain']):
-                return 'General Question'
-            elif any(kw in prompt_lower for kw in ['hello', 'hi', 'hey', 'good']):
-                return 'Greeting'
-            else:
-                return 'Other'
+        # Arrow-backed strings let lower/contains run as vectorized compute kernels
+        prompt_lower = self.df['user_prompt'].astype('string[pyarrow]').str.lower()
+        # First matching category wins, so masks are evaluated in priority order
+        masks = [prompt_lower.str.contains(pattern, regex=True).fillna(False).to_numpy(dtype=bool)
+                 for pattern in QUERY_TYPE_PATTERNS.values()]
+        self.df['query_type'] = np.select(masks, list(QUERY_TYPE_PATTERNS), default='Other')
         
-        self.df['query_type'] = self.df['user_prompt'].apply(categorize_query)
         self.df['hour'] = self.df['timestamp'].dt.hour
-        self.df['date'] = self.df['timestamp'].dt.date
-        self.df['has_agent_action'] = self.df['agent_actions'].apply(len) > 0
-        self.df['action_count'] = self.df['agent_actions'].apply(len)
+        # Few distinct days: convert each once instead of building a date per row
+        day_codes, days = pd.factorize(self.df['timestamp'].dt.floor('D'))
+        self.df['date'] = np.array([day.date() for day in days] + [None], dtype=object)[day_codes]
+        action_count = np.fromiter(map(len, self.df['agent_actions']), dtype=np.int64, count=len(self.df))
+        self.df['has_agent_action'] = action_count > 0
+        self.df['action_count'] = action_count
         self.df['prompt_length'] = self.df['user_prompt'].str.len()
         self.df['response_length'] = self.df['model_response'].str.len()
     
     def generate_basic_stats(self):
         """Generate basic statistics table"""
+        if self._from_rollup():
+            rollup = self.rollup
+            return {
+                'Total Conversations': rollup.rows,
+                'Unique Users': rollup.unique_users(),
+                'Success Rate': f"{rollup.status.get('success', 0) / rollup.rows:.1%}",
+                'Agent Actions Triggered': sum(rollup.with_actions.values()),
+                'Avg Prompt Length': f"{rollup.prompt_chars / rollup.rows:.1f} chars",
+                'Avg Response Length': f"{rollup.response_chars / rollup.rows:.1f} chars",
+                'Date Range': f"{parse_timestamp(rollup.first_timestamp).date()} to "
+                              f"{parse_timestamp(rollup.last_timestamp).date()}"
+            }
         if self.df is None:
             print("ERROR: No data loaded. Call load_logs() first.")
             return None
@@ -89,6 +623,14 @@ class ChatLogAnalyzer:
     
     def analyze_query_types(self):
         """Analyze distribution of query types"""
+        if self._from_rollup() and isinstance(self.rollup, StreamingSummary):
+            counts = sorted(self.rollup.query_types.items(), key=lambda item: -item[1])
+            query_counts = pd.Series([count for _, count in counts], name='count',
+                                     index=pd.Index([name for name, _ in counts], name='query_type'))
+            return pd.DataFrame({
+                'Count': query_counts,
+                'Percentage': (query_counts / self.rollup.rows * 100).round(1)
+            })
         if self.df is None:
             return None
         
@@ -102,6 +644,15 @@ class ChatLogAnalyzer:
     
     def analyze_agent_actions(self):
         """Analyze agent action effectiveness"""
+        if self._from_rollup():
+            with_actions = sum(self.rollup.with_actions.values())
+            success_rate = self.rollup.with_actions.get('success', 0) / with_actions if with_actions else float('nan')
+            return {
+                'Total Conversations': self.rollup.rows,
+                'Conversations with Actions': with_actions,
+                'Action Success Rate': f"{success_rate:.1%}",
+                'Total Actions': self.rollup.actions
+            }, dict(self.rollup.action_types)
         if self.df is None:
             return None
         
@@ -112,14 +663,45 @@ class ChatLogAnalyzer:
             'Total Actions': self.df['action_count'].sum()
         }
         
+        if 'agent_actions' not in self.df.columns:
+            # Compact frame: per-type count columns
+            action_columns = [column for column in self.df.columns if column.startswith(ACTION_PREFIX)]
+            totals = {column[len(ACTION_PREFIX):]: int(self.df[column].sum()) for column in action_columns}
+            return action_stats, {action_type: total for action_type, total in totals.items() if total}
+        
         action_types = [action.get('type', 'Unknown') 
                        for actions in self.df['agent_actions'] 
                        for action in actions]
         
         return action_stats, dict(Counter(action_types))
     
+    def analyze_lengths(self):
+        """Prompt and response length quantiles"""
+        if self._from_rollup() and isinstance(self.rollup, StreamingSummary):
+            return pd.DataFrame({
+                'prompt_length': self.rollup.prompt_lengths.quantiles(LENGTH_QUANTILES),
+                'response_length': self.rollup.response_lengths.quantiles(LENGTH_QUANTILES),
+            }, index=pd.Index(LENGTH_QUANTILES, name='quantile'))
+        if self.df is None:
+            return None
+        
+        quantiles = self.df[['prompt_length', 'response_length']].quantile(LENGTH_QUANTILES, interpolation='lower')
+        quantiles.index.name = 'quantile'
+        return quantiles
+    
     def analyze_user_activity(self):
         """Analyze user activity patterns"""
+        if self._from_rollup():
+            hourly = self.rollup.hourly()
+            daily = self.rollup.daily()
+            top_users = self.rollup.top_users(10)
+            return {
+                'hourly_activity': pd.Series(list(hourly.values()), index=pd.Index(list(hourly), name='hour')),
+                'daily_activity': pd.Series(list(daily.values()),
+                                            index=pd.Index([pd.Timestamp(day).date() for day in daily], name='date')),
+                'top_users': pd.Series([count for _, count in top_users], name='count',
+                                       index=pd.Index([user for user, _ in top_users], name='user_email'))
+            }
         if self.df is None:
             return None
         
@@ -140,11 +722,19 @@ class ChatLogAnalyzer:
                 f.write("=== Chatbot Analysis Statistics ===\n\n")
                 for key, value in stats.items():
                     f.write(f"{key}: {value}\n")
+                if self._from_rollup():
+                    f.write("\n=== Approximations (rollup / streaming mode) ===\n\n")
+                    for key, value in self.rollup.error_bounds().items():
+                        f.write(f"{key}: {value}\n")
         
         query_analysis = self.analyze_query_types()
         if query_analysis is not None:
             query_analysis.to_csv(output_path / "query_types.csv")
         
+        length_quantiles = self.analyze_lengths()
+        if length_quantiles is not None:
+            length_quantiles.to_csv(output_path / "length_quantiles.csv")
+        
         action_stats, action_types = self.analyze_agent_actions()
         if action_stats:
             with open(output_path / "agent_actions.txt", 'w') as f:
@@ -164,12 +754,90 @@ class ChatLogAnalyzer:
         print(f"Analysis results saved to {output_path}")
         return output_path
 
+def _read_until(f, end):
+    """Lines of f from its current position up to byte offset `end`"""
+    pos = f.tell()
+    while pos < end:
+        line = f.readline()
+        if not line:
+            break
+        pos += len(line)
+        yield line
+
+def _line_ranges(path, begin, end, parts):
+    """Split bytes [begin, end) of a file into up to `parts` ranges that start and end on line boundaries"""
+    bounds = [begin]
+    with open(path, 'rb') as f:
+        for i in range(1, parts):
+            f.seek(begin + (end - begin) * i // parts - 1)
+            f.readline()
+            pos = f.tell()
+            if pos >= end:
+                break
+            if pos > bounds[-1]:
+                bounds.append(pos)
+    bounds.append(end)
+    return list(zip(bounds, bounds[1:]))
+
+def _parse_chunk(task):
+    """Parse one range of a log file into a feature-extracted frame; runs in a worker process
+
+    Returns (frame or None, bytes consumed, lines consumed, [(line, error)])
+    with line numbers relative to the start of the range.
+    """
+    path, start, end, segment, complete_only = task
+    analyzer = ChatLogAnalyzer(path)
+    errors = []
+    try:
+        f = open_listed_segment(path, segment) if segment else open(path, 'rb')
+    except FileNotFoundError:
+        if segment is None:
+            raise
+        # Listed segment removed since
+        return None, 0, 0, errors
+    with f:
+        f.seek(start)
+        lines = f if end is None else _read_until(f, end)
+        logs, consumed, next_line = analyzer._parse_lines(lines, 1, complete_only, errors=errors)
+    return (analyzer._build_frame(logs) if logs else None), consumed, next_line - 1, errors
+
 def main():
     """Main function to run the analysis"""
+    parser = argparse.ArgumentParser(description="Analyze chatbot conversation logs")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Parse only lines appended since the last cached run")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Always re-parse the log instead of using the columnar cache")
+    parser.add_argument("--verify-hash", action="store_true",
+                        help="Also compare the log's SHA-1 before trusting the cache")
+    parser.add_argument("--since", help="Only analyze conversations at or after this ISO timestamp")
+    parser.add_argument("--until", help="Only analyze conversations before this ISO timestamp")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="Parse the log in this many processes")
+    parser.add_argument("--rollup", action="store_true",
+                        help="Answer activity stats from the write-time rollup without reading the log")
+    parser.add_argument("--rebuild-rollup", action="store_true",
+                        help="Recount the rollup from the raw log first (run while the app is stopped)")
+    parser.add_argument("--compact", action="store_true",
+                        help="Shrink the loaded frame (categoricals, flattened counts) and report its memory")
+    parser.add_argument("--text", choices=TEXT_MODES, default="keep",
+                        help="With --compact: keep, drop or lazily load the raw prompt/response text")
+    parser.add_argument("--streaming", action="store_true",
+                        help="One bounded-memory pass with sketches instead of loading a DataFrame")
+    args = parser.parse_args()
+    
     print("Starting Chat Log Analysis...")
     
     analyzer = ChatLogAnalyzer()
-    if not analyzer.load_logs():
+    if args.streaming:
+        if not analyzer.stream_logs(start=args.since, end=args.until):
+            return
+    elif args.rollup or args.rebuild_rollup:
+        if not analyzer.load_rollup(rebuild=args.rebuild_rollup):
+            return
+    elif not analyzer.load_logs(incremental=args.incremental, use_cache=not args.no_cache,
+                                verify_hash=args.verify_hash, start=args.since, end=args.until,
+                                workers=args.workers, compact=args.compact, text=args.text):
         return
     
     print("\nBasic Statistics:")
@@ -1,13 +1,27 @@
 import os
 import json
-import requests
+import time
+import heapq
+import threading
 from pathlib import Path
-from flask import Flask, request, jsonify
+from flask import Flask, Response, request, jsonify, stream_with_context
 from dotenv import load_dotenv
 from datetime import datetime
 
 load_dotenv(Path(__file__).parent / "flask.env")
 
+from llm_client import get_llm_client
+from log_writer import BackgroundLogWriter
+from rollups import ActivityRollup, ROLLUP_ENABLED, rollup_path
+from response_cache import ResponseCache, make_cache_key, CACHE_ENABLED
+from catalog_index import get_catalog_index, course_level
+from career_paths import CAREER_PATHS, match_career_path
+from context_packer import pack_db_context, course_words
+from action_parser import ActionParser
+from metrics import REGISTRY
+from coalesce import SingleFlight, COALESCE_ENABLED
+from catalog_store import CatalogStore, CatalogVersionMismatch, CATALOG_FILE, ADMIN_TOKEN_HEADER, authorize_catalog_write
+
 app = Flask(__name__)
 
 API_KEY = os.getenv("DEEPSEEK_API_KEY", "").strip()
@@ -15,13 +29,64 @@ API_URL = os.getenv("DEEPSEEK_API_URL", "").strip()
 MODEL = os.getenv("DEEPSEEK_MODEL", "").strip()
 TIMEOUT = int(os.getenv("LLM_TIMEOUT", "60"))
 MAX_CHARS = int(os.getenv("MAX_DB_CHARS", "12000"))
+MAX_TOKENS = int(os.getenv("MAX_DB_TOKENS", "0"))
 
 LOGS_DIR = Path(__file__).parent / "conversation_logs"
-LOGS_DIR.mkdir(exist_ok=True)
 LOG_FILE = LOGS_DIR / "chat_logs.jsonl"
+log_writer = None
+_log_writer_lock = threading.Lock()
+response_cache = ResponseCache() if CACHE_ENABLED else None
+llm_flights = SingleFlight() if COALESCE_ENABLED else None
+
+catalog_store = CatalogStore()
+if CATALOG_FILE:
+    try:
+        catalog_store.load_file(CATALOG_FILE)
+    except Exception as e:
+        print(f"Error loading catalog file {CATALOG_FILE}: {e}")
+
+CHAT_REQUESTS = REGISTRY.counter("chat_requests_total", "Chat requests by endpoint and HTTP status", ["endpoint", "status"])
+CHAT_ERRORS = REGISTRY.counter("chat_errors_total", "Chat requests that failed with an exception", ["endpoint"])
+STAGE_SECONDS = REGISTRY.histogram("chat_stage_seconds", "Time spent in each stage of a chat request", ["endpoint", "stage"])
+LLM_RESPONSES = REGISTRY.counter("llm_responses_total", "LLM API responses by HTTP status code", ["status_code"])
+PROMPT_CHARS = REGISTRY.histogram("chat_prompt_chars", "Characters of message content sent to the LLM", ["endpoint"],
+                                  buckets=(500, 1000, 2000, 4000, 8000, 12000, 16000, 24000, 32000, 64000))
+ACTIONS_PARSED = REGISTRY.counter("chat_actions_total", "Agent actions parsed from LLM replies", ["type"])
+REGISTRY.gauge_callback("llm_client_stats", "LLM HTTP client request and connection pool stats",
+                        lambda: get_llm_client().get_stats(), labelname="stat")
+REGISTRY.gauge_callback("log_writer_stats", "Background conversation log writer stats",
+                        lambda: log_writer.get_stats() if log_writer is not None else {}, labelname="stat")
+if llm_flights is not None:
+    REGISTRY.gauge_callback("llm_coalesce_stats", "Identical concurrent LLM calls sharing one upstream request",
+                            llm_flights.get_stats, labelname="stat")
+if response_cache is not None:
+    REGISTRY.gauge_callback("response_cache_stats", "LLM response cache stats",
+                            response_cache.get_stats, labelname="stat")
+
+def record_chat_metrics(endpoint, messages, actions):
+    """Count prompt size and parsed actions for one chat request"""
+    PROMPT_CHARS.observe(sum(len(m.get("content") or "") for m in messages), endpoint=endpoint)
+    for action in actions:
+        ACTIONS_PARSED.inc(type=action.get("type", "UNKNOWN"))
+
+def get_log_writer():
+    """Return the conversation log writer, creating it on first use
+
+    Creating it makes the log directory and starts the writer threads,
+    which seal leftover rotated files and catch the activity rollup up;
+    importing app itself touches no files.
+    """
+    global log_writer
+    if log_writer is None:
+        with _log_writer_lock:
+            if log_writer is None:
+                LOGS_DIR.mkdir(exist_ok=True)
+                rollup = ActivityRollup.load(rollup_path(LOG_FILE)) if ROLLUP_ENABLED else None
+                log_writer = BackgroundLogWriter(LOG_FILE, rollup=rollup)
+    return log_writer
 
 def log_conversation(log_data):
-    """Log conversation data to JSONL file"""
+    """Queue conversation data for the background JSONL log writer"""
     try:
         log_entry = {
             "timestamp": datetime.utcnow().isoformat() + "Z",
@@ -35,8 +100,7 @@ def log_conversation(log_data):
             "error": log_data.get("error", None)
         }
         
-        with open(LOG_FILE, "a", encoding="utf-8") as f:
-            f.write(json.dumps(log_entry, ensure_ascii=False) + "\n")
+        get_log_writer().submit(log_entry)
     except Exception as e:
         print(f"Error logging conversation: {e}")
 
@@ -285,32 +349,41 @@ If the answer is not present in the data, say you couldn't find it. Be concise a
 
 SYSTEM_PROMPT = IMPROVED_SYSTEM_PROMPT
 
-def build_messages(user_input, db_data, context=None, prompt_type="improved"):
-    def compact_courses(items):
-        out = []
-        for c in items or []:
-            out.append({
-                "title": c.get("title"),
-                "category": c.get("category"),
-                "duration": c.get("duration"),
-                "lessons_count": c.get("lessons_count"),
-                "rating": c.get("rating"),
-                "price": c.get("price"),
-                "instructor": c.get("instructor"),
-            })
-        return out
+def compact_courses(items):
+    """Keep only the course fields the LLM needs"""
+    out = []
+    for c in items or []:
+        out.append({
+            "title": c.get("title"),
+            "category": c.get("category"),
+            "duration": c.get("duration"),
+            "lessons_count": c.get("lessons_count"),
+            "rating": c.get("rating"),
+            "price": c.get("price"),
+            "instructor": c.get("instructor"),
+        })
+    return out
 
+def build_messages(user_input, db_data, context=None, prompt_type="improved", pack_report=None, catalog=None):
+    """Build the LLM message list; pass a dict as pack_report to receive context packing stats
+
+    With a CatalogSnapshot as catalog, its compacted courses and ranking
+    words are reused instead of being rebuilt from db_data["courses"] on
+    every request.
+    """
     context = context or []
     context_data = {
-        "courses": compact_courses(db_data.get("courses", [])),
+        "courses": catalog.derived("compact", compact_courses) if catalog is not None
+                   else compact_courses(db_data.get("courses", [])),
         "user_course": compact_courses(db_data.get("user_course", [])),
         "cart_products": compact_courses(db_data.get("cart_products", [])),
         "tasks": db_data.get("tasks", []),
     }
 
-    db_text = json.dumps(context_data, ensure_ascii=False, indent=2)
-    if len(db_text) > MAX_CHARS:
-        db_text = db_text[:MAX_CHARS] + "\n... (truncated)"
+    words = catalog.derived("words", course_words) if catalog is not None else None
+    db_text, report = pack_db_context(context_data, user_input, MAX_CHARS, MAX_TOKENS, words)
+    if pack_report is not None:
+        pack_report.update(report)
 
     selected_prompt = IMPROVED_SYSTEM_PROMPT if prompt_type == "improved" else NAIVE_SYSTEM_PROMPT
     messages = [{"role": "system", "content": selected_prompt}]
@@ -336,11 +409,28 @@ def build_messages(user_input, db_data, context=None, prompt_type="improved"):
 
     return messages
 
-def recommend_courses(user_courses, all_courses, user_input):
+def resolve_catalog(body, db_data):
+    """Swap in the server-side catalog when the request names a catalogVersion
+
+    Returns (db_data, snapshot); snapshot is None for requests that ship
+    their own dbData.courses. Raises CatalogVersionMismatch when the client
+    holds a different version than the one loaded.
+    """
+    requested = body.get("catalogVersion")
+    if requested is None:
+        return db_data, None
+    snapshot = catalog_store.snapshot()
+    if str(requested) != snapshot.version:
+        raise CatalogVersionMismatch(requested, snapshot.version)
+    return dict(db_data, courses=snapshot.courses), snapshot
+
+def recommend_courses(user_courses, all_courses, user_input, index=None):
     """Course Recommendation Engine - Personalized suggestions based on user's enrolled courses"""
     try:
+        index = index or get_catalog_index(all_courses)
         user_categories = set()
         user_instructors = set()
+        user_titles = set()
         user_levels = []
         
         for course in user_courses:
@@ -348,103 +438,76 @@ def recommend_courses(user_courses, all_courses, user_input):
                 user_categories.add(course['category'].lower())
             if course.get('instructor'):
                 user_instructors.add(course['instructor'].lower())
-            title = course.get('title', '').lower()
-            if any(word in title for word in ['beginner', 'intro', 'basic']):
-                user_levels.append('beginner')
-            elif any(word in title for word in ['advanced', 'master', 'expert']):
-                user_levels.append('advanced')
-            else:
-                user_levels.append('intermediate')
+            user_titles.add(course.get('title'))
+            user_levels.append(course_level(course.get('title', '').lower()))
+        
+        avg_level = max(set(user_levels), key=user_levels.count) if user_levels else None
+        
+        # Only courses matching a category, an instructor or the next level can reach score 2
+        candidates = set()
+        for category in user_categories:
+            candidates.update(index.by_category.get(category, ()))
+        for instructor in user_instructors:
+            candidates.update(index.by_instructor.get(instructor, ()))
+        candidates.update(index.next_step.get(avg_level, ()))
+        
+        step_courses = index.next_step.get(avg_level, ())
+        categories = index.categories_lower
+        instructors = index.instructors_lower
+        
+        def rank_key(pos):
+            score = ((3 if categories[pos] in user_categories else 0)
+                     + (2 if instructors[pos] in user_instructors else 0)
+                     + (2 if pos in step_courses else 0)
+                     + index.highly_rated[pos])
+            return (-score, pos)
+        
+        # Every candidate scores at least 2, so the top 3 by (score, catalog order) are the answer
+        top = heapq.nsmallest(3, (pos for pos in candidates if index.titles[pos] not in user_titles), key=rank_key)
         
         recommendations = []
-        for course in all_courses:
-            if any(uc.get('title') == course.get('title') for uc in user_courses):
-                continue
-            
+        for pos in top:
             score = 0
             reasons = []
             
-            course_category = course.get('category', '').lower()
+            course_category = categories[pos]
             if course_category in user_categories:
                 score += 3
                 reasons.append(f"Similar to your {course_category} courses")
             
-            course_instructor = course.get('instructor', '').lower()
-            if course_instructor in user_instructors:
+            if instructors[pos] in user_instructors:
                 score += 2
                 reasons.append(f"Same instructor as your other courses")
             
-            if user_levels:
-                avg_level = max(set(user_levels), key=user_levels.count)
-                course_title = course.get('title', '').lower()
-                if avg_level == 'beginner' and any(word in course_title for word in ['intermediate', 'advanced']):
-                    score += 2
-                    reasons.append("Good next step for your level")
-                elif avg_level == 'intermediate' and any(word in course_title for word in ['advanced', 'master']):
-                    score += 2
-                    reasons.append("Advanced course for your experience")
+            if avg_level == 'beginner' and pos in step_courses:
+                score += 2
+                reasons.append("Good next step for your level")
+            elif avg_level == 'intermediate' and pos in step_courses:
+                score += 2
+                reasons.append("Advanced course for your experience")
             
-            if course.get('rating', 0) >= 4.5:
+            if index.highly_rated[pos]:
                 score += 1
                 reasons.append("Highly rated course")
             
-            if score >= 2:
-                recommendations.append({
-                    'course': course,
-                    'score': score,
-                    'reasons': reasons[:2]
-                })
+            recommendations.append({
+                'course': all_courses[pos],
+                'score': score,
+                'reasons': reasons[:2]
+            })
         
-        recommendations.sort(key=lambda x: x['score'], reverse=True)
-        return recommendations[:3]
+        return recommendations
         
     except Exception as e:
         print(f"Error in recommend_courses: {e}")
         return []
 
-def create_learning_path(user_courses, all_courses, career_goal):
+def create_learning_path(user_courses, all_courses, career_goal, index=None):
     """Learning Path Planner - Creates structured learning paths for career goals"""
     try:
-        career_paths = {
-            'web development': ['web development', 'javascript', 'react', 'node.js', 'html', 'css', 'frontend', 'backend'],
-            'data science': ['data science', 'python', 'machine learning', 'statistics', 'analysis'],
-            'mobile development': ['mobile', 'ios', 'android', 'react native', 'flutter'],
-            'devops': ['devops', 'docker', 'kubernetes', 'aws', 'cloud', 'deployment'],
-            'ui/ux design': ['design', 'ui', 'ux', 'figma', 'photoshop', 'user experience']
-        }
-        
-        career_goal_lower = career_goal.lower()
-        relevant_path = None
-        for path, keywords in career_paths.items():
-            if any(keyword in career_goal_lower for keyword in keywords):
-                relevant_path = path
-                break
-        
-        if not relevant_path:
-            relevant_path = 'web development'
-        
-        relevant_categories = career_paths[relevant_path]
-        relevant_courses = []
-        
-        for course in all_courses:
-            course_category = course.get('category', '').lower()
-            course_title = course.get('title', '').lower()
-            
-            if any(cat in course_category or cat in course_title for cat in relevant_categories):
-                if any(word in course_title for word in ['beginner', 'intro', 'basic']):
-                    level = 'beginner'
-                elif any(word in course_title for word in ['advanced', 'master', 'expert']):
-                    level = 'advanced'
-                else:
-                    level = 'intermediate'
-                
-                relevant_courses.append({
-                    'course': course,
-                    'level': level,
-                    'relevance_score': sum(1 for cat in relevant_categories if cat in course_category or cat in course_title)
-                })
-        
-        relevant_courses.sort(key=lambda x: x['relevance_score'], reverse=True)
+        index = index or get_catalog_index(all_courses)
+        relevant_path = match_career_path(career_goal)
+        buckets = index.career_path_courses(CAREER_PATHS[relevant_path])
         
         learning_path = {
             'career_goal': career_goal,
@@ -452,17 +515,14 @@ def create_learning_path(user_courses, all_courses, career_goal):
             'steps': []
         }
         
-        beginner_courses = [c for c in relevant_courses if c['level'] == 'beginner'][:2]
-        intermediate_courses = [c for c in relevant_courses if c['level'] == 'intermediate'][:2]
-        advanced_courses = [c for c in relevant_courses if c['level'] == 'advanced'][:2]
-        
         step_num = 1
-        for level, courses in [('Foundation', beginner_courses), ('Intermediate', intermediate_courses), ('Advanced', advanced_courses)]:
-            if courses:
+        for level, bucket in [('Foundation', 'beginner'), ('Intermediate', 'intermediate'), ('Advanced', 'advanced')]:
+            positions = buckets[bucket][:2]
+            if positions:
                 learning_path['steps'].append({
                     'step': step_num,
                     'level': level,
-                    'courses': [c['course'] for c in courses],
+                    'courses': [all_courses[pos] for pos in positions],
                     'description': f"Build {level.lower()} skills in {relevant_path.title()}"
                 })
                 step_num += 1
@@ -473,40 +533,26 @@ def create_learning_path(user_courses, all_courses, career_goal):
         print(f"Error in create_learning_path: {e}")
         return None
 
-def compare_courses(course_titles, all_courses):
+def compare_courses(course_titles, all_courses, index=None):
     """Course Comparison Tool - Creates detailed comparison of multiple courses"""
     try:
         print(f"compare_courses called with titles: {course_titles}")
-        print(f"Available courses: {[c.get('title') for c in all_courses]}")
+        title_index = (index or get_catalog_index(all_courses)).title_index
         
-        found_courses = []
+        found_positions = []
         for title in course_titles:
-            title_lower = title.lower().strip()
-            best_match = None
+            # Best-ranked match that is not already part of the comparison
+            matches = title_index.match(title, limit=len(found_positions) + 1)
+            pos = next((p for p, _ in matches if p not in found_positions), None)
             
-            for course in all_courses:
-                course_title = course.get('title', '').lower().strip()
-                
-                if course_title == title_lower:
-                    best_match = course
-                    break
-                
-                if title_lower in course_title or course_title in title_lower:
-                    best_match = course
-                    break
-                
-                title_words = set(title_lower.split())
-                course_words = set(course_title.split())
-                if len(title_words & course_words) >= 2:
-                    best_match = course
-                    break
-            
-            if best_match and best_match not in found_courses:
-                found_courses.append(best_match)
-                print(f"Matched '{title}' to '{best_match.get('title')}'")
+            if pos is not None:
+                found_positions.append(pos)
+                print(f"Matched '{title}' to '{all_courses[pos].get('title')}'")
             else:
                 print(f"No match found for '{title}'")
         
+        found_courses = [all_courses[pos] for pos in found_positions]
+        
         print(f"Found {len(found_courses)} courses for comparison")
         
         if len(found_courses) < 2:
@@ -548,108 +594,281 @@ def compare_courses(course_titles, all_courses):
         print(f"Error in compare_courses: {e}")
         return None
 
+def resolve_cart_course(action, all_courses, index):
+    """Point an ADD_TO_CART action at the catalog course whose title best matches the requested one"""
+    try:
+        pos = index.title_index.best(action.get("course_title") or "")
+        if pos is None:
+            return
+        course = all_courses[pos]
+        if course.get("title") and course["title"] != action["course_title"]:
+            action["requested_title"] = action["course_title"]
+            action["course_title"] = course["title"]
+        if course.get("id") is not None:
+            action["course_id"] = course["id"]
+    except Exception as e:
+        print(f"Error resolving cart course: {e}")
+
 def parse_actions(response_text):
     """Extract actions from LLM response"""
-    actions = []
-    
-    if "ACTIONS:" in response_text and "[ACTION:ADD_TO_CART]" in response_text:
-        try:
-            action_section = response_text.split("ACTIONS:")[1]
-            action_blocks = action_section.split("[ACTION:ADD_TO_CART]")
-            
-            for block in action_blocks[1:]:
-                if "[/ACTION:ADD_TO_CART]" in block:
-                    action_content = block.split("[/ACTION:ADD_TO_CART]")[0]
-                    if "COURSE_TITLE:" in action_content:
-                        course_title = action_content.split("COURSE_TITLE:")[1].strip()
-                        actions.append({
-                            "type": "ADD_TO_CART",
-                            "course_title": course_title
-                        })
-        except Exception as e:
-            print(f"Error parsing ADD_TO_CART actions: {e}")
-    
-    if "ACTIONS:" in response_text and "[ACTION:RECOMMEND_COURSES]" in response_text:
-        try:
-            action_section = response_text.split("ACTIONS:")[1]
-            action_blocks = action_section.split("[ACTION:RECOMMEND_COURSES]")
-            
-            for block in action_blocks[1:]:
-                if "[/ACTION:RECOMMEND_COURSES]" in block:
-                    actions.append({
-                        "type": "RECOMMEND_COURSES",
-                        "executed": False  # Will be executed by backend
-                    })
-                    break
-        except Exception as e:
-            print(f"Error parsing RECOMMEND_COURSES actions: {e}")
-    
-    if "ACTIONS:" in response_text and "[ACTION:CREATE_LEARNING_PATH]" in response_text:
-        try:
-            action_section = response_text.split("ACTIONS:")[1]
-            action_blocks = action_section.split("[ACTION:CREATE_LEARNING_PATH]")
-            
-            for block in action_blocks[1:]:
-                if "[/ACTION:CREATE_LEARNING_PATH]" in block:
-                    action_content = block.split("[/ACTION:CREATE_LEARNING_PATH]")[0]
-                    career_goal = ""
-                    if "CAREER_GOAL:" in action_content:
-                        career_goal = action_content.split("CAREER_GOAL:")[1].strip()
-                    actions.append({
-                        "type": "CREATE_LEARNING_PATH",
-                        "career_goal": career_goal,
-                        "executed": False  # Will be executed by backend
-                    })
-                    break
-        except Exception as e:
-            print(f"Error parsing CREATE_LEARNING_PATH actions: {e}")
-    
-    if "**🗺️ Learning Path:" in response_text or "Learning Path:" in response_text:
-        career_goal = ""
-        if "Learning Path:" in response_text:
-            try:
-                start = response_text.find("Learning Path:") + len("Learning Path:")
-                end = response_text.find("**", start)
-                if end == -1:
-                    end = response_text.find("\n", start)
-                career_goal = response_text[start:end].strip()
-            except:
-                career_goal = "unknown"
-        
-        actions.append({
-            "type": "CREATE_LEARNING_PATH",
-            "career_goal": career_goal,
-            "executed": True
-        })
-    
-    if "**📊 Course Comparison**" in response_text or "Course Comparison" in response_text:
-        actions.append({
-            "type": "COMPARE_COURSES",
-            "executed": True
-        })
-    
-    return actions
+    return ActionParser.parse(response_text)
 
 def call_llm(messages):
     if not API_KEY:
         raise RuntimeError("DEEPSEEK_API_KEY missing in flask.env")
 
-    resp = requests.post(
-        API_URL,
-        headers={"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"},
-        json={"model": MODEL, "stream": False, "messages": messages},
-        timeout=TIMEOUT
-    )
+    try:
+        resp = get_llm_client().post(
+            API_URL,
+            headers={"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"},
+            json={"model": MODEL, "stream": False, "messages": messages},
+            timeout=TIMEOUT
+        )
+    except Exception:
+        LLM_RESPONSES.inc(status_code="error")
+        raise
+    LLM_RESPONSES.inc(status_code=resp.status_code)
     if resp.status_code != 200:
         raise RuntimeError(f"LLM HTTP {resp.status_code}: {resp.text}")
 
     data = resp.json()
     return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
 
+def call_llm_stream(messages):
+    """Yield reply text deltas as the LLM streams them (OpenAI-compatible SSE)"""
+    if not API_KEY:
+        raise RuntimeError("DEEPSEEK_API_KEY missing in flask.env")
+
+    try:
+        resp = get_llm_client().post(
+            API_URL,
+            headers={"Authorization": f"Bearer {API_KEY}", "Content-Type": "application/json"},
+            json={"model": MODEL, "stream": True, "messages": messages},
+            timeout=TIMEOUT,
+            stream=True
+        )
+    except Exception:
+        LLM_RESPONSES.inc(status_code="error")
+        raise
+    LLM_RESPONSES.inc(status_code=resp.status_code)
+    try:
+        if resp.status_code != 200:
+            raise RuntimeError(f"LLM HTTP {resp.status_code}: {resp.text}")
+
+        for line in resp.iter_lines(decode_unicode=True):
+            if not line or not line.startswith("data:"):
+                continue
+            data = line[len("data:"):].strip()
+            if data == "[DONE]":
+                break
+            delta = json.loads(data).get("choices", [{}])[0].get("delta", {}).get("content")
+            if delta:
+                yield delta
+    finally:
+        resp.close()
+
+def fetch_completion(cache_key, messages):
+    """Call the LLM and cache the reply - run once per key however many requests are waiting on it"""
+    reply = call_llm(messages)
+    if reply and response_cache is not None:
+        response_cache.put(cache_key, reply)
+    return reply
+
+def get_completion(messages, prompt_type, use_cache=True):
+    """Return the raw LLM reply, served from the response cache or a concurrent identical call when possible
+
+    use_cache=False always makes an independent upstream call.
+    """
+    if not use_cache:
+        if response_cache is not None:
+            response_cache.record_bypass()
+        return call_llm(messages)
+    if response_cache is None and llm_flights is None:
+        return call_llm(messages)
+
+    cache_key = make_cache_key(messages, prompt_type)
+    if response_cache is not None:
+        reply = response_cache.get(cache_key)
+        if reply is not None:
+            return reply
+    if llm_flights is None:
+        return fetch_completion(cache_key, messages)
+    return llm_flights.do(cache_key, fetch_completion, cache_key, messages)
+
+class ReplyStreamFilter:
+    """Forward streamed reply text up to (not including) the ACTIONS: section"""
+
+    MARKER = "ACTIONS:"
+
+    def __init__(self):
+        self.pending = ""
+        self.done = False
+
+    def feed(self, chunk):
+        if self.done:
+            return ""
+        text = self.pending + chunk
+        marker_pos = text.find(self.MARKER)
+        if marker_pos != -1:
+            self.done = True
+            self.pending = ""
+            return text[:marker_pos]
+
+        # Hold back a tail that could be the start of a marker split across chunks
+        hold = 0
+        for size in range(min(len(self.MARKER) - 1, len(text)), 0, -1):
+            if self.MARKER.startswith(text[-size:]):
+                hold = size
+                break
+        self.pending = text[len(text) - hold:] if hold else ""
+        return text[:len(text) - hold]
+
+    def flush(self):
+        text = "" if self.done else self.pending
+        self.pending = ""
+        return text
+
+def execute_actions(actions, db_data, user_input, catalog_version=None):
+    """Run backend agent actions that the reply requested and collect their results
+
+    catalog_version identifies db_data["courses"] so its index is looked up
+    by version instead of fingerprinting the catalog.
+    """
+    executed_results = []
+    courses = db_data.get("courses", [])
+    for action in actions:
+        if action.get("type") == "ADD_TO_CART" and courses:
+            try:
+                resolve_cart_course(action, courses, get_catalog_index(courses, catalog_version))
+            except Exception as e:
+                print(f"Error resolving cart course: {e}")
+        elif action.get("executed") == False:
+            result = None
+            try:
+                if action["type"] == "RECOMMEND_COURSES":
+                    result = recommend_courses(
+                        db_data.get("user_course", []), 
+                        courses, 
+                        user_input,
+                        get_catalog_index(courses, catalog_version)
+                    )
+                elif action["type"] == "CREATE_LEARNING_PATH":
+                    career_goal = action.get("career_goal", "")
+                    if career_goal:
+                        result = create_learning_path(
+                            db_data.get("user_course", []), 
+                            courses, 
+                            career_goal,
+                            get_catalog_index(courses, catalog_version)
+                        )
+                if result:
+                    executed_results.append({
+                        "type": action["type"],
+                        "result": result,
+                        "success": True
+                    })
+                    action["executed"] = True
+                    action["result"] = result
+            except Exception as e:
+                print(f"Error executing agent action {action['type']}: {e}")
+                executed_results.append({
+                    "type": action["type"],
+                    "error": str(e),
+                    "success": False
+                })
+    return executed_results
+
+def summarize_db_context(db_data, pack_report=None):
+    summary = {
+        "courses_count": len(db_data.get("courses", [])),
+        "user_courses_count": len(db_data.get("user_course", [])),
+        "cart_items_count": len(db_data.get("cart_products", [])),
+        "tasks_count": len(db_data.get("tasks", []))
+    }
+    if pack_report:
+        summary.update({
+            "packed_chars": pack_report.get("packed_chars", 0),
+            "courses_packed": pack_report.get("courses_packed", 0),
+            "courses_dropped": pack_report.get("courses_dropped", 0),
+        })
+    return summary
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
 @app.route("/health", methods=["GET"])
 def health():
     return jsonify({"status": "ok"})
 
+@app.route("/metrics", methods=["GET"])
+def metrics():
+    """Prometheus text exposition of request, stage latency and client metrics"""
+    return Response(REGISTRY.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+def expected_catalog_version(body):
+    """Version a catalog update is conditional on: body baseVersion or an If-Match header"""
+    if body.get("baseVersion") is not None:
+        return str(body["baseVersion"])
+    tags = request.if_match.as_set()
+    return next(iter(tags)) if len(tags) == 1 else None
+
+def catalog_update_response(snapshot, report=None):
+    response = jsonify(dict(report or {}, version=snapshot.version, count=len(snapshot.courses)))
+    response.set_etag(snapshot.version)
+    return response
+
+@app.route("/catalog", methods=["GET"])
+def get_catalog():
+    """Current server-side catalog; honours If-None-Match with a 304"""
+    snapshot = catalog_store.snapshot()
+    if snapshot.version in request.if_none_match:
+        response = Response(status=304)
+    else:
+        response = jsonify({"version": snapshot.version, "count": len(snapshot.courses), "courses": snapshot.courses})
+    response.set_etag(snapshot.version)
+    return response
+
+def catalog_write_refusal():
+    """Error response for an unauthorized catalog update, or None"""
+    refusal = authorize_catalog_write(request.headers.get(ADMIN_TOKEN_HEADER))
+    if refusal is None:
+        return None
+    status, message = refusal
+    return jsonify({"error": message}), status
+
+@app.route("/catalog", methods=["PUT"])
+def put_catalog():
+    """Replace the whole catalog with {"courses": [...]}; needs the admin token header"""
+    refusal = catalog_write_refusal()
+    if refusal is not None:
+        return refusal
+    body = request.get_json(silent=True)
+    courses = body.get("courses") if isinstance(body, dict) else body
+    try:
+        snapshot = catalog_store.replace(courses, expected_catalog_version(body if isinstance(body, dict) else {}))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except CatalogVersionMismatch as e:
+        return jsonify({"error": str(e), "version": e.current}), 412
+    return catalog_update_response(snapshot)
+
+@app.route("/catalog", methods=["PATCH"])
+def patch_catalog():
+    """Apply a delta {"upsert": [courses], "remove": [ids or titles]} to the catalog; needs the admin token header"""
+    refusal = catalog_write_refusal()
+    if refusal is not None:
+        return refusal
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify({"error": "expected a JSON object with upsert and/or remove"}), 400
+    try:
+        snapshot, report = catalog_store.apply_delta(body.get("upsert"), body.get("remove"), expected_catalog_version(body))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except CatalogVersionMismatch as e:
+        return jsonify({"error": str(e), "version": e.current}), 412
+    return catalog_update_response(snapshot, report)
+
 @app.route("/chat", methods=["POST"])
 def chat():
     user_email = ""
@@ -657,73 +876,52 @@ def chat():
     user_input = ""
     
     try:
-        body = request.get_json(silent=True) or {}
-        user_input = (body.get("userInput") or "").strip()
-        db_data = body.get("dbData", {}) or {}
-        context = body.get("context", [])  # Accept context history
-        prompt_type = body.get("promptType", "improved")
-        user_email = body.get("userEmail", "")
-        user_name = body.get("userName", "")
+        with STAGE_SECONDS.time(endpoint="chat", stage="parse_request"):
+            body = request.get_json(silent=True) or {}
+            user_input = (body.get("userInput") or "").strip()
+            db_data = body.get("dbData", {}) or {}
+            context = body.get("context", [])  # Accept context history
+            prompt_type = body.get("promptType", "improved")
+            user_email = body.get("userEmail", "")
+            user_name = body.get("userName", "")
+            use_cache = not body.get("noCache", False)
 
         if not user_input:
+            CHAT_REQUESTS.inc(endpoint="chat", status=400)
             return jsonify({"error": "userInput is required"}), 400
 
-        messages = build_messages(user_input, db_data, context, prompt_type)
-        reply = call_llm(messages) or "I couldn't generate a response."
-        actions = parse_actions(reply)
-        executed_results = []
-        for action in actions:
-            if action.get("executed") == False:
-                result = None
-                try:
-                    if action["type"] == "RECOMMEND_COURSES":
-                        result = recommend_courses(
-                            db_data.get("user_course", []), 
-                            db_data.get("courses", []), 
-                            user_input
-                        )
-                    elif action["type"] == "CREATE_LEARNING_PATH":
-                        career_goal = action.get("career_goal", "")
-                        if career_goal:
-                            result = create_learning_path(
-                                db_data.get("user_course", []), 
-                                db_data.get("courses", []), 
-                                career_goal
-                            )
-                    if result:
-                        executed_results.append({
-                            "type": action["type"],
-                            "result": result,
-                            "success": True
-                        })
-                        action["executed"] = True
-                        action["result"] = result
-                except Exception as e:
-                    print(f"Error executing agent action {action['type']}: {e}")
-                    executed_results.append({
-                        "type": action["type"],
-                        "error": str(e),
-                        "success": False
-                    })
+        try:
+            db_data, catalog = resolve_catalog(body, db_data)
+        except CatalogVersionMismatch as e:
+            CHAT_REQUESTS.inc(endpoint="chat", status=409)
+            return jsonify({"error": str(e), "catalogVersion": e.current}), 409
+        catalog_version = catalog.version if catalog is not None else None
+
+        pack_report = {}
+        with STAGE_SECONDS.time(endpoint="chat", stage="build_messages"):
+            messages = build_messages(user_input, db_data, context, prompt_type, pack_report, catalog)
+        with STAGE_SECONDS.time(endpoint="chat", stage="call_llm"):
+            reply = get_completion(messages, prompt_type, use_cache) or "I couldn't generate a response."
+        with STAGE_SECONDS.time(endpoint="chat", stage="parse_actions"):
+            actions = parse_actions(reply)
+        with STAGE_SECONDS.time(endpoint="chat", stage="execute_actions"):
+            executed_results = execute_actions(actions, db_data, user_input, catalog_version)
+        record_chat_metrics("chat", messages, actions)
         
         display_reply = reply.split("ACTIONS:")[0].strip() if "ACTIONS:" in reply else reply
-        db_context_summary = {
-            "courses_count": len(db_data.get("courses", [])),
-            "user_courses_count": len(db_data.get("user_course", [])),
-            "cart_items_count": len(db_data.get("cart_products", [])),
-            "tasks_count": len(db_data.get("tasks", []))
-        }
         
-        log_conversation({
-            "user_email": user_email,
-            "user_name": user_name,
-            "user_prompt": user_input,
-            "db_context_summary": db_context_summary,
-            "model_response": display_reply,
-            "agent_actions": actions,
-            "status": "success"
-        })
+        with STAGE_SECONDS.time(endpoint="chat", stage="log_conversation"):
+            log_conversation({
+                "user_email": user_email,
+                "user_name": user_name,
+                "user_prompt": user_input,
+                "db_context_summary": summarize_db_context(db_data, pack_report),
+                "model_response": display_reply,
+                "agent_actions": actions,
+                "status": "success"
+            })
         
+        CHAT_REQUESTS.inc(endpoint="chat", status=200)
         return jsonify({
             "reply": display_reply, 
             "actions": actions,
@@ -741,8 +939,116 @@ def chat():
             "status": "error",
             "error": str(e)
         })
+        CHAT_ERRORS.inc(endpoint="chat")
+        CHAT_REQUESTS.inc(endpoint="chat", status=500)
         return jsonify({"error": str(e)}), 500
 
+@app.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    """Streaming /chat - forwards reply tokens as SSE `token` events, then a final `done` event"""
+    with STAGE_SECONDS.time(endpoint="chat_stream", stage="parse_request"):
+        body = request.get_json(silent=True) or {}
+        user_input = (body.get("userInput") or "").strip()
+        db_data = body.get("dbData", {}) or {}
+        context = body.get("context", [])
+        prompt_type = body.get("promptType", "improved")
+        user_email = body.get("userEmail", "")
+        user_name = body.get("userName", "")
+        use_cache = not body.get("noCache", False)
+
+    if not user_input:
+        CHAT_REQUESTS.inc(endpoint="chat_stream", status=400)
+        return jsonify({"error": "userInput is required"}), 400
+
+    try:
+        db_data, catalog = resolve_catalog(body, db_data)
+    except CatalogVersionMismatch as e:
+        CHAT_REQUESTS.inc(endpoint="chat_stream", status=409)
+        return jsonify({"error": str(e), "catalogVersion": e.current}), 409
+    catalog_version = catalog.version if catalog is not None else None
+
+    def generate():
+        reply_parts = []
+        reply_filter = ReplyStreamFilter()
+        try:
+            pack_report = {}
+            with STAGE_SECONDS.time(endpoint="chat_stream", stage="build_messages"):
+                messages = build_messages(user_input, db_data, context, prompt_type, pack_report, catalog)
+
+            llm_started = time.perf_counter()
+            cache_key = None
+            cached = None
+            if response_cache is not None:
+                if use_cache:
+                    cache_key = make_cache_key(messages, prompt_type)
+                    cached = response_cache.get(cache_key)
+                else:
+                    response_cache.record_bypass()
+
+            action_parser = ActionParser()
+            deltas = [cached] if cached is not None else call_llm_stream(messages)
+            for delta in deltas:
+                reply_parts.append(delta)
+                action_parser.feed(delta)
+                visible = reply_filter.feed(delta)
+                if visible:
+                    yield sse_event("token", {"text": visible})
+            tail = reply_filter.flush()
+            if tail:
+                yield sse_event("token", {"text": tail})
+            # Includes the time spent writing tokens to the client as they arrive
+            STAGE_SECONDS.observe(time.perf_counter() - llm_started, endpoint="chat_stream", stage="call_llm")
+
+            reply = "".join(reply_parts).strip()
+            if cache_key and cached is None and reply:
+                response_cache.put(cache_key, reply)
+            with STAGE_SECONDS.time(endpoint="chat_stream", stage="parse_actions"):
+                actions = action_parser.close() if reply else []
+            reply = reply or "I couldn't generate a response."
+            with STAGE_SECONDS.time(endpoint="chat_stream", stage="execute_actions"):
+                executed_results = execute_actions(actions, db_data, user_input, catalog_version)
+            record_chat_metrics("chat_stream", messages, actions)
+            display_reply = reply.split("ACTIONS:")[0].strip() if "ACTIONS:" in reply else reply
+
+            with STAGE_SECONDS.time(endpoint="chat_stream", stage="log_conversation"):
+                log_conversation({
+                    "user_email": user_email,
+                    "user_name": user_name,
+                    "user_prompt": user_input,
+                    "db_context_summary": summarize_db_context(db_data, pack_report),
+                    "model_response": display_reply,
+                    "agent_actions": actions,
+                    "status": "success"
+                })
+            CHAT_REQUESTS.inc(endpoint="chat_stream", status=200)
+            yield sse_event("done", {
+                "reply": display_reply,
+                "actions": actions,
+                "executed_results": executed_results
+            })
+
+        except Exception as e:
+            log_conversation({
+                "user_email": user_email,
+                "user_name": user_name,
+                "user_prompt": user_input,
+                "db_context_summary": {},
+                "model_response": "",
+                "agent_actions": [],
+                "status": "error",
+                "error": str(e)
+            })
+            CHAT_ERRORS.inc(endpoint="chat_stream")
+            # Counted as the server error it is, as in /chat, although the stream's 200 headers are already sent
+            CHAT_REQUESTS.inc(endpoint="chat_stream", status=500)
+            yield sse_event("error", {"error": str(e)})
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 if __name__ == "__main__":
     app.run(
         host="0.0.0.0",
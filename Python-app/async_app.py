@@ -0,0 +1,268 @@
+"""Asyncio serving mode - the /chat, /catalog and /health contract on aiohttp with a non-blocking LLM client
+
+Run with `python async_app.py`. Prompt building, action parsing and agent
+actions are shared with app.py; being CPU-bound, they run on the default
+executor's threads (asyncio.to_thread) so a large catalog or reply never
+stalls the event loop. The LLM call awaits on the loop, so one process
+can hold many in-flight conversations instead of one worker thread per
+request.
+"""
+
+import os
+import asyncio
+from aiohttp import web, ClientError, ClientSession, ClientTimeout, TCPConnector
+
+import app as chat_app
+from app import (
+    build_messages, parse_actions, execute_actions, summarize_db_context, log_conversation, resolve_catalog,
+    make_cache_key, record_chat_metrics, catalog_store, STAGE_SECONDS, CHAT_REQUESTS, CHAT_ERRORS, LLM_RESPONSES
+)
+from catalog_store import CatalogVersionMismatch, ADMIN_TOKEN_HEADER, authorize_catalog_write
+from metrics import REGISTRY
+from coalesce import AsyncSingleFlight, COALESCE_ENABLED
+
+ASYNC_PORT = int(os.getenv("ASYNC_PORT", "8001"))
+ASYNC_BACKLOG = int(os.getenv("ASYNC_BACKLOG", "1024"))
+LLM_ASYNC_MAX_CONNECTIONS = int(os.getenv("LLM_ASYNC_MAX_CONNECTIONS", "256"))
+LLM_ASYNC_KEEPALIVE = float(os.getenv("LLM_ASYNC_KEEPALIVE", "30"))
+
+LLM_SESSION = web.AppKey("llm_session", ClientSession)
+
+llm_flights = AsyncSingleFlight() if COALESCE_ENABLED else None
+if llm_flights is not None:
+    REGISTRY.gauge_callback("llm_async_coalesce_stats", "Identical concurrent LLM calls sharing one upstream request",
+                            llm_flights.get_stats, labelname="stat")
+
+
+async def call_llm_async(session, messages):
+    """Non-blocking equivalent of app.call_llm"""
+    if not chat_app.API_KEY:
+        raise RuntimeError("DEEPSEEK_API_KEY missing in flask.env")
+
+    try:
+        async with session.post(
+            chat_app.API_URL,
+            headers={"Authorization": f"Bearer {chat_app.API_KEY}", "Content-Type": "application/json"},
+            json={"model": chat_app.MODEL, "stream": False, "messages": messages},
+            timeout=ClientTimeout(total=chat_app.TIMEOUT)
+        ) as resp:
+            LLM_RESPONSES.inc(status_code=resp.status)
+            if resp.status != 200:
+                raise RuntimeError(f"LLM HTTP {resp.status}: {await resp.text()}")
+            data = await resp.json(content_type=None)
+    except (ClientError, asyncio.TimeoutError):
+        LLM_RESPONSES.inc(status_code="error")
+        raise
+
+    return data.get("choices", [{}])[0].get("message", {}).get("content", "").strip()
+
+
+async def fetch_completion_async(session, cache_key, messages):
+    """Call the LLM and cache the reply - awaited by every request coalesced onto the same key"""
+    reply = await call_llm_async(session, messages)
+    if reply and chat_app.response_cache is not None:
+        chat_app.response_cache.put(cache_key, reply)
+    return reply
+
+
+async def get_completion_async(session, flights, messages, prompt_type, use_cache=True):
+    """Non-blocking equivalent of app.get_completion; flights is an AsyncSingleFlight or None"""
+    response_cache = chat_app.response_cache
+    if not use_cache:
+        if response_cache is not None:
+            response_cache.record_bypass()
+        return await call_llm_async(session, messages)
+    if response_cache is None and flights is None:
+        return await call_llm_async(session, messages)
+
+    cache_key = make_cache_key(messages, prompt_type)
+    if response_cache is not None:
+        reply = response_cache.get(cache_key)
+        if reply is not None:
+            return reply
+    if flights is None:
+        return await fetch_completion_async(session, cache_key, messages)
+    return await flights.do(cache_key, fetch_completion_async, session, cache_key, messages)
+
+
+async def read_json_body(request):
+    """Parse the request body like Flask's get_json(silent=True): None unless it is valid JSON"""
+    if request.content_type != "application/json":
+        return None
+    try:
+        return await request.json()
+    except ValueError:
+        return None
+
+
+async def health(request):
+    return web.json_response({"status": "ok"})
+
+
+async def metrics(request):
+    return web.Response(text=REGISTRY.render(), content_type="text/plain", charset="utf-8")
+
+
+def expected_catalog_version(request, body):
+    """Version a catalog update is conditional on: body baseVersion or an If-Match header"""
+    if body.get("baseVersion") is not None:
+        return str(body["baseVersion"])
+    if_match = request.if_match
+    return if_match[0].value if if_match and len(if_match) == 1 and not if_match[0].is_weak else None
+
+
+def catalog_response(snapshot, payload, status=200):
+    return web.json_response(payload, status=status, headers={"ETag": snapshot.etag})
+
+
+async def get_catalog(request):
+    snapshot = catalog_store.snapshot()
+    if any(tag.value in (snapshot.version, "*") for tag in request.if_none_match or ()):
+        return web.Response(status=304, headers={"ETag": snapshot.etag})
+    return catalog_response(snapshot, {"version": snapshot.version, "count": len(snapshot.courses),
+                                       "courses": snapshot.courses})
+
+
+def catalog_write_refusal(request):
+    """Error response for an unauthorized catalog update, or None"""
+    refusal = authorize_catalog_write(request.headers.get(ADMIN_TOKEN_HEADER))
+    if refusal is None:
+        return None
+    status, message = refusal
+    return web.json_response({"error": message}, status=status)
+
+
+async def put_catalog(request):
+    refusal = catalog_write_refusal(request)
+    if refusal is not None:
+        return refusal
+    body = await read_json_body(request)
+    courses = body.get("courses") if isinstance(body, dict) else body
+    try:
+        snapshot = catalog_store.replace(courses, expected_catalog_version(request, body if isinstance(body, dict) else {}))
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except CatalogVersionMismatch as e:
+        return web.json_response({"error": str(e), "version": e.current}, status=412)
+    return catalog_response(snapshot, {"version": snapshot.version, "count": len(snapshot.courses)})
+
+
+async def patch_catalog(request):
+    refusal = catalog_write_refusal(request)
+    if refusal is not None:
+        return refusal
+    body = await read_json_body(request)
+    if not isinstance(body, dict):
+        return web.json_response({"error": "expected a JSON object with upsert and/or remove"}, status=400)
+    try:
+        snapshot, report = catalog_store.apply_delta(
+            body.get("upsert"), body.get("remove"), expected_catalog_version(request, body)
+        )
+    except ValueError as e:
+        return web.json_response({"error": str(e)}, status=400)
+    except CatalogVersionMismatch as e:
+        return web.json_response({"error": str(e), "version": e.current}, status=412)
+    return catalog_response(snapshot, dict(report, version=snapshot.version, count=len(snapshot.courses)))
+
+
+async def chat(request):
+    user_email = ""
+    user_name = ""
+    user_input = ""
+
+    try:
+        with STAGE_SECONDS.time(endpoint="chat", stage="parse_request"):
+            body = await read_json_body(request) or {}
+            user_input = (body.get("userInput") or "").strip()
+            db_data = body.get("dbData", {}) or {}
+            context = body.get("context", [])
+            prompt_type = body.get("promptType", "improved")
+            user_email = body.get("userEmail", "")
+            user_name = body.get("userName", "")
+            use_cache = not body.get("noCache", False)
+
+        if not user_input:
+            CHAT_REQUESTS.inc(endpoint="chat", status=400)
+            return web.json_response({"error": "userInput is required"}, status=400)
+
+        try:
+            db_data, catalog = resolve_catalog(body, db_data)
+        except CatalogVersionMismatch as e:
+            CHAT_REQUESTS.inc(endpoint="chat", status=409)
+            return web.json_response({"error": str(e), "catalogVersion": e.current}, status=409)
+        catalog_version = catalog.version if catalog is not None else None
+
+        pack_report = {}
+        with STAGE_SECONDS.time(endpoint="chat", stage="build_messages"):
+            messages = await asyncio.to_thread(
+                build_messages, user_input, db_data, context, prompt_type, pack_report, catalog
+            )
+        with STAGE_SECONDS.time(endpoint="chat", stage="call_llm"):
+            reply = await get_completion_async(
+                request.app[LLM_SESSION], llm_flights, messages, prompt_type, use_cache
+            )
+            reply = reply or "I couldn't generate a response."
+        with STAGE_SECONDS.time(endpoint="chat", stage="parse_actions"):
+            actions = await asyncio.to_thread(parse_actions, reply)
+        with STAGE_SECONDS.time(endpoint="chat", stage="execute_actions"):
+            executed_results = await asyncio.to_thread(execute_actions, actions, db_data, user_input, catalog_version)
+        record_chat_metrics("chat", messages, actions)
+
+        display_reply = reply.split("ACTIONS:")[0].strip() if "ACTIONS:" in reply else reply
+
+        with STAGE_SECONDS.time(endpoint="chat", stage="log_conversation"):
+            log_conversation({
+                "user_email": user_email,
+                "user_name": user_name,
+                "user_prompt": user_input,
+                "db_context_summary": summarize_db_context(db_data, pack_report),
+                "model_response": display_reply,
+                "agent_actions": actions,
+                "status": "success"
+            })
+
+        CHAT_REQUESTS.inc(endpoint="chat", status=200)
+        return web.json_response({
+            "reply": display_reply,
+            "actions": actions,
+            "executed_results": executed_results
+        })
+
+    except Exception as e:
+        log_conversation({
+            "user_email": user_email,
+            "user_name": user_name,
+            "user_prompt": user_input,
+            "db_context_summary": {},
+            "model_response": "",
+            "agent_actions": [],
+            "status": "error",
+            "error": str(e)
+        })
+        CHAT_ERRORS.inc(endpoint="chat")
+        CHAT_REQUESTS.inc(endpoint="chat", status=500)
+        return web.json_response({"error": str(e)}, status=500)
+
+
+async def llm_session_context(application):
+    """Open one pooled LLM client session for the lifetime of the server"""
+    connector = TCPConnector(limit=LLM_ASYNC_MAX_CONNECTIONS, keepalive_timeout=LLM_ASYNC_KEEPALIVE)
+    application[LLM_SESSION] = ClientSession(connector=connector)
+    yield
+    await application[LLM_SESSION].close()
+
+
+def create_app():
+    application = web.Application()
+    application.cleanup_ctx.append(llm_session_context)
+    application.router.add_get("/health", health)
+    application.router.add_get("/metrics", metrics)
+    application.router.add_get("/catalog", get_catalog)
+    application.router.add_put("/catalog", put_catalog)
+    application.router.add_patch("/catalog", patch_catalog)
+    application.router.add_post("/chat", chat)
+    return application
+
+
+if __name__ == "__main__":
+    web.run_app(create_app(), host="0.0.0.0", port=ASYNC_PORT, backlog=ASYNC_BACKLOG)
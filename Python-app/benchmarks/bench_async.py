@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""Flask vs asyncio serving of /chat under stub-LLM latency
+
+The Flask app runs with a fixed pool of worker threads (like a threaded
+WSGI deployment), the aiohttp app on a single event loop. Each server runs
+in its own process; the load generator is an asyncio client that can keep
+thousands of requests in flight.
+"""
+
+import sys
+import time
+import asyncio
+import logging
+import argparse
+import tempfile
+import statistics
+import multiprocessing
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import aiohttp
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from results import write_results
+from stub_llm import StubLLMServer
+from synthetic import make_catalog, make_user_courses
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def configure_app(llm_url, log_dir):
+    import app
+    from log_writer import BackgroundLogWriter
+
+    app.API_KEY = app.API_KEY or "benchmark"
+    app.API_URL = llm_url
+    # Keep benchmark traffic out of the real conversation log
+    app.log_writer = BackgroundLogWriter(Path(log_dir) / "chat_logs.jsonl")
+    return app
+
+
+def serve_flask(port_queue, llm_url, log_dir, threads):
+    from werkzeug.serving import BaseWSGIServer
+
+    class PooledWSGIServer(BaseWSGIServer):
+        """Werkzeug server that handles connections on a fixed number of worker threads"""
+
+        request_queue_size = 1024
+
+        def __init__(self, *args, **kwargs):
+            super().__init__(*args, **kwargs)
+            self.pool = ThreadPoolExecutor(max_workers=threads)
+
+        def process_request(self, request, client_address):
+            self.pool.submit(self.handle_in_worker, request, client_address)
+
+        def handle_in_worker(self, request, client_address):
+            try:
+                self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            finally:
+                self.shutdown_request(request)
+
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    app = configure_app(llm_url, log_dir)
+    server = PooledWSGIServer("127.0.0.1", 0, app.app)
+    port_queue.put(server.server_port)
+    server.serve_forever()
+
+
+def serve_async(port_queue, llm_url, log_dir):
+    from aiohttp import web
+
+    configure_app(llm_url, log_dir)
+    import async_app
+
+    async def run():
+        runner = web.AppRunner(async_app.create_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0, backlog=4096)
+        await site.start()
+        port_queue.put(runner.addresses[0][1])
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+def start_server(target, *args):
+    ctx = multiprocessing.get_context("spawn")
+    port_queue = ctx.Queue()
+    process = ctx.Process(target=target, args=(port_queue, *args), daemon=True)
+    process.start()
+    return process, f"http://127.0.0.1:{port_queue.get(timeout=60)}"
+
+
+async def run_load(url, body, requests_count, concurrency, timeout):
+    semaphore = asyncio.Semaphore(concurrency)
+    connector = aiohttp.TCPConnector(limit=concurrency)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        async def one():
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    async with session.post(url, json=body) as resp:
+                        await resp.read()
+                        ok = resp.status == 200
+                except (aiohttp.ClientError, asyncio.TimeoutError):
+                    ok = False
+                return (time.perf_counter() - start) * 1000, ok
+
+        start = time.perf_counter()
+        samples = await asyncio.gather(*(one() for _ in range(requests_count)))
+        elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, _ in samples)
+    return {
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_rps": requests_count / elapsed,
+        "errors": sum(1 for _, ok in samples if not ok),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare Flask and aiohttp /chat serving against a stub LLM")
+    parser.add_argument("--requests", type=int, default=400)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[16, 64, 256])
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub LLM latency in seconds")
+    parser.add_argument("--flask-threads", type=int, default=16, help="Flask worker threads")
+    parser.add_argument("--catalog-size", type=int, default=50)
+    parser.add_argument("--timeout", type=float, default=120.0, help="Client timeout per request in seconds")
+    parser.add_argument("--output", default="benchmarks/results/async.json")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(latency=args.latency).start()
+    log_dir = tempfile.mkdtemp(prefix="async-bench-")
+
+    catalog = make_catalog(args.catalog_size)
+    body = {
+        "userInput": "recommend courses for me",
+        "userEmail": "bench@example.com",
+        "dbData": {"courses": catalog, "user_course": make_user_courses(catalog, 4), "cart_products": [], "tasks": []},
+        "noCache": True,
+    }
+
+    servers = {
+        f"flask[threads={args.flask_threads}]": (serve_flask, stub.url, log_dir, args.flask_threads),
+        "aiohttp": (serve_async, stub.url, log_dir),
+    }
+    results = {}
+    try:
+        for server_name, (target, *server_args) in servers.items():
+            process, base_url = start_server(target, *server_args)
+            try:
+                for concurrency in args.concurrency:
+                    name = f"{server_name}[c={concurrency},latency={args.latency}]"
+                    results[name] = asyncio.run(
+                        run_load(f"{base_url}/chat", body, args.requests, concurrency, args.timeout)
+                    )
+            finally:
+                process.terminate()
+                process.join()
+    finally:
+        stub.stop()
+
+    print(f"{'case':<42}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<42}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['throughput_rps']:>10.1f}{r['errors']:>8}")
+    write_results("async", results, args.output)
+
+if __name__ == "__main__":
+    main()
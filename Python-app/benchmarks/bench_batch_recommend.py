@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Benchmark - BatchRecommender vs calling recommend_courses once per user"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app import recommend_courses
+from batch_recommend import BatchRecommender
+from catalog_index import get_catalog_index
+from synthetic import make_catalog
+
+
+def make_users(catalog, count, seed=11):
+    rng = random.Random(seed)
+    return [rng.sample(catalog, rng.randint(0, 6)) for _ in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark batch recommendations")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--users", type=int, default=20_000)
+    parser.add_argument("--per-user-sample", type=int, default=500,
+                        help="Users scored one by one with recommend_courses (also checked for equal results)")
+    args = parser.parse_args()
+
+    print(f"{'catalog':>10}{'per-user users/s':>18}{'batch users/s':>15}{'speedup':>10}  match")
+    for size in args.sizes:
+        catalog = make_catalog(size)
+        users = make_users(catalog, args.users)
+        index = get_catalog_index(catalog)
+        sample = users[:args.per_user_sample]
+
+        start = time.perf_counter()
+        expected = [recommend_courses(user_courses, catalog, "", index=index) for user_courses in sample]
+        per_user_rate = len(sample) / (time.perf_counter() - start)
+
+        recommender = BatchRecommender(catalog)
+        start = time.perf_counter()
+        results = []
+        for i in range(0, len(users), recommender.block_size):
+            results.extend(recommender.recommend_block(users[i:i + recommender.block_size]))
+        batch_rate = len(users) / (time.perf_counter() - start)
+
+        print(f"{size:>10}{per_user_rate:>18,.0f}{batch_rate:>15,.0f}{batch_rate / per_user_rate:>9.1f}x"
+              f"  {results[:len(sample)] == expected}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""End-to-end /chat benchmark - the Flask app served locally against a stub LLM with configurable latency"""
+
+import sys
+import time
+import logging
+import argparse
+import tempfile
+import threading
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from werkzeug.serving import make_server
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import app
+from log_writer import BackgroundLogWriter
+from results import write_results
+from stub_llm import StubLLMServer
+from synthetic import make_catalog, make_user_courses
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(int(len(sorted_values) * fraction), len(sorted_values) - 1)]
+
+
+def start_app_server():
+    logging.getLogger("werkzeug").setLevel(logging.WARNING)
+    server = make_server("127.0.0.1", 0, app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+
+def run_load(url, body, requests_count, concurrency):
+    local = threading.local()
+
+    def one(_):
+        if not hasattr(local, "session"):
+            local.session = requests.Session()
+        start = time.perf_counter()
+        resp = local.session.post(url, json=body, timeout=120)
+        return (time.perf_counter() - start) * 1000, resp.status_code == 200
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        samples = list(pool.map(one, range(requests_count)))
+    elapsed = time.perf_counter() - start
+
+    latencies = sorted(ms for ms, _ in samples)
+    return {
+        "p50_ms": percentile(latencies, 0.50),
+        "p95_ms": percentile(latencies, 0.95),
+        "p99_ms": percentile(latencies, 0.99),
+        "mean_ms": statistics.fmean(latencies),
+        "throughput_rps": requests_count / elapsed,
+        "errors": sum(1 for _, ok in samples if not ok),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end /chat benchmark against a stub LLM")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--latency", type=float, default=0.05, help="Stub LLM latency in seconds")
+    parser.add_argument("--catalog-size", type=int, default=50)
+    parser.add_argument("--cache", action="store_true", help="Allow the response cache to serve replies")
+    parser.add_argument("--output", default="benchmarks/results/chat_e2e.json")
+    args = parser.parse_args()
+
+    stub = StubLLMServer(latency=args.latency).start()
+    app.API_KEY = app.API_KEY or "benchmark"
+    app.API_URL = stub.url
+    # Keep benchmark traffic out of the real conversation log
+    log_dir = tempfile.mkdtemp(prefix="chat-bench-")
+    app.log_writer = BackgroundLogWriter(Path(log_dir) / "chat_logs.jsonl")
+    server, base_url = start_app_server()
+
+    catalog = make_catalog(args.catalog_size)
+    user_courses = make_user_courses(catalog, 4)
+    body = {
+        "userInput": "recommend courses for me",
+        "userEmail": "bench@example.com",
+        "dbData": {"courses": catalog, "user_course": user_courses, "cart_products": [], "tasks": []},
+        "noCache": not args.cache,
+    }
+
+    results = {}
+    try:
+        for concurrency in args.concurrency:
+            name = f"chat[c={concurrency},latency={args.latency}]"
+            results[name] = run_load(f"{base_url}/chat", body, args.requests, concurrency)
+    finally:
+        server.shutdown()
+        stub.stop()
+        app.log_writer.close()
+
+    print(f"{'case':<32}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'errors':>8}")
+    for name, r in results.items():
+        print(f"{name:<32}{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}"
+              f"{r['throughput_rps']:>10.1f}{r['errors']:>8}")
+    write_results("chat_e2e", results, args.output)
+
+if __name__ == "__main__":
+    main()
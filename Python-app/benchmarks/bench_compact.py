@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Benchmark - ChatLogAnalyzer frame memory, default vs compact (text kept as Arrow strings, dropped, lazy)"""
+
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analyze_logs import ChatLogAnalyzer
+from synthetic import make_log_entries
+
+
+def timed_load(log_path, **kwargs):
+    analyzer = ChatLogAnalyzer(log_path)
+    began = time.perf_counter()
+    analyzer.load_logs(**kwargs)
+    return analyzer, time.perf_counter() - began
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark compact analyzer frames")
+    parser.add_argument("--rows", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = Path(tmp) / "chat_logs.jsonl"
+        with open(log_path, "w", encoding="utf-8") as f:
+            for entry in make_log_entries(args.rows):
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+        default, default_s = timed_load(log_path)
+        default_mb = default.df.memory_usage(deep=True).sum() / 1e6
+        baseline = default.analyze_agent_actions()
+        default.df = None
+
+        print(f"\n{args.rows:,} rows")
+        print(f"{'frame':>14}{'MB':>10}{'smaller':>9}{'load s':>9}  same actions")
+        print(f"{'default':>14}{default_mb:>10.1f}{1:>8.1f}x{default_s:>9.2f}")
+        for text in ("keep", "drop", "lazy"):
+            compact, seconds = timed_load(log_path, compact=True, text=text)
+            mb = compact.memory_report["after"].sum() / 1e6
+            print(f"{'compact/' + text:>14}{mb:>10.1f}{default_mb / mb:>8.1f}x{seconds:>9.2f}"
+                  f"  {compact.analyze_agent_actions() == baseline}")
+            if text == "drop":
+                report = compact.memory_report
+
+        print("\nper column MB (text=drop)")
+        for column, (before, after) in report.fillna(0).iterrows():
+            print(f"{column:>30}{before / 1e6:>10.2f}{after / 1e6:>10.2f}")
+
+if __name__ == "__main__":
+    main()
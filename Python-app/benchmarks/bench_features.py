@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark - vectorized ChatLogAnalyzer._extract_features vs the per-row .apply version"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analyze_logs import ChatLogAnalyzer
+from synthetic import make_log_rows
+
+
+def legacy_extract_features(df):
+    """The per-row implementation, kept here as the reference for outputs and speed"""
+    def categorize_query(prompt):
+        prompt_lower = prompt.lower()
+        if any(kw in prompt_lower for kw in ['add to cart', 'cart', 'buy', 'purchase', 'enroll']):
+            return 'Cart Action'
+        elif any(kw in prompt_lower for kw in ['course', 'learn', 'recommend', 'show me', 'what courses']):
+            return 'Course Search'
+        elif any(kw in prompt_lower for kw in ['what', 'how', 'why', 'help', 'explain']):
+            return 'General Question'
+        elif any(kw in prompt_lower for kw in ['hello', 'hi', 'hey', 'good']):
+            return 'Greeting'
+        else:
+            return 'Other'
+
+    df['query_type'] = df['user_prompt'].apply(categorize_query)
+    df['hour'] = df['timestamp'].dt.hour
+    df['date'] = df['timestamp'].dt.date
+    df['has_agent_action'] = df['agent_actions'].apply(len) > 0
+    df['action_count'] = df['agent_actions'].apply(len)
+    df['prompt_length'] = df['user_prompt'].str.len()
+    df['response_length'] = df['model_response'].str.len()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark feature extraction")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1_000_000, 10_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>12}{'legacy rows/s':>16}{'vectorized rows/s':>20}{'speedup':>10}  match")
+    for rows in args.rows:
+        base = make_log_rows(rows)
+
+        legacy = base.copy()
+        start = time.perf_counter()
+        legacy_extract_features(legacy)
+        legacy_s = time.perf_counter() - start
+
+        analyzer = ChatLogAnalyzer()
+        analyzer.df = base.copy()
+        start = time.perf_counter()
+        analyzer._extract_features()
+        vectorized_s = time.perf_counter() - start
+
+        columns = ['query_type', 'hour', 'date', 'has_agent_action', 'action_count', 'prompt_length', 'response_length']
+        match = all((legacy[c].to_numpy() == analyzer.df[c].to_numpy()).all() for c in columns)
+        print(f"{rows:>12}{rows / legacy_s:>16,.0f}{rows / vectorized_s:>20,.0f}"
+              f"{legacy_s / vectorized_s:>9.1f}x  {match}")
+
+if __name__ == "__main__":
+    main()
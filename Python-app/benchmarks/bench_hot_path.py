@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Micro-benchmarks for the /chat hot path on synthetic catalogs and replies of increasing size"""
+
+import io
+import sys
+import time
+import argparse
+import statistics
+import contextlib
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import app
+from results import write_results
+from synthetic import make_catalog, make_user_courses, make_reply
+
+
+def measure(fn, repeat, min_time=0.2):
+    """Median milliseconds per call, repeating until at least min_time has been spent"""
+    samples = []
+    spent = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        while len(samples) < repeat or spent < min_time:
+            start = time.perf_counter()
+            fn()
+            elapsed = time.perf_counter() - start
+            samples.append(elapsed * 1000)
+            spent += elapsed
+            if len(samples) >= 1000:
+                break
+    return {"median_ms": statistics.median(samples), "min_ms": min(samples), "runs": len(samples)}
+
+
+def run(sizes, reply_rows, repeat):
+    results = {}
+    for size in sizes:
+        catalog = make_catalog(size)
+        user_courses = make_user_courses(catalog, 4)
+        db_data = {"courses": catalog, "user_course": user_courses, "cart_products": user_courses[:2], "tasks": []}
+        titles = [catalog[size // 3]["title"], catalog[2 * size // 3]["title"]]
+
+        cases = {
+            "build_messages": lambda: app.build_messages("show me python courses", db_data, [], "improved"),
+            "recommend_courses": lambda: app.recommend_courses(user_courses, catalog, ""),
+            "create_learning_path": lambda: app.create_learning_path(user_courses, catalog, "web development"),
+            "compare_courses": lambda: app.compare_courses(titles, catalog),
+        }
+        for name, fn in cases.items():
+            results[f"{name}[{size}]"] = measure(fn, repeat)
+
+    for rows in reply_rows:
+        reply = make_reply(rows)
+        results[f"parse_actions[{rows}]"] = measure(lambda: app.parse_actions(reply), repeat)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark the /chat hot path")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 1_000, 10_000], help="Catalog sizes")
+    parser.add_argument("--reply-rows", type=int, nargs="+", default=[10, 100, 1_000], help="Reply table rows")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", default="benchmarks/results/hot_path.json")
+    args = parser.parse_args()
+
+    results = run(args.sizes, args.reply_rows, args.repeat)
+    print(f"{'case':<32}{'median ms':>12}{'min ms':>12}{'runs':>8}")
+    for name, result in results.items():
+        print(f"{name:<32}{result['median_ms']:>12.3f}{result['min_ms']:>12.3f}{result['runs']:>8}")
+    write_results("hot_path", results, args.output)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""Benchmark - bare requests.post vs the pooled LLMClient against a local stub LLM"""
+
+import sys
+import time
+import argparse
+import statistics
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from llm_client import LLMClient
+from stub_llm import StubLLMServer
+
+PAYLOAD = {"model": "stub", "stream": False, "messages": [{"role": "user", "content": "recommend courses for me"}]}
+
+
+def run(post, url, requests_count, concurrency):
+    def one(_):
+        start = time.perf_counter()
+        resp = post(url, json=PAYLOAD, timeout=10)
+        resp.raise_for_status()
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        latencies = sorted(pool.map(one, range(requests_count)))
+    elapsed = time.perf_counter() - start
+    return {
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1],
+        "throughput_rps": requests_count / elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare bare and pooled HTTP clients")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--latency", type=float, default=0.0, help="Stub LLM latency in seconds")
+    args = parser.parse_args()
+
+    server = StubLLMServer(latency=args.latency).start()
+    try:
+        bare = run(requests.post, server.url, args.requests, args.concurrency)
+        client = LLMClient(pool_maxsize=args.concurrency)
+        pooled = run(client.post, server.url, args.requests, args.concurrency)
+        stats = client.get_stats()
+        client.close()
+    finally:
+        server.stop()
+
+    print(f"{'client':<10}{'p50 ms':>10}{'p95 ms':>10}{'req/s':>10}")
+    for name, result in [("bare", bare), ("pooled", pooled)]:
+        print(f"{name:<10}{result['p50_ms']:>10.2f}{result['p95_ms']:>10.2f}{result['throughput_rps']:>10.1f}")
+    print(f"\nPooled client: {stats['new_connections']} new connections, "
+          f"{stats['reused_connections']} reused over {stats['requests']} requests")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Benchmark - one plain chat_logs.jsonl vs compressed segments: disk footprint, full and time-range loads"""
+
+import sys
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analyze_logs import ChatLogAnalyzer
+from log_segments import read_manifest, overlaps
+from log_writer import BackgroundLogWriter
+from synthetic import make_log_entries
+
+
+def write_log(log_path, entries, rotate_bytes):
+    writer = BackgroundLogWriter(log_path, queue_size=0, batch_size=1024, rotate_bytes=rotate_bytes)
+    for entry in entries:
+        writer.submit(entry)
+    writer.close(timeout=None)
+
+
+def bytes_read(log_path, start=None, end=None):
+    """Bytes of the files a load opens: the segments in range plus the live log"""
+    segments = [s for s in read_manifest(log_path) if overlaps(s, start, end)]
+    live = log_path.stat().st_size if log_path.exists() else 0
+    return sum(s["stored_bytes"] for s in segments) + live, len(segments)
+
+
+def timed_load(log_path, start=None, end=None):
+    analyzer = ChatLogAnalyzer(log_path)
+    began = time.perf_counter()
+    analyzer.load_logs(start=start, end=end)
+    return time.perf_counter() - began, len(analyzer.df)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark segmented, compressed conversation logs")
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--rotate-mb", type=float, default=8)
+    args = parser.parse_args()
+
+    # make_log_rows spreads rows over 90 days from 2026-01-01; the range query reads one week
+    week = ("2026-02-01T00:00:00Z", "2026-02-08T00:00:00Z")
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for layout, rotate_bytes in (("plain", 0), ("segments", int(args.rotate_mb * 1024 * 1024))):
+            log_path = Path(tmp) / layout / "chat_logs.jsonl"
+            log_path.parent.mkdir()
+            write_log(log_path, make_log_entries(args.rows), rotate_bytes)
+
+            disk = sum(p.stat().st_size for p in log_path.parent.iterdir())
+            full_s, full_rows = timed_load(log_path)
+            full_read, full_segments = bytes_read(log_path)
+            week_s, week_rows = timed_load(log_path, *week)
+            week_read, week_segments = bytes_read(log_path, *week)
+            results[layout] = (disk, full_s, full_rows, full_read, week_s, week_rows, week_read,
+                               f"{week_segments}/{full_segments}")
+
+    print(f"\n{args.rows:,} rows, segments rotated at {args.rotate_mb} MB")
+    print(f"{'layout':>10}{'disk MB':>10}{'full load s':>13}{'full read MB':>14}"
+          f"{'week load s':>13}{'week read MB':>14}{'week rows':>11}{'segments':>10}")
+    for layout, (disk, full_s, full_rows, full_read, week_s, week_rows, week_read, opened) in results.items():
+        print(f"{layout:>10}{disk / 1e6:>10.1f}{full_s:>13.2f}{full_read / 1e6:>14.1f}"
+              f"{week_s:>13.2f}{week_read / 1e6:>14.1f}{week_rows:>11,}{opened if layout == 'segments' else '-':>10}")
+    plain, segments = results["plain"], results["segments"]
+    print(f"compression {plain[0] / segments[0]:.1f}x, same rows: {plain[2] == segments[2] and plain[5] == segments[5]}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""Benchmark - ChatLogAnalyzer.load_logs scaling from 1 to N parsing processes on a large JSONL log"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analyze_logs import ChatLogAnalyzer
+from synthetic import make_log_entries
+
+
+def write_log(path, size_mb, block_rows=50_000):
+    """Repeat a block of synthetic entries until the file reaches size_mb; returns the row count"""
+    block = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in make_log_entries(block_rows))
+    block = block.encode("utf-8")
+    target = size_mb * 1024 * 1024
+    rows = 0
+    with open(path, "wb") as f:
+        while f.tell() < target:
+            f.write(block)
+            rows += block_rows
+    return rows
+
+
+def fingerprint(df):
+    return len(df), int(pd.util.hash_pandas_object(df[["timestamp", "user_email", "query_type", "action_count"]],
+                                                    index=False).sum())
+
+
+def main():
+    cpus = os.cpu_count() or 1
+    parser = argparse.ArgumentParser(description="Benchmark parallel log loading")
+    parser.add_argument("--size-mb", type=int, default=2048)
+    parser.add_argument("--workers", type=int, nargs="+",
+                        default=sorted({1, 2, 4, 8, cpus} & set(range(1, cpus + 1))) or [1])
+    parser.add_argument("--dir", help="Directory for the generated log (default: a temp dir)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(dir=args.dir) as tmp:
+        log_path = Path(tmp) / "chat_logs.jsonl"
+        rows = write_log(log_path, args.size_mb)
+        size_mb = log_path.stat().st_size / 1e6
+        print(f"{size_mb:,.0f} MB, {rows:,} rows, {cpus} CPUs")
+        print(f"{'workers':>8}{'seconds':>10}{'MB/s':>9}{'rows/s':>12}{'speedup':>10}  same")
+
+        baseline = None
+        for workers in args.workers:
+            analyzer = ChatLogAnalyzer(log_path)
+            start = time.perf_counter()
+            analyzer.load_logs(workers=workers)
+            seconds = time.perf_counter() - start
+            result = fingerprint(analyzer.df)
+            analyzer.df = None
+            if baseline is None:
+                baseline = (seconds, result)
+            print(f"{workers:>8}{seconds:>10.2f}{size_mb / seconds:>9.1f}{rows / seconds:>12,.0f}"
+                  f"{baseline[0] / seconds:>9.2f}x  {result == baseline[1]}")
+
+if __name__ == "__main__":
+    main()
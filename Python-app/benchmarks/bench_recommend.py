@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark - indexed recommend_courses vs the original nested-scan implementation"""
+
+import sys
+import time
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from app import recommend_courses
+from catalog_index import CatalogIndex
+from synthetic import make_catalog, make_user_courses
+
+
+def legacy_recommend_courses(user_courses, all_courses, user_input):
+    """The pre-index implementation, kept here as the reference for scoring and speed"""
+    user_categories = set()
+    user_instructors = set()
+    user_levels = []
+    for course in user_courses:
+        if course.get('category'):
+            user_categories.add(course['category'].lower())
+        if course.get('instructor'):
+            user_instructors.add(course['instructor'].lower())
+        title = course.get('title', '').lower()
+        if any(word in title for word in ['beginner', 'intro', 'basic']):
+            user_levels.append('beginner')
+        elif any(word in title for word in ['advanced', 'master', 'expert']):
+            user_levels.append('advanced')
+        else:
+            user_levels.append('intermediate')
+
+    recommendations = []
+    for course in all_courses:
+        if any(uc.get('title') == course.get('title') for uc in user_courses):
+            continue
+        score = 0
+        reasons = []
+        course_category = course.get('category', '').lower()
+        if course_category in user_categories:
+            score += 3
+            reasons.append(f"Similar to your {course_category} courses")
+        course_instructor = course.get('instructor', '').lower()
+        if course_instructor in user_instructors:
+            score += 2
+            reasons.append(f"Same instructor as your other courses")
+        if user_levels:
+            avg_level = max(set(user_levels), key=user_levels.count)
+            course_title = course.get('title', '').lower()
+            if avg_level == 'beginner' and any(word in course_title for word in ['intermediate', 'advanced']):
+                score += 2
+                reasons.append("Good next step for your level")
+            elif avg_level == 'intermediate' and any(word in course_title for word in ['advanced', 'master']):
+                score += 2
+                reasons.append("Advanced course for your experience")
+        if course.get('rating', 0) >= 4.5:
+            score += 1
+            reasons.append("Highly rated course")
+        if score >= 2:
+            recommendations.append({'course': course, 'score': score, 'reasons': reasons[:2]})
+    recommendations.sort(key=lambda x: x['score'], reverse=True)
+    return recommendations[:3]
+
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark recommend_courses")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--user-courses", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'catalog':>10}{'legacy ms':>12}{'build ms':>12}{'indexed ms':>12}{'speedup':>10}  match")
+    for size in args.sizes:
+        catalog = make_catalog(size)
+        user_courses = make_user_courses(catalog, args.user_courses)
+
+        legacy_ms, expected = timed(lambda: legacy_recommend_courses(user_courses, catalog, ""), args.repeat)
+        build_ms, index = timed(lambda: CatalogIndex(catalog), 1)
+        indexed_ms, result = timed(lambda: recommend_courses(user_courses, catalog, "", index=index), args.repeat)
+
+        print(f"{size:>10}{legacy_ms:>12.1f}{build_ms:>12.1f}{indexed_ms:>12.2f}"
+              f"{legacy_ms / indexed_ms:>9.1f}x  {result == expected}")
+
+if __name__ == "__main__":
+    main()
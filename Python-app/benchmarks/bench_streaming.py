@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Benchmark - ChatLogAnalyzer.stream_logs (sketches, bounded memory) vs load_logs (full DataFrame)
+
+The log is written and each mode is run in its own process, so peak RSS
+is measured separately; the sketch estimates are compared with the exact
+frame results.
+"""
+
+import sys
+import json
+import time
+import resource
+import argparse
+import tempfile
+import subprocess
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from synthetic import make_log_entries
+
+
+def write_log(rows, log_path):
+    """Child process: write the synthetic log, keeping its memory out of the measuring processes"""
+    with open(log_path, "w", encoding="utf-8") as f:
+        for entry in make_log_entries(int(rows)):
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def run_mode(mode, log_path):
+    """Child process: analyze with one mode and print timings, peak RSS and the compared figures"""
+    from analyze_logs import ChatLogAnalyzer, LENGTH_QUANTILES
+
+    analyzer = ChatLogAnalyzer(log_path)
+    start = time.perf_counter()
+    loaded = analyzer.stream_logs() if mode == "streaming" else analyzer.load_logs()
+    stats = analyzer.generate_basic_stats()
+    top_users = analyzer.analyze_user_activity()['top_users']
+    lengths = analyzer.analyze_lengths()
+    seconds = time.perf_counter() - start
+    print(json.dumps({
+        "loaded": loaded,
+        "seconds": seconds,
+        "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "unique_users": int(stats['Unique Users']),
+        "top_users": [[user, int(count)] for user, count in top_users.items()],
+        "quantiles": {column: [int(v) for v in lengths[column]] for column in lengths.columns},
+        "fractions": LENGTH_QUANTILES,
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark streaming analysis")
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--child", nargs=2, metavar=("MODE", "LOG"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        mode, log_path = args.child
+        return write_log(mode.split(":")[1], log_path) if mode.startswith("write:") else run_mode(mode, log_path)
+
+    print(f"{'rows':>10}{'mode':>11}{'seconds':>9}{'peak RSS MB':>13}{'unique users':>14}"
+          f"{'top-10 same':>13}{'max top-10 err':>16}  p50/p90/p99 prompt, response")
+    for rows in args.rows:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_path = Path(tmp) / "chat_logs.jsonl"
+            # ru_maxrss survives exec, so every child is started from this small parent
+            subprocess.run([sys.executable, __file__, "--child", f"write:{rows}", str(log_path)], check=True)
+
+            results = {}
+            for mode in ("frame", "streaming"):
+                out = subprocess.run([sys.executable, __file__, "--child", mode, str(log_path)],
+                                     capture_output=True, text=True, check=True).stdout
+                results[mode] = json.loads(out.strip().splitlines()[-1])
+
+            exact = dict((user, count) for user, count in results["frame"]["top_users"])
+            for mode, result in results.items():
+                same = [u for u, _ in result["top_users"]] == [u for u, _ in results["frame"]["top_users"]]
+                error = max(abs(count - exact.get(user, 0)) for user, count in result["top_users"])
+                quantiles = " ".join("/".join(str(v) for v in (values[0], values[1], values[3]))
+                                     for values in result["quantiles"].values())
+                print(f"{rows:>10}{mode:>11}{result['seconds']:>9.2f}{result['max_rss_mb']:>13.0f}"
+                      f"{result['unique_users']:>14,}{str(same):>13}{error:>16}  {quantiles}")
+
+if __name__ == "__main__":
+    main()
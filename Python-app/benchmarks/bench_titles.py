@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""Benchmark - TitleIndex lookups vs the original linear compare_courses title matcher"""
+
+import sys
+import time
+import random
+import argparse
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from title_index import TitleIndex
+from synthetic import make_catalog
+
+
+def legacy_match(title, all_courses):
+    """The pre-index matcher from compare_courses: first course that is equal, a substring or shares two words"""
+    title_lower = title.lower().strip()
+    for course in all_courses:
+        course_title = course.get('title', '').lower().strip()
+        if course_title == title_lower:
+            return course
+        if title_lower in course_title or course_title in title_lower:
+            return course
+        title_words = set(title_lower.split())
+        course_words = set(course_title.split())
+        if len(title_words & course_words) >= 2:
+            return course
+    return None
+
+
+def legacy_accepts(title, course_title):
+    title_lower = title.lower().strip()
+    course_title = course_title.lower().strip()
+    return (course_title == title_lower or title_lower in course_title or course_title in title_lower
+            or len(set(title_lower.split()) & set(course_title.split())) >= 2)
+
+
+def typo(rng, text):
+    i = rng.randrange(1, len(text) - 1)
+    return text[:i] + text[i + 1] + text[i] + text[i + 2:]
+
+
+def make_queries(catalog, count, seed=3):
+    """(kind, query, intended title) - exact titles, titles without their number, single subjects and typos
+
+    Only exact and typo queries have a single intended title.
+    """
+    rng = random.Random(seed)
+    queries = []
+    for _ in range(count):
+        title = rng.choice(catalog)["title"]
+        kind = rng.randrange(4)
+        if kind == 0:
+            queries.append(("exact", title, title))
+        elif kind == 1:
+            queries.append(("no_number", title.rsplit(" ", 1)[0], None))
+        elif kind == 2:
+            queries.append(("subject", rng.choice(["Python", "React", "Kubernetes", "SQL", "Figma"]), None))
+        else:
+            queries.append(("typo", typo(rng, title), title))
+    return queries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark course title matching")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--queries", type=int, default=40)
+    args = parser.parse_args()
+
+    # same: index returns the legacy course; acceptable: the legacy rules accept the index's course;
+    # correct: the course the query was made from (legacy / index)
+    print(f"{'catalog':>10}{'kind':>11}{'legacy ms':>12}{'index ms':>11}{'speedup':>10}"
+          f"{'same':>8}{'acceptable':>12}{'correct':>14}")
+    for size in args.sizes:
+        catalog = make_catalog(size)
+        titles = [c["title"] for c in catalog]
+
+        start = time.perf_counter()
+        index = TitleIndex(titles)
+        build_ms = (time.perf_counter() - start) * 1000
+        start = time.perf_counter()
+        index.match("warm up the trigram index")
+        trigram_build_ms = (time.perf_counter() - start) * 1000
+
+        by_kind = {}
+        for kind, query, intended in make_queries(catalog, args.queries):
+            start = time.perf_counter()
+            expected = legacy_match(query, catalog)
+            legacy_ms = (time.perf_counter() - start) * 1000
+            start = time.perf_counter()
+            pos = index.best(query)
+            index_ms = (time.perf_counter() - start) * 1000
+
+            stats = by_kind.setdefault(kind, {"legacy": 0.0, "index": 0.0, "same": 0, "acceptable": 0,
+                                              "legacy_correct": 0, "index_correct": 0, "n": 0})
+            stats["legacy"] += legacy_ms
+            stats["index"] += index_ms
+            stats["n"] += 1
+            found = catalog[pos] if pos is not None else None
+            stats["same"] += found is expected
+            stats["acceptable"] += found is not None and legacy_accepts(query, found["title"])
+            stats["legacy_correct"] += expected is not None and expected["title"] == intended
+            stats["index_correct"] += found is not None and found["title"] == intended
+
+        for kind, stats in by_kind.items():
+            n = stats["n"]
+            correct = f"{stats['legacy_correct']}/{stats['index_correct']} of {n}" if kind in ("exact", "typo") else "-"
+            print(f"{size:>10}{kind:>11}{stats['legacy'] / n:>12.2f}{stats['index'] / n:>11.3f}"
+                  f"{stats['legacy'] / max(stats['index'], 1e-9):>9.1f}x{stats['same']:>5}/{n:<3}"
+                  f"{stats['acceptable']:>8}/{n:<3}{correct:>14}")
+        print(f"{size:>10} index build {build_ms:.0f} ms, trigram build {trigram_build_ms:.0f} ms")
+
+if __name__ == "__main__":
+    main()
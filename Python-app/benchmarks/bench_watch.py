@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""Benchmark - refreshing charts after an append: full visualizations.py rerun vs ChatVisualizer watch refresh"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import tempfile
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from analyze_logs import ChatLogAnalyzer
+from visualizations import ChatVisualizer, VISUALIZATION_COLUMNS
+from synthetic import make_log_entries
+
+
+def append(log_path, entries):
+    with open(log_path, "a", encoding="utf-8") as f:
+        for entry in entries:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark watch-mode chart refreshes")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--append", type=int, default=500, help="Rows appended before each refresh")
+    parser.add_argument("--refreshes", type=int, default=3)
+    args = parser.parse_args()
+
+    entries = list(make_log_entries(args.rows + args.append * args.refreshes))
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)
+        log_path = Path(tmp) / "chat_logs.jsonl"
+        append(log_path, entries[:args.rows])
+
+        watcher = ChatVisualizer(ChatLogAnalyzer(log_path))
+        figures = {}
+        watcher._follow_live_data(watcher.analyzer.follow_logs(columns=VISUALIZATION_COLUMNS))
+        watcher._refresh_live_charts(figures)
+
+        rerun_s, refresh_s, saved = [], [], []
+        for i in range(args.refreshes):
+            begin = args.rows + i * args.append
+            append(log_path, entries[begin:begin + args.append])
+
+            began = time.perf_counter()
+            rerun = ChatVisualizer(ChatLogAnalyzer(log_path))
+            rerun.analyzer.load_logs(columns=VISUALIZATION_COLUMNS)
+            rerun.generate_all_visualizations()
+            rerun_s.append(time.perf_counter() - began)
+
+            began = time.perf_counter()
+            watcher._follow_live_data(watcher.analyzer.follow_logs(columns=VISUALIZATION_COLUMNS))
+            saved.append(len(watcher._refresh_live_charts(figures)))
+            refresh_s.append(time.perf_counter() - began)
+
+        began = time.process_time()
+        for _ in range(1000):
+            watcher.analyzer.follow_logs(columns=VISUALIZATION_COLUMNS)
+        idle_us = (time.process_time() - began) * 1000
+
+    print(f"\n{args.rows:,} rows, +{args.append:,} rows per refresh")
+    print(f"{'refresh':>8}{'rerun s':>10}{'watch s':>10}{'speedup':>10}{'charts saved':>14}")
+    for i, (rerun, refresh, count) in enumerate(zip(rerun_s, refresh_s, saved), 1):
+        print(f"{i:>8}{rerun:>10.2f}{refresh:>10.2f}{rerun / refresh:>9.1f}x{count:>14}")
+    print(f"idle check: {idle_us:.1f} us CPU")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""Compare two benchmark result files and flag regressions"""
+
+import sys
+import json
+import argparse
+
+# Metrics where a larger value is better; everything else is treated as a latency
+HIGHER_IS_BETTER = {"throughput_rps", "rows_per_s", "users_per_s", "runs"}
+PRIMARY_METRICS = ["median_ms", "p50_ms", "p95_ms", "throughput_rps"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare benchmark results between commits")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Relative change counted as a regression")
+    args = parser.parse_args()
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    with open(args.candidate, encoding="utf-8") as f:
+        candidate = json.load(f)
+
+    print(f"baseline {baseline.get('commit')}  vs  candidate {candidate.get('commit')}\n")
+    print(f"{'case':<36}{'metric':<16}{'baseline':>12}{'candidate':>12}{'change':>10}")
+    regressions = 0
+    for name, metrics in candidate["results"].items():
+        base_metrics = baseline["results"].get(name)
+        if base_metrics is None:
+            continue
+        for metric in PRIMARY_METRICS:
+            if metric not in metrics or metric not in base_metrics or not base_metrics[metric]:
+                continue
+            change = (metrics[metric] - base_metrics[metric]) / base_metrics[metric]
+            worse = -change if metric in HIGHER_IS_BETTER else change
+            flag = "  REGRESSION" if worse > args.threshold else ""
+            regressions += bool(flag)
+            print(f"{name:<36}{metric:<16}{base_metrics[metric]:>12.3f}{metrics[metric]:>12.3f}{change:>+10.1%}{flag}")
+
+    print(f"\n{regressions} regression(s) above {args.threshold:.0%}")
+    sys.exit(1 if regressions else 0)
+
+if __name__ == "__main__":
+    main()
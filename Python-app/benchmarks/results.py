@@ -0,0 +1,31 @@
+"""Machine-readable benchmark results, comparable between commits"""
+
+import json
+import platform
+import subprocess
+from pathlib import Path
+from datetime import datetime
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def write_results(benchmark, results, output_path):
+    """Write results as JSON: {"benchmark", "commit", "timestamp", "python", "results": {name: {metric: value}}}"""
+    payload = {
+        "benchmark": benchmark,
+        "commit": git_commit(),
+        "timestamp": datetime.utcnow().isoformat() + "Z",
+        "python": platform.python_version(),
+        "results": results,
+    }
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2)
+    print(f"Results written to {output_path}")
+    return payload
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""Stub LLM server - OpenAI-compatible /chat/completions endpoint with configurable latency"""
+
+import re
+import json
+import time
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_REPLY = (
+    "Based on your enrolled courses, I'll find personalized recommendations for you!\n\n"
+    "ACTIONS:\n[ACTION:RECOMMEND_COURSES]\n[/ACTION:RECOMMEND_COURSES]"
+)
+
+
+class StubLLMHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        time.sleep(self.server.latency)
+
+        if body.get("stream"):
+            self._stream_reply()
+            return
+
+        payload = json.dumps({
+            "model": body.get("model", "stub"),
+            "choices": [{"message": {"role": "assistant", "content": self.server.reply}}]
+        }).encode("utf-8")
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _write_chunk(self, data):
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+
+    def _stream_reply(self):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        for token in re.findall(r"\S+\s*|\s+", self.server.reply):
+            time.sleep(self.server.token_delay)
+            event = {"choices": [{"delta": {"content": token}}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+        self._write_chunk(b"data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+class StubLLMServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024
+
+    def __init__(self, host="127.0.0.1", port=0, latency=0.0, reply=DEFAULT_REPLY, token_delay=0.0):
+        super().__init__((host, port), StubLLMHandler)
+        self.latency = latency
+        self.token_delay = token_delay
+        self.reply = reply
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/chat/completions"
+
+    def start(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a stub LLM server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds to wait before replying")
+    parser.add_argument("--token-delay", type=float, default=0.0, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+
+    server = StubLLMServer(args.host, args.port, args.latency, token_delay=args.token_delay)
+    print(f"Stub LLM listening on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
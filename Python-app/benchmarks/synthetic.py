@@ -0,0 +1,99 @@
+"""Synthetic catalogs, users and replies shared by the benchmarks"""
+
+import random
+
+CATEGORIES = ['Web Development', 'Data Science', 'Mobile', 'DevOps', 'Design', 'Cloud',
+              'Business', 'Security', 'Programming', 'Marketing', 'AI', 'Databases']
+INSTRUCTORS = [f"Instructor {i}" for i in range(200)]
+SUBJECTS = ['Python', 'JavaScript', 'React', 'Node.js', 'Docker', 'Kubernetes', 'AWS', 'Figma',
+            'SQL', 'Machine Learning', 'Kotlin', 'Swift', 'Statistics', 'UX', 'Flutter', 'CSS']
+LEVEL_WORDS = ['Beginner', 'Intro to', 'Basic', 'Intermediate', 'Advanced', 'Master', 'Expert', '']
+
+
+def make_course(rng, i):
+    subject = rng.choice(SUBJECTS)
+    level = rng.choice(LEVEL_WORDS)
+    return {
+        "id": i,
+        "title": f"{level} {subject} {rng.choice(['Course', 'Bootcamp', 'Workshop', 'Essentials'])} {i}".strip(),
+        "description": f"Learn {subject} step by step",
+        "category": rng.choice(CATEGORIES),
+        "instructor": rng.choice(INSTRUCTORS),
+        "duration": f"{rng.randint(2, 12)} weeks",
+        "lessons_count": rng.randint(8, 60),
+        "rating": round(rng.uniform(3.5, 5.0), 1),
+        "price": round(rng.uniform(9.99, 99.99), 2),
+    }
+
+
+def make_catalog(size, seed=42):
+    rng = random.Random(seed)
+    return [make_course(rng, i) for i in range(size)]
+
+
+def make_user_courses(catalog, count=4, seed=7):
+    rng = random.Random(seed)
+    return rng.sample(catalog, min(count, len(catalog)))
+
+PROMPTS = [
+    "add Python for Beginners to my cart", "recommend courses for me", "show me python courses",
+    "what courses should I take", "hello", "hi there", "how do I reset my password",
+    "explain machine learning", "compare DevOps and Cloud Computing courses", "thanks!",
+    "create a learning path for web development", "I want to buy React Basics", "good morning",
+    "why is my progress not saving", "enroll me in Docker Mastery", "ok", "Purchase SQL Essentials",
+    "what is the difference between UX and UI", "list my enrolled courses", "bye",
+]
+ACTION_SETS = [
+    [], [], [], [{"type": "ADD_TO_CART", "course_title": "Python for Beginners"}],
+    [{"type": "RECOMMEND_COURSES", "executed": True}],
+    [{"type": "CREATE_LEARNING_PATH", "career_goal": "Web Development", "executed": True}],
+    [{"type": "ADD_TO_CART", "course_title": "React Basics"}, {"type": "COMPARE_COURSES", "executed": True}],
+]
+
+
+def make_log_rows(count, seed=42):
+    """Column-wise synthetic chat log rows, as ChatLogAnalyzer.df holds them before feature extraction"""
+    import numpy as np
+    import pandas as pd
+
+    rng = np.random.default_rng(seed)
+    prompts = np.array(PROMPTS, dtype=object)[rng.integers(0, len(PROMPTS), count)]
+    actions = [ACTION_SETS[i] for i in rng.integers(0, len(ACTION_SETS), count)]
+    start = pd.Timestamp("2026-01-01T00:00:00Z")
+    return pd.DataFrame({
+        "timestamp": start + pd.to_timedelta(np.sort(rng.integers(0, 90 * 86400, count)), unit="s"),
+        "user_email": [f"user{i}@example.com" for i in rng.zipf(1.3, count) % 5000],
+        "user_prompt": pd.Series(prompts, dtype="str"),
+        "model_response": pd.Series(np.array(["Sure! " * 20, "Here are some courses.", "**🎯 Picks**\n" * 10],
+                                             dtype=object)[rng.integers(0, 3, count)], dtype="str"),
+        "agent_actions": actions,
+        "status": np.where(rng.random(count) < 0.97, "success", "error"),
+    })
+
+
+def make_log_entries(rows, seed=42):
+    """make_log_rows as the JSON entries log_conversation writes"""
+    frame = make_log_rows(rows, seed)
+    summary = {"courses_count": 30, "user_courses_count": 4, "cart_items_count": 1, "tasks_count": 2}
+    for timestamp, email, prompt, response, actions, status in zip(
+            frame["timestamp"], frame["user_email"], frame["user_prompt"], frame["model_response"],
+            frame["agent_actions"], frame["status"]):
+        yield {"timestamp": timestamp.strftime("%Y-%m-%dT%H:%M:%S.%fZ"), "user_email": email,
+               "user_name": email.split("@")[0], "user_prompt": prompt, "db_context_summary": summary,
+               "model_response": response, "agent_actions": actions, "status": status, "error": None}
+
+
+def make_reply(rows, actions=True):
+    """LLM-style markdown reply with `rows` table rows and, optionally, an ACTIONS section"""
+    lines = ["**🎯 Personalized Course Recommendations**", "",
+             "| Course | Category | Duration | Rating | Price | Why Recommended |",
+             "|--------|----------|----------|--------|-------|-----------------|"]
+    for i in range(rows):
+        lines.append(f"| Course {i} | Programming | {i % 10 + 2} weeks | 4.{i % 10}/5.0 | ${i % 90 + 9}.99 | Builds on your skills |")
+    lines += ["", "**🗺️ Learning Path: Web Development**", "", "**📊 Course Comparison**", ""]
+    if actions:
+        lines += ["ACTIONS:",
+                  "[ACTION:ADD_TO_CART]", "COURSE_TITLE: Course 1", "[/ACTION:ADD_TO_CART]",
+                  "[ACTION:RECOMMEND_COURSES]", "[/ACTION:RECOMMEND_COURSES]",
+                  "[ACTION:CREATE_LEARNING_PATH]", "CAREER_GOAL: data science", "[/ACTION:CREATE_LEARNING_PATH]"]
+    return "\n".join(lines)
@@ -0,0 +1,62 @@
+"""Career path keyword table for the learning path planner
+
+The table maps a career path name to the keywords that identify both the
+goal ("I want to become a ... developer") and the relevant courses (matched
+as substrings of the course category or title). Path order matters: the
+first path with a keyword in the goal wins. Override the built-in table with
+CAREER_PATHS (inline JSON) or CAREER_PATHS_FILE (path to a JSON file), both
+shaped like {"path name": ["keyword", ...]}.
+"""
+
+import os
+import json
+
+DEFAULT_CAREER_PATHS = {
+    'web development': ['web development', 'javascript', 'react', 'node.js', 'html', 'css', 'frontend', 'backend'],
+    'data science': ['data science', 'python', 'machine learning', 'statistics', 'analysis'],
+    'mobile development': ['mobile', 'ios', 'android', 'react native', 'flutter'],
+    'devops': ['devops', 'docker', 'kubernetes', 'aws', 'cloud', 'deployment'],
+    'ui/ux design': ['design', 'ui', 'ux', 'figma', 'photoshop', 'user experience']
+}
+
+CAREER_PATHS_JSON = os.getenv("CAREER_PATHS", "").strip()
+CAREER_PATHS_FILE = os.getenv("CAREER_PATHS_FILE", "").strip()
+DEFAULT_CAREER_PATH = os.getenv("DEFAULT_CAREER_PATH", "web development").strip().lower()
+
+
+def parse_career_paths(data):
+    """Validate a {"path": ["keyword", ...]} mapping and lowercase it"""
+    if not isinstance(data, dict) or not data:
+        raise ValueError("career paths must be a non-empty JSON object")
+    career_paths = {}
+    for path, keywords in data.items():
+        if not isinstance(keywords, list) or not all(isinstance(k, str) and k for k in keywords):
+            raise ValueError(f"keywords for career path '{path}' must be a list of non-empty strings")
+        career_paths[str(path).lower()] = [k.lower() for k in keywords]
+    return career_paths
+
+
+def load_career_paths():
+    """The configured career path table, falling back to the built-in one if it cannot be read"""
+    try:
+        if CAREER_PATHS_JSON:
+            return parse_career_paths(json.loads(CAREER_PATHS_JSON))
+        if CAREER_PATHS_FILE:
+            with open(CAREER_PATHS_FILE, "r", encoding="utf-8") as f:
+                return parse_career_paths(json.load(f))
+    except Exception as e:
+        print(f"Error loading career paths, using the built-in table: {e}")
+    return dict(DEFAULT_CAREER_PATHS)
+
+
+CAREER_PATHS = load_career_paths()
+
+
+def match_career_path(career_goal, career_paths=None):
+    """Name of the first career path with a keyword in the goal, else the default path"""
+    career_paths = career_paths or CAREER_PATHS
+    career_goal_lower = career_goal.lower()
+    for path, keywords in career_paths.items():
+        if any(keyword in career_goal_lower for keyword in keywords):
+            return path
+    return DEFAULT_CAREER_PATH if DEFAULT_CAREER_PATH in career_paths else next(iter(career_paths))
@@ -0,0 +1,138 @@
+"""Precomputed catalog index - per-course features and inverted indexes, built once per catalog version"""
+
+import re
+import threading
+from collections import OrderedDict, defaultdict
+
+from title_index import TitleIndex
+
+INDEX_CACHE_SIZE = 8
+
+_BEGINNER_WORDS = re.compile('beginner|intro|basic')
+_ADVANCED_WORDS = re.compile('advanced|master|expert')
+# Title words that make a course the next step after a beginner / intermediate level
+_AFTER_BEGINNER_WORDS = re.compile('intermediate|advanced')
+_AFTER_INTERMEDIATE_WORDS = re.compile('advanced|master')
+
+
+def course_level(title_lower):
+    """Classify a lowercased course title as beginner, intermediate or advanced"""
+    if _BEGINNER_WORDS.search(title_lower):
+        return 'beginner'
+    elif _ADVANCED_WORDS.search(title_lower):
+        return 'advanced'
+    return 'intermediate'
+
+
+def catalog_fingerprint(courses):
+    """Cheap content fingerprint over the fields the index is derived from"""
+    return (len(courses), hash(tuple(
+        (c.get('title'), c.get('category'), c.get('instructor'), c.get('rating'))
+        for c in courses
+    )))
+
+
+class CatalogIndex:
+    """Derived, read-only view of a course catalog
+
+    Only positions into the catalog list are stored, so callers always read
+    the course dicts from the catalog they passed in.
+    """
+
+    def __init__(self, courses):
+        self.size = len(courses)
+        self.titles = []
+        self.titles_lower = []
+        self.categories_lower = []
+        self.instructors_lower = []
+        self.levels = []
+        self.highly_rated = []
+        self.by_category = defaultdict(list)
+        self.by_instructor = defaultdict(list)
+        # Courses that count as a "next step" for learners at a given level
+        self.next_step = {'beginner': set(), 'intermediate': set()}
+        self._title_index = None
+        self._title_index_lock = threading.Lock()
+        self._career_buckets = {}
+
+        for pos, course in enumerate(courses):
+            title = course.get('title')
+            title_lower = (title or '').lower()
+            category = (course.get('category') or '').lower()
+            instructor = (course.get('instructor') or '').lower()
+
+            self.titles.append(title)
+            self.titles_lower.append(title_lower)
+            self.categories_lower.append(category)
+            self.instructors_lower.append(instructor)
+            self.levels.append(course_level(title_lower))
+            rating = course.get('rating')
+            self.highly_rated.append(isinstance(rating, (int, float)) and rating >= 4.5)
+
+            if category:
+                self.by_category[category].append(pos)
+            if instructor:
+                self.by_instructor[instructor].append(pos)
+            if _AFTER_BEGINNER_WORDS.search(title_lower):
+                self.next_step['beginner'].add(pos)
+            if _AFTER_INTERMEDIATE_WORDS.search(title_lower):
+                self.next_step['intermediate'].add(pos)
+
+    @property
+    def title_index(self):
+        """TitleIndex over the catalog titles, built on first use"""
+        if self._title_index is None:
+            with self._title_index_lock:
+                if self._title_index is None:
+                    self._title_index = TitleIndex(self.titles)
+        return self._title_index
+
+    def career_path_courses(self, keywords):
+        """Positions of the courses relevant to a career path, per level, most relevant first
+
+        A course is relevant when a keyword occurs in its category or title;
+        its relevance is the number of such keywords. Ties keep catalog
+        order. Built once per keyword list.
+        """
+        key = tuple(keywords)
+        buckets = self._career_buckets.get(key)
+        if buckets is not None:
+            return buckets
+
+        scored = []
+        for pos, (category, title) in enumerate(zip(self.categories_lower, self.titles_lower)):
+            score = sum(1 for keyword in keywords if keyword in category or keyword in title)
+            if score:
+                scored.append((-score, pos))
+        scored.sort()
+
+        buckets = {'beginner': [], 'intermediate': [], 'advanced': []}
+        for _, pos in scored:
+            buckets[self.levels[pos]].append(pos)
+        self._career_buckets[key] = buckets
+        return buckets
+
+
+_index_cache = OrderedDict()
+_index_lock = threading.Lock()
+
+
+def get_catalog_index(courses, version=None):
+    """Return the CatalogIndex for `courses`, building it only for unseen catalog versions
+
+    `version` identifies the catalog explicitly; without it a content
+    fingerprint is used.
+    """
+    key = ('version', version) if version is not None else ('fingerprint', catalog_fingerprint(courses))
+    with _index_lock:
+        index = _index_cache.get(key)
+        if index is not None:
+            _index_cache.move_to_end(key)
+            return index
+
+    index = CatalogIndex(courses)
+    with _index_lock:
+        _index_cache[key] = index
+        while len(_index_cache) > INDEX_CACHE_SIZE:
+            _index_cache.popitem(last=False)
+    return index
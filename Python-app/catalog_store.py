@@ -0,0 +1,158 @@
+"""Server-side course catalog - held in memory under a content version, updated in place with deltas"""
+
+import os
+import hmac
+import json
+import hashlib
+import threading
+
+CATALOG_FILE = os.getenv("CATALOG_FILE", "").strip()
+# Shared secret required to PUT/PATCH /catalog; without it catalog updates are disabled
+CATALOG_ADMIN_TOKEN = os.getenv("CATALOG_ADMIN_TOKEN", "").strip()
+ADMIN_TOKEN_HEADER = "X-Catalog-Admin-Token"
+
+
+class CatalogVersionMismatch(Exception):
+    """The caller's catalog version is not the one currently loaded"""
+
+    def __init__(self, expected, current):
+        super().__init__(f"catalog version {expected} does not match current version {current}")
+        self.expected = expected
+        self.current = current
+
+
+def course_key(course):
+    """Identity used to match delta updates: the course id when present, otherwise its title"""
+    if course.get("id") is not None:
+        return ("id", str(course["id"]))
+    return ("title", course.get("title"))
+
+
+def catalog_version(courses):
+    """Content hash of the catalog, so the same catalog always gets the same version"""
+    payload = json.dumps(courses, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def authorize_catalog_write(token, secret=None):
+    """(HTTP status, message) refusing a catalog update made with `token`, or None if it is allowed
+
+    403 when no admin secret is configured (writes disabled) or the token is
+    wrong, 401 when the token is missing. secret defaults to
+    CATALOG_ADMIN_TOKEN.
+    """
+    secret = CATALOG_ADMIN_TOKEN if secret is None else secret
+    if not secret:
+        return 403, "catalog updates are disabled; set CATALOG_ADMIN_TOKEN to enable them"
+    if not token:
+        return 401, f"missing {ADMIN_TOKEN_HEADER} header"
+    if not hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8")):
+        return 403, "invalid catalog admin token"
+    return None
+
+
+def _validate(courses, name):
+    if not isinstance(courses, list) or not all(isinstance(c, dict) for c in courses):
+        raise ValueError(f"{name} must be a list of course objects")
+
+
+class CatalogSnapshot:
+    """One immutable catalog version; derived views are built at most once per snapshot"""
+
+    def __init__(self, courses, version=None):
+        self.courses = courses
+        self.version = version or catalog_version(courses)
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @property
+    def etag(self):
+        return f'"{self.version}"'
+
+    def derived(self, name, factory):
+        """Return factory(courses), computed on first use and shared by every request on this version"""
+        with self._lock:
+            if name not in self._derived:
+                self._derived[name] = factory(self.courses)
+            return self._derived[name]
+
+
+class CatalogStore:
+    """Thread-safe holder of the current CatalogSnapshot
+
+    Updates never mutate a published snapshot; they build a new course list
+    and swap it in, so requests already working on the old version keep a
+    consistent view. expected_version makes an update conditional on the
+    version the caller last saw.
+    """
+
+    def __init__(self, courses=None):
+        self._snapshot = CatalogSnapshot(list(courses or []))
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        return self._snapshot
+
+    def replace(self, courses, expected_version=None):
+        _validate(courses, "courses")
+        with self._lock:
+            self._check_version(expected_version)
+            self._snapshot = CatalogSnapshot(list(courses))
+            return self._snapshot
+
+    def apply_delta(self, upsert=None, remove=None, expected_version=None):
+        """Merge `upsert` courses (matched by id, else title) and drop `remove` ids or titles
+
+        Returns (snapshot, report) where report counts added, updated and
+        removed courses.
+        """
+        upsert = upsert or []
+        remove = remove or []
+        _validate(upsert, "upsert")
+        if not isinstance(remove, list):
+            raise ValueError("remove must be a list of course ids or titles")
+
+        with self._lock:
+            self._check_version(expected_version)
+            courses = list(self._snapshot.courses)
+            positions = {course_key(c): pos for pos, c in enumerate(courses)}
+            report = {"added": 0, "updated": 0, "removed": 0}
+
+            for course in upsert:
+                key = course_key(course)
+                pos = positions.get(key)
+                if pos is None:
+                    positions[key] = len(courses)
+                    courses.append(dict(course))
+                    report["added"] += 1
+                else:
+                    courses[pos] = {**courses[pos], **course}
+                    report["updated"] += 1
+
+            removed = set()
+            for value in remove:
+                pos = positions.get(("id", str(value)))
+                if pos is None:
+                    pos = positions.get(("title", value))
+                if pos is None:
+                    # Courses with an id can still be removed by title
+                    pos = next((p for p, c in enumerate(courses) if c.get("title") == value), None)
+                if pos is not None and pos not in removed:
+                    removed.add(pos)
+            if removed:
+                courses = [c for pos, c in enumerate(courses) if pos not in removed]
+            report["removed"] = len(removed)
+
+            if report["added"] or report["updated"] or report["removed"]:
+                self._snapshot = CatalogSnapshot(courses)
+            return self._snapshot, report
+
+    def load_file(self, path):
+        """Replace the catalog with a JSON file holding a course list or {"courses": [...]}"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return self.replace(data.get("courses", []) if isinstance(data, dict) else data)
+
+    def _check_version(self, expected_version):
+        if expected_version is not None and str(expected_version) != self._snapshot.version:
+            raise CatalogVersionMismatch(expected_version, self._snapshot.version)
@@ -0,0 +1,104 @@
+"""Single-flight coalescing - concurrent identical LLM calls share one upstream request"""
+
+import os
+import asyncio
+import threading
+
+COALESCE_ENABLED = os.getenv("LLM_COALESCE_ENABLED", "true").lower() == "true"
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; callers arriving meanwhile wait and share its outcome
+
+    The first caller for a key (the leader) runs fn on its own thread.
+    Everyone else blocks until it finishes and gets the same return value,
+    or the same exception re-raised. The key is forgotten as soon as the
+    call completes, so results are never served after the fact - that is
+    the response cache's job.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._lock = threading.Lock()
+        self._counters = {"upstream_calls": 0, "coalesced": 0, "errors": 0}
+
+    def do(self, key, fn, *args):
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+                self._counters["upstream_calls"] += 1
+            else:
+                flight.waiters += 1
+                self._counters["coalesced"] += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result
+
+        try:
+            flight.result = fn(*args)
+        except Exception as e:
+            flight.error = e
+            with self._lock:
+                self._counters["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[key]
+            flight.done.set()
+        return flight.result
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats["in_flight"] = len(self._flights)
+        return stats
+
+
+class AsyncSingleFlight:
+    """asyncio variant of SingleFlight for a single event loop
+
+    The upstream call runs as its own task and every caller awaits it
+    through asyncio.shield, so a disconnecting client cancels only its
+    own wait, never the shared call.
+    """
+
+    def __init__(self):
+        self._flights = {}
+        self._counters = {"upstream_calls": 0, "coalesced": 0, "errors": 0}
+
+    async def do(self, key, fn, *args):
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn(*args))
+            self._flights[key] = task
+            self._counters["upstream_calls"] += 1
+            task.add_done_callback(lambda t: self._finish(key, t))
+        else:
+            self._counters["coalesced"] += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, key, task):
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if task.cancelled() or task.exception() is not None:
+            self._counters["errors"] += 1
+
+    def get_stats(self):
+        stats = dict(self._counters)
+        stats["in_flight"] = len(self._flights)
+        return stats
@@ -0,0 +1,119 @@
+"""Budget-aware packing of the database context sent to the LLM"""
+
+import re
+import json
+import heapq
+
+CHARS_PER_TOKEN = 4
+CONTEXT_KEYS = ["courses", "user_course", "cart_products", "tasks"]
+# User-specific data is packed first; catalog courses fill whatever budget is left
+PRIORITY_KEYS = ["user_course", "cart_products", "tasks"]
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _words(text):
+    return set(_WORD.findall((text or "").lower()))
+
+
+def course_words(courses):
+    """(title, category, instructor) word sets per course - reusable across requests for one catalog"""
+    return [
+        (_words(c.get("title")), _words(c.get("category")), _words(c.get("instructor")))
+        for c in courses
+    ]
+
+
+def rank_courses(courses, user_input, user_items, words=None):
+    """Yield catalog course positions from most to least relevant to the request and the user's courses
+
+    The positions come off a heap, so a caller that stops after the first
+    k pays O(n + k log n) rather than a sort of the whole catalog. `words`
+    is course_words(courses), when the caller already has it.
+    """
+    query_words = {w for w in _words(user_input) if len(w) > 2}
+    user_categories = {(c.get("category") or "").lower() for c in user_items if c.get("category")}
+    words = words if words is not None else course_words(courses)
+
+    def relevance(item):
+        pos, course = item
+        title_words, category_words, instructor_words = words[pos]
+        score = 3 * len(query_words & title_words)
+        score += 2 * len(query_words & category_words)
+        score += len(query_words & instructor_words)
+        if (course.get("category") or "").lower() in user_categories:
+            score += 2
+        rating = course.get("rating")
+        rating = rating if isinstance(rating, (int, float)) else 0
+        return (-score, -rating, pos)
+
+    ranked = [relevance(item) for item in enumerate(courses)]
+    heapq.heapify(ranked)
+    while ranked:
+        yield heapq.heappop(ranked)[2]
+
+
+def pack_db_context(context_data, user_input="", max_chars=12000, max_tokens=0, words=None):
+    """Serialize context_data as compact JSON that fits the char/token budget
+
+    Items are only ever dropped whole, so the result is always valid JSON.
+    Enrolled courses, cart items and tasks are packed first, then catalog
+    courses from most to least relevant until the budget runs out. Returns
+    (json_text, report) where report counts packed and dropped items.
+    `words` is an optional precomputed course_words() of the courses.
+    """
+    budget = max_chars
+    if max_tokens:
+        budget = min(budget, max_tokens * CHARS_PER_TOKEN)
+
+    packed = {key: [] for key in CONTEXT_KEYS}
+    used = len(_dumps(packed))
+    report = {"budget_chars": budget}
+
+    def try_add(key, item, size=None):
+        nonlocal used
+        size = (len(_dumps(item)) if size is None else size) + (1 if packed[key] else 0)
+        if used + size > budget:
+            return False
+        packed[key].append(item)
+        used += size
+        return True
+
+    for key in PRIORITY_KEYS:
+        items = context_data.get(key) or []
+        kept = sum(1 for item in items if try_add(key, item))
+        report[f"{key}_packed"] = kept
+        report[f"{key}_dropped"] = len(items) - kept
+
+    courses = context_data.get("courses") or []
+    user_items = (context_data.get("user_course") or []) + (context_data.get("cart_products") or [])
+    # Sizes are measured only until the catalog is known not to fit
+    sizes = {}
+    total = -1
+    for pos, course in enumerate(courses):
+        sizes[pos] = len(_dumps(course))
+        total += sizes[pos] + 1
+        if used + total > budget:
+            ranked = rank_courses(courses, user_input, user_items, words)
+            break
+    else:
+        # The whole catalog fits, so relevance order does not matter
+        ranked = range(len(courses))
+    kept_positions = []
+    for pos in ranked:
+        if not try_add("courses", courses[pos], sizes.get(pos)):
+            break
+        kept_positions.append(pos)
+    # Keep the catalog's own ordering for the courses that made it in
+    packed["courses"] = [courses[pos] for pos in sorted(kept_positions)]
+    report["courses_packed"] = len(kept_positions)
+    report["courses_dropped"] = len(courses) - len(kept_positions)
+
+    text = _dumps(packed)
+    report["packed_chars"] = len(text)
+    report["estimated_tokens"] = -(-len(text) // CHARS_PER_TOKEN)
+    return text, report
@@ -0,0 +1,142 @@
+"""Shared HTTP client for LLM calls - pooled, keep-alive connections with reuse counters"""
+
+import os
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+POOL_CONNECTIONS = int(os.getenv("LLM_POOL_CONNECTIONS", "4"))
+POOL_MAXSIZE = int(os.getenv("LLM_POOL_MAXSIZE", "16"))
+POOL_BLOCK = os.getenv("LLM_POOL_BLOCK", "true").lower() == "true"
+KEEP_ALIVE = os.getenv("LLM_KEEP_ALIVE", "true").lower() == "true"
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "0"))
+
+
+class ConnectionStats:
+    """Thread-safe counters for requests and newly opened sockets"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.new_connections = 0
+        self.errors = 0
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+
+    def record_connect(self):
+        with self._lock:
+            self.new_connections += 1
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": max(self.requests - self.new_connections, 0),
+                "errors": self.errors,
+            }
+
+
+def _counting_pool_classes(stats):
+    """Build pool classes whose connections report every socket connect to `stats`"""
+    class CountingHTTPConnection(HTTPConnection):
+        def connect(self):
+            stats.record_connect()
+            super().connect()
+
+    class CountingHTTPSConnection(HTTPSConnection):
+        def connect(self):
+            stats.record_connect()
+            super().connect()
+
+    class CountingHTTPConnectionPool(HTTPConnectionPool):
+        ConnectionCls = CountingHTTPConnection
+
+    class CountingHTTPSConnectionPool(HTTPSConnectionPool):
+        ConnectionCls = CountingHTTPSConnection
+
+    return {"http": CountingHTTPConnectionPool, "https": CountingHTTPSConnectionPool}
+
+
+class CountingHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that counts new connections opened by its pool manager"""
+
+    def __init__(self, stats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = _counting_pool_classes(self.stats)
+
+
+class LLMClient:
+    """Thread-safe pooled HTTP client shared by all LLM requests
+
+    pool_connections is the number of per-host pools kept alive, pool_maxsize
+    the maximum number of sockets per host, and pool_block makes callers wait
+    for a free socket instead of opening extra, unpooled ones.
+    """
+
+    def __init__(self, pool_connections=POOL_CONNECTIONS, pool_maxsize=POOL_MAXSIZE,
+                 pool_block=POOL_BLOCK, keep_alive=KEEP_ALIVE, max_retries=MAX_RETRIES):
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.pool_block = pool_block
+        self.keep_alive = keep_alive
+        self.stats = ConnectionStats()
+
+        self.session = requests.Session()
+        adapter = CountingHTTPAdapter(
+            self.stats,
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+            max_retries=max_retries
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive" if keep_alive else "close"
+
+    def post(self, url, **kwargs):
+        self.stats.record_request()
+        try:
+            return self.session.post(url, **kwargs)
+        except requests.RequestException:
+            self.stats.record_error()
+            raise
+
+    def get_stats(self):
+        stats = self.stats.snapshot()
+        stats.update({
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "pool_block": self.pool_block,
+            "keep_alive": self.keep_alive,
+        })
+        return stats
+
+    def close(self):
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_llm_client():
+    """Return the process-wide LLMClient, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = LLMClient()
+    return _client
@@ -0,0 +1,254 @@
+"""Sealed conversation log segments - gzip-compressed rotated files listed in a manifest
+
+The live log (chat_logs.jsonl) stays a plain append-only file. When the
+writer rotates it, the rotated file is sealed: compressed to
+chat_logs-<stamp>.jsonl.gz and recorded in chat_logs.manifest.json with
+its row count, first/last timestamp and the hash of its first line, so
+readers can skip segments outside a time range without opening them.
+"""
+
+import os
+import json
+import gzip
+import hashlib
+from pathlib import Path
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+try:
+    import fcntl
+except ImportError:
+    # No advisory locks (Windows): a log must then have a single writing process
+    fcntl = None
+
+COMPRESS = os.getenv("LOG_COMPRESS", "gzip").strip().lower()
+COMPRESS_LEVEL = int(os.getenv("LOG_COMPRESS_LEVEL", "6"))
+
+COMPRESS_CHOICES = ("gzip", "none")
+
+
+def manifest_path(log_path):
+    log_path = Path(log_path)
+    return log_path.with_name(f"{log_path.stem}.manifest.json")
+
+
+def read_manifest(log_path):
+    """Segment entries for a log, oldest first; empty if there is no readable manifest"""
+    path = manifest_path(log_path)
+    if not path.exists():
+        return []
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f).get("segments", [])
+    except Exception as e:
+        print(f"Warning: Ignoring unreadable log manifest {path}: {e}")
+        return []
+
+
+def lock_path(log_path, name):
+    """Lock file guarding one kind of change to a log, e.g. chat_logs.rotate.lock"""
+    log_path = Path(log_path)
+    return log_path.with_name(f"{log_path.stem}.{name}.lock")
+
+
+class FileLock:
+    """Advisory cross-process lock (flock) on a lock file, held shared or exclusive
+
+    Several processes (e.g. web server workers) can append to one log:
+    appends hold the rotate lock shared and rotation holds it exclusive, so
+    no process writes to a file after it has been renamed away. Each
+    FileLock keeps its own descriptor and is meant for one thread.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._file = None
+
+    @contextmanager
+    def hold(self, exclusive=True):
+        if fcntl is None:
+            yield
+            return
+        if self._file is None:
+            self._file = open(self.path, "a")
+        fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield
+        finally:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _write_manifest(log_path, segments):
+    path = manifest_path(log_path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump({"segments": segments}, f, indent=1)
+    os.replace(tmp, path)
+
+
+def segment_id(name):
+    """Name of a segment independent of whether it has been compressed yet"""
+    return name[:-3] if name.endswith(".gz") else name
+
+
+def first_line_hash(path):
+    """sha1 of a file's first complete line, which appends never change; None if there is none"""
+    try:
+        with open(path, "rb") as f:
+            first_line = f.readline()
+    except FileNotFoundError:
+        return None
+    return hashlib.sha1(first_line).hexdigest() if first_line.endswith(b"\n") else None
+
+
+def list_segments(log_path):
+    """Manifest entries, then rotated files not sealed yet (marked "pending"), oldest first"""
+    log_path = Path(log_path)
+    # Listed before the manifest is read: a file sealed in between then shows up once, as sealed
+    rotated = sorted(log_path.parent.glob(f"{log_path.stem}-*{log_path.suffix}"))
+    segments = read_manifest(log_path)
+    sealed = {segment_id(segment["file"]) for segment in segments}
+    for path in rotated:
+        if path.name not in sealed:
+            segments.append({"file": path.name, "head": first_line_hash(path), "pending": True})
+    return segments
+
+
+def open_listed_segment(log_path, segment):
+    """open_segment for a list_segments entry, following a pending file that was sealed meanwhile"""
+    path = Path(log_path).parent / segment["file"]
+    try:
+        return open_segment(path)
+    except FileNotFoundError:
+        if not segment.get("pending"):
+            raise
+        return open_segment(path.with_name(path.name + ".gz"))
+
+
+def open_segment(path):
+    """Binary line-iterable file object for a segment, compressed or not"""
+    path = Path(path)
+    return gzip.open(path, "rb") if path.suffix == ".gz" else open(path, "rb")
+
+
+def parse_timestamp(value):
+    """Timezone-aware datetime for a log timestamp; naive values are taken as UTC"""
+    when = value if isinstance(value, datetime) else datetime.fromisoformat(str(value))
+    return when if when.tzinfo else when.replace(tzinfo=timezone.utc)
+
+
+def overlaps(segment, start=None, end=None):
+    """Whether a segment may hold rows with start <= timestamp < end
+
+    A segment whose rows have no usable timestamps has no bounds and may
+    overlap any range, as does a rotated file that is not sealed yet.
+    """
+    if segment.get("pending"):
+        return True
+    if not segment.get("rows"):
+        return False
+    last, first = segment.get("last_timestamp"), segment.get("first_timestamp")
+    if start is not None and last is not None and parse_timestamp(last) < parse_timestamp(start):
+        return False
+    if end is not None and first is not None and parse_timestamp(first) >= parse_timestamp(end):
+        return False
+    return True
+
+
+def seal_segment(log_path, raw_path, compress=COMPRESS, level=COMPRESS_LEVEL):
+    """Compress a rotated log file and add it to the manifest; returns its manifest entry
+
+    Rows whose timestamp is missing or unparseable are kept and counted but
+    do not widen the segment's time bounds.
+    """
+    if compress not in COMPRESS_CHOICES:
+        raise ValueError(f"compress must be one of {COMPRESS_CHOICES}, got {compress!r}")
+    raw_path = Path(raw_path)
+    target = raw_path.with_name(raw_path.name + ".gz") if compress == "gzip" else raw_path
+    tmp = target.with_name(target.name + ".tmp")
+
+    rows = 0
+    first = last = None
+    head = None
+    out = None
+    try:
+        with open(raw_path, "rb") as src:
+            out = gzip.open(tmp, "wb", compresslevel=level) if compress == "gzip" else None
+            try:
+                for line in src:
+                    if head is None:
+                        head = hashlib.sha1(line).hexdigest() if line.endswith(b"\n") else None
+                    if out is not None:
+                        out.write(line)
+                    try:
+                        stamp = json.loads(line).get("timestamp")
+                    except (json.JSONDecodeError, AttributeError):
+                        continue
+                    rows += 1
+                    if stamp is None:
+                        continue
+                    try:
+                        when = parse_timestamp(stamp)
+                    except (ValueError, TypeError):
+                        continue
+                    if first is None or when < first[0]:
+                        first = (when, stamp)
+                    if last is None or when > last[0]:
+                        last = (when, stamp)
+            finally:
+                if out is not None:
+                    out.close()
+        if out is not None:
+            os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+    entry = {
+        "file": target.name,
+        "rows": rows,
+        "first_timestamp": first[1] if first else None,
+        "last_timestamp": last[1] if last else None,
+        "raw_bytes": raw_path.stat().st_size,
+        "stored_bytes": target.stat().st_size,
+        "head": head,
+    }
+    segments = [s for s in read_manifest(log_path) if s.get("file") != entry["file"]]
+    segments.append(entry)
+    _write_manifest(log_path, segments)
+    if target != raw_path:
+        raw_path.unlink()
+    return entry
+
+
+def seal_pending(log_path, compress=COMPRESS, level=COMPRESS_LEVEL):
+    """Seal rotated files left unsealed (older logs, or a crash mid-rotation); returns how many
+
+    A file that fails to seal is reported and left in place for the next
+    attempt; the files after it are still sealed. Runs under the log's seal
+    lock, so processes sharing the log never seal the same file twice.
+    """
+    log_path = Path(log_path)
+    lock = FileLock(lock_path(log_path, "seal"))
+    try:
+        with lock.hold():
+            sealed = {s.get("file") for s in read_manifest(log_path)}
+            count = 0
+            for raw_path in sorted(log_path.parent.glob(f"{log_path.stem}-*{log_path.suffix}")):
+                try:
+                    if raw_path.name + ".gz" in sealed:
+                        # Sealed, but the crash came before the raw file was removed
+                        raw_path.unlink()
+                    elif raw_path.name not in sealed:
+                        seal_segment(log_path, raw_path, compress, level)
+                        count += 1
+                except Exception as e:
+                    print(f"Warning: Could not seal log segment {raw_path}: {e}")
+            return count
+    finally:
+        lock.close()
@@ -0,0 +1,260 @@
+"""Background conversation log writer - bounded queue, batched appends, rotation into compressed segments"""
+
+import os
+import json
+import time
+import queue
+import atexit
+import threading
+from pathlib import Path
+from datetime import datetime
+
+from log_segments import COMPRESS, COMPRESS_LEVEL, COMPRESS_CHOICES, FileLock, lock_path, seal_pending
+from rollups import ROLLUP_SAVE_SECONDS
+
+QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("LOG_BATCH_SIZE", "256"))
+FLUSH_INTERVAL = float(os.getenv("LOG_FLUSH_INTERVAL", "0.5"))
+SYNC_POLICY = os.getenv("LOG_SYNC_POLICY", "flush").strip().lower()
+ROTATE_BYTES = int(os.getenv("LOG_ROTATE_BYTES", str(64 * 1024 * 1024)))
+ROTATE_SECONDS = float(os.getenv("LOG_ROTATE_SECONDS", "0"))
+
+SYNC_POLICIES = ("flush", "fsync")
+
+_STOP = object()
+
+
+def rotated_name(log_path, when=None):
+    """Name for a rotated log file, e.g. chat_logs-20260111T012912.jsonl"""
+    stamp = (when or datetime.utcnow()).strftime("%Y%m%dT%H%M%S%f")
+    return log_path.with_name(f"{log_path.stem}-{stamp}{log_path.suffix}")
+
+
+class BackgroundLogWriter:
+    """Append JSON log entries from a worker thread so requests never touch the disk
+
+    Entries are queued with submit() and written in batches of up to
+    batch_size lines. Each batch is flushed to the OS before the next
+    rotation can happen; with sync_policy "fsync" it is also forced to disk
+    ("flush" leaves that to the OS). The file is rotated when it
+    grows past rotate_bytes or is older than rotate_seconds (0 disables
+    either). Rotated files are sealed into segments (see log_segments),
+    gzip-compressed unless compress="none", by a separate sealer thread so
+    compressing a large file never stalls the queue. A `rollup` (ActivityRollup) is
+    synced on start - catching up with whatever was logged since its last
+    save, e.g. before a crash - and then at most every rollup_save_seconds
+    after writes and on close. When the queue is full, new entries are
+    dropped and counted rather than blocking the request.
+
+    Several processes may each run a writer on the same log. Appends and
+    rotation are serialized through a file lock (chat_logs.rotate.lock), and
+    a writer reopens the log when another process has rotated it. Rollup
+    syncs take turns under chat_logs.rollup.lock and count rows from the log
+    itself, so each writer's rollup includes the other processes' rows.
+    """
+
+    def __init__(self, log_path, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, sync_policy=SYNC_POLICY,
+                 rotate_bytes=ROTATE_BYTES, rotate_seconds=ROTATE_SECONDS,
+                 compress=COMPRESS, compress_level=COMPRESS_LEVEL,
+                 rollup=None, rollup_save_seconds=ROLLUP_SAVE_SECONDS):
+        if sync_policy not in SYNC_POLICIES:
+            raise ValueError(f"sync_policy must be one of {SYNC_POLICIES}, got {sync_policy!r}")
+        if compress not in COMPRESS_CHOICES:
+            raise ValueError(f"compress must be one of {COMPRESS_CHOICES}, got {compress!r}")
+
+        self.log_path = Path(log_path)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.sync_policy = sync_policy
+        self.rotate_bytes = rotate_bytes
+        self.rotate_seconds = rotate_seconds
+        self.compress = compress
+        self.compress_level = compress_level
+        self.rollup = rollup
+        self.rollup_save_seconds = rollup_save_seconds
+        self._rollup_dirty = False
+        self._rollup_saved_at = 0.0
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._file = None
+        self._opened_at = 0.0
+        self._rotate_lock = FileLock(lock_path(self.log_path, "rotate"))
+        self._closed = False
+        self._counters = {"enqueued": 0, "written": 0, "dropped": 0, "batches": 0, "rotations": 0,
+                          "segments_sealed": 0, "errors": 0}
+
+        self._seal_requested = threading.Event()
+        self._sealer = threading.Thread(target=self._seal_loop, name="log-sealer", daemon=True)
+        self._sealer.start()
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, entry):
+        """Queue an entry for writing; returns False if it had to be dropped"""
+        if self._closed:
+            self._count("dropped")
+            return False
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("enqueued")
+        return True
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def close(self, timeout=10.0):
+        """Stop accepting entries, drain the queue, close the file and finish sealing
+
+        Files still unsealed when the timeout runs out are sealed on the
+        next start.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        deadline = None if timeout is None else time.monotonic() + timeout
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        self._seal_requested.set()
+        self._sealer.join(None if deadline is None else max(deadline - time.monotonic(), 0))
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._counters[name] += amount
+
+    def _seal_loop(self):
+        """Seal rotated files: leftovers on start, then each rotation, until close()"""
+        while True:
+            # Once the writer has stopped, this pass sees its last rotation
+            final = self._closed and not self._thread.is_alive()
+            try:
+                self._count("segments_sealed", seal_pending(self.log_path, self.compress, self.compress_level))
+            except Exception as e:
+                # Unsealed files are retried on the next rotation or start
+                self._count("errors")
+                print(f"Error sealing rotated conversation logs: {e}")
+            if final:
+                return
+            self._seal_requested.wait()
+            self._seal_requested.clear()
+
+    def _run(self):
+        # Count what was logged since the rollup was last saved
+        self._rollup_dirty = True
+        self._save_rollup(force=True)
+
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._save_rollup()
+                continue
+
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+            if batch:
+                self._write_batch(batch)
+            self._save_rollup(force=stopping)
+
+        if self._file:
+            self._file.close()
+            self._file = None
+        self._rotate_lock.close()
+
+    def _write_batch(self, batch):
+        try:
+            self._rotate_if_needed()
+            lines = []
+            for entry in batch:
+                lines.append(json.dumps(entry, ensure_ascii=False) + "\n")
+            with self._rotate_lock.hold(exclusive=False):
+                self._reopen_if_rotated()
+                if self._file is None:
+                    self._open()
+                self._file.write("".join(lines))
+                # Buffered lines must not reach the file after another process renames it
+                self._file.flush()
+                if self.sync_policy == "fsync":
+                    os.fsync(self._file.fileno())
+            self._count("written", len(batch))
+            self._count("batches")
+        except Exception as e:
+            self._count("errors")
+            print(f"Error writing conversation logs: {e}")
+            return
+        # The rollup counts the written rows from the log on its next sync
+        self._rollup_dirty = True
+
+    def _save_rollup(self, force=False):
+        if self.rollup is None or not self._rollup_dirty:
+            return
+        if not force and time.monotonic() - self._rollup_saved_at < self.rollup_save_seconds:
+            return
+        try:
+            self.rollup.sync(self.log_path)
+            self._rollup_dirty = False
+            self._rollup_saved_at = time.monotonic()
+        except Exception as e:
+            self._count("errors")
+            print(f"Error saving activity rollup: {e}")
+
+    def _open(self):
+        self._file = open(self.log_path, "a", encoding="utf-8")
+        self._opened_at = time.time()
+
+    def _reopen_if_rotated(self):
+        """Drop the open file if the log path now names another file (rotated by another process)"""
+        if self._file is None:
+            return
+        try:
+            current = os.stat(self.log_path).st_ino
+        except FileNotFoundError:
+            current = None
+        if current != os.fstat(self._file.fileno()).st_ino:
+            self._file.close()
+            self._file = None
+
+    def _rotation_due(self):
+        if not self.log_path.exists():
+            return False
+        size = os.fstat(self._file.fileno()).st_size if self._file else self.log_path.stat().st_size
+        too_big = self.rotate_bytes and size >= self.rotate_bytes
+        too_old = (self.rotate_seconds and self._file is not None
+                   and time.time() - self._opened_at >= self.rotate_seconds)
+        return bool(too_big or too_old)
+
+    def _rotate_if_needed(self):
+        if not self._rotation_due():
+            return
+        with self._rotate_lock.hold():
+            # Another process may have rotated while this one waited for the lock
+            self._reopen_if_rotated()
+            if not self._rotation_due():
+                return
+            if self._file:
+                self._file.close()
+                self._file = None
+            self.log_path.rename(rotated_name(self.log_path))
+        self._count("rotations")
+        self._seal_requested.set()
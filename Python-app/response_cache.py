@@ -0,0 +1,95 @@
+"""In-process LRU + TTL cache for raw LLM completions"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import threading
+from collections import OrderedDict
+
+CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+CACHE_TTL = float(os.getenv("LLM_CACHE_TTL", "300"))
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def make_cache_key(messages, prompt_type):
+    """Hash the message list and prompt type, ignoring whitespace-only differences"""
+    normalized = [
+        [m.get("role", "user"), _WHITESPACE.sub(" ", str(m.get("content", ""))).strip()]
+        for m in messages
+    ]
+    payload = json.dumps([prompt_type, normalized], ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU cache of LLM replies with a TTL and a memory bound
+
+    Entries expire ttl seconds after they were stored. When either
+    max_entries or max_bytes (measured on the UTF-8 reply) is exceeded the
+    least recently used entries are evicted.
+    """
+
+    def __init__(self, max_entries=CACHE_MAX_ENTRIES, max_bytes=CACHE_MAX_BYTES, ttl=CACHE_TTL):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._counters = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0, "bypassed": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._counters["misses"] += 1
+                return None
+            expires_at, value, size = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._counters["expirations"] += 1
+                self._counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+            return value
+
+    def put(self, key, value):
+        size = len(value.encode("utf-8"))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._counters["evictions"] += 1
+
+    def record_bypass(self):
+        with self._lock:
+            self._counters["bypassed"] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self._counters)
+            stats.update({"entries": len(self._entries), "bytes": self._bytes})
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+    def _remove(self, key):
+        _, _, size = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,321 @@
+"""Activity rollups - conversation counts kept up to date as log entries are written
+
+The rollup holds per-hour (UTC) counts, status counts, action type counts
+and prompt/response character totals, so activity stats and the timeline
+chart cost O(buckets) instead of a pass over the raw log. Per-day counts
+are summed from the hours. Users are tracked in fixed-size sketches (see
+sketches.py) - a HyperLogLog for unique users and a SpaceSaving summary
+for the most active ones - so the rollup does not grow with the user base. It is persisted as compact JSON
+next to the log (chat_logs.rollup.json) together with the log position it
+has counted up to, and catch_up() counts whatever was logged after that
+position - rows written after the last save (e.g. before a crash) are
+counted on the next start instead of lost. backfill() recounts it from
+the raw log and its segments.
+"""
+
+import os
+import json
+import hashlib
+from pathlib import Path
+from collections import defaultdict
+
+from sketches import HyperLogLog, SpaceSaving
+from log_segments import (
+    FileLock, lock_path, list_segments, open_listed_segment, segment_id, first_line_hash, parse_timestamp,
+)
+
+ROLLUP_ENABLED = os.getenv("LOG_ROLLUP_ENABLED", "true").strip().lower() in ("1", "true", "yes")
+ROLLUP_SAVE_SECONDS = float(os.getenv("LOG_ROLLUP_SAVE_SECONDS", "10.0"))
+# 4 KiB of HyperLogLog registers (standard error about 1.6%) and 200 SpaceSaving counters
+ROLLUP_HLL_PRECISION = int(os.getenv("LOG_ROLLUP_HLL_PRECISION", "12"))
+ROLLUP_TOP_USERS = int(os.getenv("LOG_ROLLUP_TOP_USERS", "200"))
+
+ROLLUP_FORMAT = 3
+
+
+def rollup_path(log_path):
+    log_path = Path(log_path)
+    return log_path.with_name(f"{log_path.stem}.rollup.json")
+
+
+class ActivityRollup:
+    """Incrementally updated conversation counts; add() is meant for a single writer thread"""
+
+    def __init__(self, path=None, hll_precision=ROLLUP_HLL_PRECISION, top_capacity=ROLLUP_TOP_USERS):
+        self.path = Path(path) if path else None
+        self.hll_precision = hll_precision
+        self.top_capacity = top_capacity
+        self._saved_stat = None
+        self._clear()
+
+    def _clear(self):
+        # Segments counted so far, plus the first-line hash and byte offset reached in the live log
+        self.position = None
+        self.rows = 0
+        self.first_timestamp = None
+        self.last_timestamp = None
+        self.hours = defaultdict(int)
+        self.status = defaultdict(int)
+        self.with_actions = defaultdict(int)
+        self.action_types = defaultdict(int)
+        self.actions = 0
+        self.unique = HyperLogLog(self.hll_precision)
+        self.heavy = SpaceSaving(self.top_capacity)
+        self.prompt_chars = 0
+        self.response_chars = 0
+        self._first = None
+        self._last = None
+
+    def add(self, entry):
+        """Count one log entry as log_conversation writes it"""
+        stamp = entry.get("timestamp")
+        if stamp is None:
+            return
+        when = parse_timestamp(stamp)
+        self.rows += 1
+        if self._first is None or when < self._first:
+            self._first, self.first_timestamp = when, stamp
+        if self._last is None or when > self._last:
+            self._last, self.last_timestamp = when, stamp
+        self.hours[when.strftime("%Y-%m-%dT%H")] += 1
+
+        status = entry.get("status")
+        self.status[status] += 1
+        if entry.get("user_email") is not None:
+            self._count_user(entry["user_email"])
+        actions = entry.get("agent_actions") or []
+        if actions:
+            self.with_actions[status] += 1
+            self.actions += len(actions)
+            for action in actions:
+                self.action_types[action.get("type", "Unknown")] += 1
+        self.prompt_chars += len(entry.get("user_prompt") or "")
+        self.response_chars += len(entry.get("model_response") or "")
+
+    def add_all(self, entries):
+        for entry in entries:
+            self.add(entry)
+
+    def _count_user(self, user):
+        self.unique.add(user)
+        self.heavy.add(user)
+
+    def unique_users(self):
+        return self.unique.count()
+
+    def top_users(self, n):
+        """[(user, conversations)] for the n most active users, most active first"""
+        return self.heavy.top(n)
+
+    def error_bounds(self):
+        """Human-readable error bounds of the approximate figures"""
+        return {
+            'Unique Users': f"HyperLogLog estimate, standard error {self.unique.relative_error:.2%}",
+            'Top Users': f"SpaceSaving counts, each at most {self.heavy.max_error} above the true count",
+        }
+
+    def hourly(self):
+        """{hour of day: conversations} over all days, for the hours that had any"""
+        counts = defaultdict(int)
+        for bucket, count in self.hours.items():
+            counts[int(bucket[11:13])] += count
+        return dict(sorted(counts.items()))
+
+    def daily(self):
+        """{"YYYY-MM-DD": conversations}, oldest first"""
+        counts = defaultdict(int)
+        for bucket, count in self.hours.items():
+            counts[bucket[:10]] += count
+        return dict(sorted(counts.items()))
+
+    def catch_up(self, log_path):
+        """Count the rows logged after this rollup's position; returns how many were counted
+
+        New segments and the live log are read from where the position left
+        off. If the log no longer continues the position (truncated, or
+        segments rewritten) the rollup is recounted from scratch. Holds the
+        log's rotate lock shared, so the live log is not rotated midway.
+        """
+        log_path = Path(log_path)
+        lock = FileLock(lock_path(log_path, "rotate"))
+        try:
+            with lock.hold(exclusive=False):
+                return self._catch_up(log_path)
+        finally:
+            lock.close()
+
+    def _catch_up(self, log_path):
+        segments = list_segments(log_path)
+        ids = [segment_id(segment["file"]) for segment in segments]
+        head = first_line_hash(log_path)
+        size = log_path.stat().st_size if log_path.exists() else 0
+
+        # [(segment, or None for the live log, byte offset to start from)]
+        sources = None
+        position = self.position
+        if position is not None and position["segments"] == ids[:len(position["segments"])]:
+            new = segments[len(position["segments"]):]
+            if not new and position["head"] == head and size >= position["offset"]:
+                sources = [(None, position["offset"])]
+            elif new and position["head"] is not None and new[0].get("head") == position["head"]:
+                # The live log we were reading has been rotated since
+                sources = [(new[0], position["offset"])] + [(segment, 0) for segment in new[1:]] + [(None, 0)]
+            elif not position["offset"]:
+                sources = [(segment, 0) for segment in new] + [(None, 0)]
+        if sources is None:
+            if position is not None:
+                print(f"Warning: Activity rollup does not match {log_path}; recounting it")
+            self._clear()
+            sources = [(segment, 0) for segment in segments] + [(None, 0)]
+
+        rows = self.rows
+        offset = 0
+        for segment, start in sources:
+            if segment is None and not log_path.exists():
+                continue
+            with open_listed_segment(log_path, segment) if segment else open(log_path, "rb") as f:
+                f.seek(start)
+                offset = start
+                for line in f:
+                    if segment is None and not line.endswith(b"\n"):
+                        # Still being written: counted next time, once complete
+                        break
+                    if segment is None and offset == 0:
+                        # Another process may have been finishing this line when the head was hashed
+                        head = hashlib.sha1(line).hexdigest()
+                    offset += len(line)
+                    try:
+                        self.add(json.loads(line))
+                    except (json.JSONDecodeError, AttributeError, ValueError, TypeError):
+                        # Not a log entry, or an unparseable timestamp
+                        continue
+        self.position = {"segments": ids, "head": head, "offset": offset if log_path.exists() else 0}
+        return self.rows - rows
+
+    def sync(self, log_path):
+        """Catch up with the log and save, taking in any newer save by another process first
+
+        Runs under the rollup lock (chat_logs.rollup.lock), so processes
+        sharing a log take turns: each reloads the file if it changed since
+        its own last save, so no process overwrites counts with older ones.
+        The file is only rewritten when the counts or the position changed.
+        Returns how many rows were counted.
+        """
+        if self.path is None:
+            return self.catch_up(log_path)
+        lock = FileLock(lock_path(log_path, "rollup"))
+        try:
+            with lock.hold():
+                stat = self._stat()
+                if stat != self._saved_stat and self.path.exists():
+                    try:
+                        with open(self.path, "r", encoding="utf-8") as f:
+                            data = json.load(f)
+                        self._clear()
+                        self._update_from(data)
+                        self._saved_stat = stat
+                    except Exception as e:
+                        print(f"Warning: Ignoring unreadable activity rollup {self.path}: {e}")
+                position = self.position
+                counted = self.catch_up(log_path)
+                if counted or self.position != position or self._stat() != self._saved_stat:
+                    self.save()
+                return counted
+        finally:
+            lock.close()
+
+    def _stat(self):
+        try:
+            stat = self.path.stat()
+        except FileNotFoundError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def to_dict(self):
+        return {
+            "format": ROLLUP_FORMAT,
+            "position": self.position,
+            "rows": self.rows,
+            "first_timestamp": self.first_timestamp,
+            "last_timestamp": self.last_timestamp,
+            "hours": dict(self.hours),
+            "status": dict(self.status),
+            "with_actions": dict(self.with_actions),
+            "action_types": dict(self.action_types),
+            "actions": self.actions,
+            "unique_users": self.unique.to_dict(),
+            "top_users": self.heavy.to_dict(),
+            "prompt_chars": self.prompt_chars,
+            "response_chars": self.response_chars,
+        }
+
+    @classmethod
+    def from_dict(cls, data, path=None):
+        rollup = cls(path)
+        rollup._update_from(data)
+        return rollup
+
+    def _update_from(self, data):
+        if data.get("format") in (1, 2):
+            # Exact per-user counts are not converted; without a position the next catch_up recounts
+            self.position = None
+            return
+        if data.get("format") != ROLLUP_FORMAT:
+            raise ValueError(f"unsupported rollup format {data.get('format')!r}")
+        self.position = data.get("position")
+        self.rows = data["rows"]
+        self.first_timestamp = data["first_timestamp"]
+        self.last_timestamp = data["last_timestamp"]
+        self._first = parse_timestamp(self.first_timestamp) if self.first_timestamp else None
+        self._last = parse_timestamp(self.last_timestamp) if self.last_timestamp else None
+        for name in ("hours", "status", "with_actions", "action_types"):
+            getattr(self, name).update(data[name])
+        self.unique = HyperLogLog.from_dict(data["unique_users"])
+        self.heavy = SpaceSaving.from_dict(data["top_users"])
+        self.actions = data["actions"]
+        self.prompt_chars = data["prompt_chars"]
+        self.response_chars = data["response_chars"]
+
+    @classmethod
+    def load(cls, path):
+        """The rollup saved at `path`, or an empty one if there is none or it cannot be read"""
+        path = Path(path)
+        if not path.exists():
+            return cls(path)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                rollup = cls.from_dict(json.load(f), path)
+            rollup._saved_stat = rollup._stat()
+            return rollup
+        except Exception as e:
+            print(f"Warning: Ignoring unreadable activity rollup {path}: {e}")
+            return cls(path)
+
+    def save(self, path=None):
+        path = Path(path or self.path)
+        tmp = path.with_name(path.name + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(tmp, path)
+        if self.path is not None and path == self.path:
+            self._saved_stat = self._stat()
+
+
+def backfill(log_path, rollup=None, save=True):
+    """Recount the sealed segments and the live log into `rollup` (a new one by default)
+
+    Saving takes the rollup lock, and running writers take the recount in
+    on their next save.
+    """
+    log_path = Path(log_path)
+    rollup = rollup if rollup is not None else ActivityRollup(rollup_path(log_path))
+    rollup._clear()
+    rollup.catch_up(log_path)
+    if save:
+        lock = FileLock(lock_path(log_path, "rollup"))
+        try:
+            with lock.hold():
+                rollup.save()
+        finally:
+            lock.close()
+    return rollup
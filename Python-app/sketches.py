@@ -0,0 +1,203 @@
+"""Fixed-memory stream sketches - distinct counts, quantiles and heavy hitters in one pass
+
+HyperLogLog  distinct values; standard error 1.04 / sqrt(2 ** precision),
+             about 0.81% at the default precision 14 (16 KiB of registers).
+KLLSketch    approximate quantiles; with k=200 a returned value's rank is
+             within about 1.65% of n of the requested rank (99% confidence),
+             keeping O(k) items.
+SpaceSaving  the most frequent values among `capacity` counters; a reported
+             count overestimates the true one by at most n / capacity, and
+             every value seen more than n / capacity times is reported.
+"""
+
+import math
+import heapq
+import base64
+import random
+import hashlib
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """Estimate the number of distinct values added"""
+
+    def __init__(self, precision=14):
+        if not 4 <= precision <= 18:
+            raise ValueError("precision must be between 4 and 18")
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = bytearray(self.m)
+        self._value_bits = 64 - precision
+        self._value_mask = (1 << self._value_bits) - 1
+
+    def add(self, value):
+        h = _hash64(value)
+        index = h >> self._value_bits
+        rank = self._value_bits - (h & self._value_mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    def count(self):
+        m = self.m
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / sum(2.0 ** -r for r in self.registers)
+        zeros = self.registers.count(0)
+        if estimate <= 2.5 * m and zeros:
+            # Small cardinalities: linear counting over the empty registers
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+    @property
+    def relative_error(self):
+        return 1.04 / math.sqrt(self.m)
+
+    def to_dict(self):
+        return {"precision": self.precision, "registers": base64.b64encode(self.registers).decode("ascii")}
+
+    @classmethod
+    def from_dict(cls, data):
+        hll = cls(data["precision"])
+        registers = base64.b64decode(data["registers"])
+        if len(registers) != hll.m:
+            raise ValueError(f"expected {hll.m} HyperLogLog registers, got {len(registers)}")
+        hll.registers[:] = registers
+        return hll
+
+
+class KLLSketch:
+    """Approximate quantiles of a numeric stream
+
+    Items live in compactors; level h items stand for 2**h inputs. When the
+    sketch is over capacity the lowest full compactor is sorted and every
+    other item (random offset) is promoted, halving it.
+    """
+
+    def __init__(self, k=200, seed=None):
+        self.k = k
+        self.n = 0
+        self.compactors = [[]]
+        self.min = None
+        self.max = None
+        self._rng = random.Random(seed)
+        self._size = 0
+        self._max_size = self._capacity(0)
+
+    def _capacity(self, level):
+        depth = len(self.compactors) - level - 1
+        return max(2, int(math.ceil(self.k * (2 / 3) ** depth)))
+
+    def add(self, value):
+        self.n += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        self.compactors[0].append(value)
+        self._size += 1
+        if self._size > self._max_size:
+            self._compress()
+
+    def _compress(self):
+        for level, items in enumerate(self.compactors):
+            if len(items) >= self._capacity(level):
+                if level + 1 == len(self.compactors):
+                    self.compactors.append([])
+                    self._max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+                items.sort()
+                # An odd item out stays behind so the promoted weight stays exact
+                keep = [items.pop()] if len(items) % 2 else []
+                promoted = items[self._rng.randrange(2)::2]
+                self.compactors[level + 1].extend(promoted)
+                self.compactors[level] = keep
+                self._size -= len(items) - len(promoted)
+                return
+
+    def quantiles(self, fractions):
+        """Values at the given fractions (0..1) of the stream, in order"""
+        if not self.n:
+            return [None for _ in fractions]
+        weighted = sorted((value, 1 << level) for level, items in enumerate(self.compactors) for value in items)
+        total = sum(weight for _, weight in weighted)
+        results = []
+        for fraction in fractions:
+            if fraction <= 0:
+                results.append(self.min)
+                continue
+            if fraction >= 1:
+                results.append(self.max)
+                continue
+            target = fraction * total
+            seen = 0
+            for value, weight in weighted:
+                seen += weight
+                if seen >= target:
+                    results.append(value)
+                    break
+        return results
+
+    @property
+    def size(self):
+        return self._size
+
+
+class SpaceSaving:
+    """Heavy hitters: approximate counts of the most frequent values using `capacity` counters"""
+
+    def __init__(self, capacity=1000):
+        self.capacity = capacity
+        self.n = 0
+        self.counts = {}
+        self.errors = {}
+        # One (count, value) entry per monitored value; counts may be stale (too low) and are fixed on pop
+        self._heap = []
+
+    def add(self, value):
+        self.n += 1
+        if value in self.counts:
+            self.counts[value] += 1
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[value] = 1
+            self.errors[value] = 0
+            heapq.heappush(self._heap, (1, value))
+            return
+        while True:
+            count, smallest = heapq.heappop(self._heap)
+            if self.counts[smallest] == count:
+                break
+            heapq.heappush(self._heap, (self.counts[smallest], smallest))
+        del self.counts[smallest]
+        del self.errors[smallest]
+        self.counts[value] = count + 1
+        self.errors[value] = count
+        heapq.heappush(self._heap, (count + 1, value))
+
+    def top(self, n):
+        """[(value, estimated count)] for the n largest counts, largest first"""
+        return heapq.nlargest(n, self.counts.items(), key=lambda item: item[1])
+
+    @property
+    def max_error(self):
+        return self.n // self.capacity if len(self.counts) >= self.capacity else 0
+
+    def to_dict(self):
+        """JSON-ready state; values must be JSON scalars"""
+        return {
+            "capacity": self.capacity,
+            "n": self.n,
+            "counters": [[value, count, self.errors[value]] for value, count in self.counts.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        top = cls(data["capacity"])
+        top.n = data["n"]
+        for value, count, error in data["counters"]:
+            top.counts[value] = count
+            top.errors[value] = error
+        top._heap = [(count, value) for value, count in top.counts.items()]
+        heapq.heapify(top._heap)
+        return top
@@ -0,0 +1,46 @@
+"""Single-pass, bounded-memory analysis summary - the activity rollup with sketches for unbounded parts"""
+
+import re
+from collections import defaultdict
+
+from rollups import ActivityRollup
+from sketches import KLLSketch
+
+
+class StreamingSummary(ActivityRollup):
+    """ActivityRollup that also classifies queries and tracks length distributions, in bounded memory
+
+    Users are sketched as in the rollup, with larger sketches by default;
+    prompt and response lengths go into KLL quantile sketches. Everything
+    else is counted exactly and stays small: hour buckets, statuses, action
+    and query types. Error bounds are listed by error_bounds().
+    """
+
+    def __init__(self, query_patterns, hll_precision=14, quantile_k=200, top_capacity=1000, seed=None):
+        super().__init__(hll_precision=hll_precision, top_capacity=top_capacity)
+        self.query_patterns = [(query_type, re.compile(pattern)) for query_type, pattern in query_patterns.items()]
+        self.query_types = defaultdict(int)
+        self.prompt_lengths = KLLSketch(quantile_k, seed)
+        self.response_lengths = KLLSketch(quantile_k, None if seed is None else seed + 1)
+
+    def add(self, entry):
+        if entry.get("timestamp") is None:
+            return
+        super().add(entry)
+        prompt = entry.get("user_prompt")
+        query_type = "Other"
+        if isinstance(prompt, str):
+            prompt_lower = prompt.lower()
+            # First matching category wins, as in the frame path
+            query_type = next((name for name, pattern in self.query_patterns if pattern.search(prompt_lower)), "Other")
+            self.prompt_lengths.add(len(prompt))
+        self.query_types[query_type] += 1
+        response = entry.get("model_response")
+        if isinstance(response, str):
+            self.response_lengths.add(len(response))
+
+    def error_bounds(self):
+        bounds = super().error_bounds()
+        bounds['Length Quantiles'] = (f"KLL sketch (k={self.prompt_lengths.k}), rank within about 1.65% of n "
+                                      f"at 99% confidence")
+        return bounds
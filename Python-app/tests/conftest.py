@@ -0,0 +1,6 @@
+"""Make the app's flat modules importable from the tests, wherever pytest is started"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
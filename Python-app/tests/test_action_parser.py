@@ -0,0 +1,92 @@
+"""ActionParser - one-shot and incremental parsing of agent actions in LLM replies"""
+
+import pytest
+
+from action_parser import ActionParser
+
+REPLY = (
+    "Sure! **Learning Path: Data Scientist** is a great fit. See the Course Comparison below.\n"
+    "[ACTION:ADD_TO_CART]COURSE_TITLE: Ignored[/ACTION:ADD_TO_CART]\n"
+    "ACTIONS:\n"
+    "[ACTION:ADD_TO_CART]\nCOURSE_TITLE: Python Basics\n[/ACTION:ADD_TO_CART]\n"
+    "[ACTION:CREATE_LEARNING_PATH]\nCAREER_GOAL: Data Scientist\n[/ACTION:CREATE_LEARNING_PATH]\n"
+    "[ACTION:RECOMMEND_COURSES]\n[/ACTION:RECOMMEND_COURSES]\n"
+    "[ACTION:BOOK_SESSION]\nDATE: Monday\nTOPIC: pandas\n[/ACTION:BOOK_SESSION]\n"
+    "[ACTION:ADD_TO_CART]\nCOURSE_TITLE: Unclosed\n"
+)
+
+EXPECTED = [
+    {"type": "ADD_TO_CART", "course_title": "Python Basics"},
+    {"type": "RECOMMEND_COURSES", "executed": False},
+    {"type": "CREATE_LEARNING_PATH", "career_goal": "Data Scientist", "executed": False},
+    {"type": "CREATE_LEARNING_PATH", "career_goal": "Data Scientist", "executed": True},
+    {"type": "COMPARE_COURSES", "executed": True},
+]
+
+
+def feed_chunks(chunks):
+    parser = ActionParser()
+    for chunk in chunks:
+        parser.feed(chunk)
+    return parser.close()
+
+
+def test_parse_orders_client_backend_then_heuristic_actions():
+    assert ActionParser.parse(REPLY) == EXPECTED
+
+
+def test_blocks_outside_the_actions_section_are_ignored():
+    assert ActionParser.parse("[ACTION:ADD_TO_CART]COURSE_TITLE: Python[/ACTION:ADD_TO_CART]") == []
+
+
+def test_only_the_first_actions_section_counts():
+    reply = ("ACTIONS:\n[ACTION:ADD_TO_CART]COURSE_TITLE: First[/ACTION:ADD_TO_CART]\n"
+             "ACTIONS:\n[ACTION:ADD_TO_CART]COURSE_TITLE: Second[/ACTION:ADD_TO_CART]\n")
+    assert ActionParser.parse(reply) == [{"type": "ADD_TO_CART", "course_title": "First"}]
+
+
+def test_only_the_first_block_of_a_backend_action_is_used():
+    reply = ("ACTIONS:\n"
+             "[ACTION:CREATE_LEARNING_PATH]CAREER_GOAL: Analyst[/ACTION:CREATE_LEARNING_PATH]\n"
+             "[ACTION:CREATE_LEARNING_PATH]CAREER_GOAL: Engineer[/ACTION:CREATE_LEARNING_PATH]\n")
+    assert ActionParser.parse(reply) == [
+        {"type": "CREATE_LEARNING_PATH", "career_goal": "Analyst", "executed": False},
+    ]
+
+
+def test_unknown_action_types_are_dropped():
+    reply = ("ACTIONS:\n[ACTION:BOOK_SESSION]DATE: Monday[/ACTION:BOOK_SESSION]\n"
+             "[ACTION:ADD_TO_CART]COURSE_TITLE: Python[ACTION:FOO][/ACTION:FOO][/ACTION:ADD_TO_CART]\n")
+    assert ActionParser.parse(reply) == [{"type": "ADD_TO_CART", "course_title": "Python[ACTION:FOO][/ACTION:FOO]"}]
+
+
+def test_reply_without_actions():
+    assert ActionParser.parse("Just a plain answer.") == []
+    assert ActionParser.parse("") == []
+
+
+@pytest.mark.parametrize("split", [
+    REPLY.index("ACTIONS:") + 3,                      # "ACT" | "IONS:"
+    REPLY.index("ACTIONS:") + len("ACTIONS"),         # "ACTIONS" | ":"
+    REPLY.index("[ACTION:BOOK_SESSION]") + 5,         # inside an opening marker
+    REPLY.index("[/ACTION:RECOMMEND_COURSES]") + 2,   # inside a closing marker
+    REPLY.index("Learning Path:") + 8,                # inside a heuristic token
+])
+def test_two_chunks_split_inside_a_token(split):
+    assert feed_chunks([REPLY[:split], REPLY[split:]]) == EXPECTED
+
+
+def test_every_two_chunk_split_matches_one_shot_parse():
+    for split in range(len(REPLY) + 1):
+        assert feed_chunks([REPLY[:split], REPLY[split:]]) == EXPECTED, split
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64])
+def test_fixed_size_chunks_match_one_shot_parse(size):
+    assert feed_chunks([REPLY[i:i + size] for i in range(0, len(REPLY), size)]) == EXPECTED
+
+
+def test_marker_split_across_chunks_before_any_block():
+    assert feed_chunks(["Here you go. ACT", "IONS:\n[ACTION:RECOMMEND_COURSES]", "[/ACTION:RECOMMEND_COURSES]"]) == [
+        {"type": "RECOMMEND_COURSES", "executed": False},
+    ]
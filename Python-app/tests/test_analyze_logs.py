@@ -0,0 +1,88 @@
+"""ChatLogAnalyzer loading paths over a rotated log: sealed segments, rotated files not sealed yet, and the live log"""
+
+import json
+
+import pytest
+
+from analyze_logs import ChatLogAnalyzer
+from log_segments import seal_pending
+
+
+def entry(i):
+    return {
+        "timestamp": f"2026-01-{1 + i // 24:02d}T{i % 24:02d}:00:00Z",
+        "user_email": f"user{i % 5}@example.com",
+        "user_name": f"user{i % 5}",
+        "user_prompt": "recommend a python course" if i % 2 else "add Python Basics to my cart",
+        "db_context_summary": {"courses_count": 3},
+        "model_response": "Here you go.",
+        "agent_actions": [{"type": "ADD_TO_CART", "course_title": "Python Basics"}] if i % 2 == 0 else [],
+        "status": "success",
+    }
+
+
+def append(path, first, count):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(first, first + count):
+            f.write(json.dumps(entry(i)) + "\n")
+
+
+@pytest.fixture
+def log(tmp_path):
+    """20 rows in a rotated file that was never sealed, then 14 in the live log"""
+    path = tmp_path / "chat_logs.jsonl"
+    append(tmp_path / "chat_logs-20260101T000000000000.jsonl", 0, 20)
+    append(path, 20, 14)
+    return path
+
+
+def test_plain_load_reads_unsealed_rotated_files(log):
+    analyzer = ChatLogAnalyzer(log)
+    assert analyzer.load_logs()
+    assert len(analyzer.df) == 34
+    assert analyzer.df["user_email"].iloc[0] == "user0@example.com"
+
+
+def test_time_range_includes_unsealed_rotated_files(log):
+    analyzer = ChatLogAnalyzer(log)
+    assert analyzer.load_logs(start="2026-01-01T05:00:00Z", end="2026-01-02T00:00:00Z")
+    assert len(analyzer.df) == 19
+
+
+def test_cache_survives_sealing(log, tmp_path):
+    analyzer = ChatLogAnalyzer(log, cache_dir=tmp_path / "cache")
+    assert analyzer.load_logs(incremental=True)
+    assert len(analyzer.df) == 34
+    seal_pending(log)
+    assert not list(tmp_path.glob("chat_logs-*.jsonl"))
+
+    append(log, 34, 2)
+    analyzer = ChatLogAnalyzer(log, cache_dir=tmp_path / "cache")
+    assert analyzer.load_logs(incremental=True)
+    assert len(analyzer.df) == 36
+    assert analyzer.df["timestamp"].is_monotonic_increasing
+
+
+def test_stream_counts_unsealed_rotated_files(log):
+    analyzer = ChatLogAnalyzer(log)
+    assert analyzer.stream_logs()
+    assert analyzer.rollup.rows == 34
+
+
+def test_follow_across_rotation_without_sealing(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 20)
+    analyzer = ChatLogAnalyzer(log)
+    assert analyzer.follow_logs() == 20
+
+    log.rename(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+    append(log, 20, 14)
+    assert analyzer.follow_logs() == 14
+    assert len(analyzer.df) == 34
+
+    # Sealing the rotated file changes nothing the analyzer has not read
+    seal_pending(log)
+    append(log, 34, 1)
+    assert analyzer.follow_logs() == 1
+    assert len(analyzer.df) == 35
+    assert list(analyzer.df["timestamp"].dt.hour[:3]) == [0, 1, 2]
@@ -0,0 +1,35 @@
+"""CatalogIndex features, including catalogs with malformed course records"""
+
+from catalog_index import CatalogIndex, get_catalog_index
+
+COURSES = [
+    {"id": 1, "title": "JavaScript Basics", "category": "Web Development", "instructor": "Jane Doe", "rating": 4.8},
+    {"id": 2, "title": "Intermediate React", "category": "Web Development", "rating": None},
+    {"id": 3, "title": "Advanced Node.js", "category": "Web Development", "rating": "4.9"},
+    {"id": 4, "title": None, "category": None, "instructor": None},
+]
+
+
+def test_features_per_course():
+    index = CatalogIndex(COURSES)
+    assert index.levels == ["beginner", "intermediate", "advanced", "intermediate"]
+    assert index.by_category["web development"] == [0, 1, 2]
+    assert index.by_instructor == {"jane doe": [0]}
+    assert index.next_step == {"beginner": {1, 2}, "intermediate": {2}}
+
+
+def test_non_numeric_ratings_are_not_highly_rated():
+    assert CatalogIndex(COURSES).highly_rated == [True, False, False, False]
+
+
+def test_learning_path_with_malformed_records():
+    import app
+    path = app.create_learning_path([], COURSES, "I want to be a web developer",
+                                    get_catalog_index(COURSES, "malformed"))
+    assert [step["level"] for step in path["steps"]] == ["Foundation", "Intermediate", "Advanced"]
+    assert [step["courses"][0]["id"] for step in path["steps"]] == [1, 2, 3]
+
+
+def test_index_is_cached_per_version():
+    assert get_catalog_index(COURSES, "v1") is get_catalog_index(COURSES, "v1")
+    assert get_catalog_index(COURSES, "v1") is not get_catalog_index(COURSES, "v2")
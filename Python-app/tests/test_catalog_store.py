@@ -0,0 +1,142 @@
+"""CatalogStore versioned updates, and the /catalog routes' admin token and If-Match / baseVersion checks"""
+
+import asyncio
+
+import pytest
+
+import catalog_store
+from catalog_store import CatalogStore, CatalogVersionMismatch, ADMIN_TOKEN_HEADER, catalog_version
+
+COURSES = [
+    {"id": 1, "title": "Python Basics", "category": "Programming"},
+    {"id": 2, "title": "Data Science with R", "category": "Data"},
+    {"title": "Web Development Bootcamp", "category": "Web"},
+]
+TOKEN = "test-admin-token"
+
+
+def test_version_is_a_content_hash():
+    assert CatalogStore(COURSES).snapshot().version == catalog_version(COURSES)
+    assert CatalogStore(list(reversed(COURSES))).snapshot().version != catalog_version(COURSES)
+
+
+def test_replace_with_current_version():
+    store = CatalogStore(COURSES)
+    old = store.snapshot()
+    new = store.replace(COURSES[:1], expected_version=old.version)
+    assert new.courses == COURSES[:1]
+    assert store.snapshot() is new
+    assert old.courses == COURSES
+
+
+def test_replace_with_stale_version_raises():
+    store = CatalogStore(COURSES)
+    stale = store.snapshot().version
+    store.replace(COURSES[:2])
+    with pytest.raises(CatalogVersionMismatch) as raised:
+        store.replace(COURSES, expected_version=stale)
+    assert raised.value.expected == stale
+    assert raised.value.current == store.snapshot().version
+    assert store.snapshot().courses == COURSES[:2]
+
+
+def test_apply_delta_upserts_and_removes_by_id_or_title():
+    store = CatalogStore(COURSES)
+    snapshot, report = store.apply_delta(
+        upsert=[{"id": 1, "rating": 4.5}, {"id": 4, "title": "SQL for Analysts"}],
+        remove=["2", "Web Development Bootcamp"],
+        expected_version=store.snapshot().version,
+    )
+    assert report == {"added": 1, "updated": 1, "removed": 2}
+    assert snapshot.courses == [
+        {"id": 1, "title": "Python Basics", "category": "Programming", "rating": 4.5},
+        {"id": 4, "title": "SQL for Analysts"},
+    ]
+    assert snapshot.version == catalog_version(snapshot.courses)
+
+
+def test_apply_delta_without_changes_keeps_the_snapshot():
+    store = CatalogStore(COURSES)
+    before = store.snapshot()
+    snapshot, report = store.apply_delta(remove=["No Such Course"])
+    assert snapshot is before
+    assert report == {"added": 0, "updated": 0, "removed": 0}
+
+
+def test_apply_delta_with_stale_version_changes_nothing():
+    store = CatalogStore(COURSES)
+    with pytest.raises(CatalogVersionMismatch):
+        store.apply_delta(upsert=[{"id": 9, "title": "New"}], expected_version="0123456789abcdef")
+    assert store.snapshot().courses == COURSES
+
+
+def test_invalid_updates_are_rejected():
+    store = CatalogStore(COURSES)
+    with pytest.raises(ValueError):
+        store.replace({"courses": COURSES})
+    with pytest.raises(ValueError):
+        store.apply_delta(upsert=["Python Basics"])
+    with pytest.raises(ValueError):
+        store.apply_delta(remove="Python Basics")
+
+
+@pytest.fixture
+def flask_client(monkeypatch):
+    import app
+    monkeypatch.setattr(catalog_store, "CATALOG_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(app, "catalog_store", CatalogStore(COURSES))
+    return app.app.test_client()
+
+
+def test_put_with_current_etag(flask_client):
+    etag = flask_client.get("/catalog").headers["ETag"]
+    response = flask_client.put("/catalog", json={"courses": COURSES[:1]},
+                                headers={ADMIN_TOKEN_HEADER: TOKEN, "If-Match": etag})
+    assert response.status_code == 200
+    assert response.get_json()["version"] == catalog_version(COURSES[:1])
+    assert response.headers["ETag"] == f'"{catalog_version(COURSES[:1])}"'
+
+
+def test_patch_with_stale_etag_is_412(flask_client):
+    stale = flask_client.get("/catalog").headers["ETag"]
+    headers = {ADMIN_TOKEN_HEADER: TOKEN}
+    assert flask_client.patch("/catalog", json={"remove": [1]}, headers=headers).status_code == 200
+
+    response = flask_client.patch("/catalog", json={"remove": [2]}, headers=dict(headers, **{"If-Match": stale}))
+    assert response.status_code == 412
+    assert response.get_json()["version"] == catalog_version(COURSES[1:])
+    assert len(flask_client.get("/catalog").get_json()["courses"]) == 2
+
+
+def test_put_with_stale_base_version_is_412(flask_client):
+    response = flask_client.put("/catalog", json={"courses": COURSES, "baseVersion": "0123456789abcdef"},
+                                headers={ADMIN_TOKEN_HEADER: TOKEN})
+    assert response.status_code == 412
+
+
+def test_catalog_writes_need_the_admin_token(flask_client, monkeypatch):
+    assert flask_client.put("/catalog", json={"courses": []}).status_code == 401
+    assert flask_client.patch("/catalog", json={"remove": [1]},
+                              headers={ADMIN_TOKEN_HEADER: "wrong"}).status_code == 403
+    monkeypatch.setattr(catalog_store, "CATALOG_ADMIN_TOKEN", "")
+    assert flask_client.put("/catalog", json={"courses": []},
+                            headers={ADMIN_TOKEN_HEADER: TOKEN}).status_code == 403
+    assert len(flask_client.get("/catalog").get_json()["courses"]) == len(COURSES)
+
+
+def test_async_patch_with_stale_etag_is_412(monkeypatch):
+    from aiohttp.test_utils import TestClient, TestServer
+    import async_app
+    monkeypatch.setattr(catalog_store, "CATALOG_ADMIN_TOKEN", TOKEN)
+    monkeypatch.setattr(async_app, "catalog_store", CatalogStore(COURSES))
+
+    async def run():
+        async with TestClient(TestServer(async_app.create_app())) as client:
+            stale = (await client.get("/catalog")).headers["ETag"]
+            headers = {ADMIN_TOKEN_HEADER: TOKEN}
+            assert (await client.patch("/catalog", json={"remove": [1]}, headers=headers)).status == 200
+            response = await client.patch("/catalog", json={"remove": [2]}, headers=dict(headers, **{"If-Match": stale}))
+            assert response.status == 412
+            assert (await client.put("/catalog", json={"courses": []})).status == 401
+
+    asyncio.run(run())
@@ -0,0 +1,118 @@
+"""SingleFlight and AsyncSingleFlight - concurrent identical calls share one upstream call and its outcome"""
+
+import time
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from coalesce import SingleFlight, AsyncSingleFlight
+
+FOLLOWERS = 4
+
+
+class UpstreamError(Exception):
+    pass
+
+
+def run_coalesced(flights, fn):
+    """Call flights.do from a leader and FOLLOWERS threads that join while the leader's call is running"""
+    release = threading.Event()
+    calls = []
+
+    def upstream():
+        calls.append(1)
+        release.wait(5)
+        return fn()
+
+    with ThreadPoolExecutor(max_workers=FOLLOWERS + 1) as pool:
+        futures = [pool.submit(flights.do, "key", upstream)]
+        deadline = time.monotonic() + 5
+        while not calls and time.monotonic() < deadline:
+            time.sleep(0.001)
+        futures += [pool.submit(flights.do, "key", upstream) for _ in range(FOLLOWERS)]
+        while flights.get_stats()["coalesced"] < FOLLOWERS and time.monotonic() < deadline:
+            time.sleep(0.001)
+        release.set()
+    return futures, len(calls)
+
+
+def test_followers_share_the_leaders_result():
+    flights = SingleFlight()
+    result = object()
+    futures, calls = run_coalesced(flights, lambda: result)
+    assert calls == 1
+    assert all(future.result() is result for future in futures)
+    stats = flights.get_stats()
+    assert (stats["upstream_calls"], stats["coalesced"], stats["in_flight"]) == (1, FOLLOWERS, 0)
+
+
+def test_followers_get_the_leaders_exception():
+    flights = SingleFlight()
+    error = UpstreamError("LLM HTTP 502")
+
+    def fail():
+        raise error
+
+    futures, calls = run_coalesced(flights, fail)
+    assert calls == 1
+    for future in futures:
+        with pytest.raises(UpstreamError) as raised:
+            future.result()
+        assert raised.value is error
+    assert flights.get_stats()["errors"] == 1
+
+
+def test_key_is_forgotten_after_the_call():
+    flights = SingleFlight()
+    assert flights.do("key", lambda: 1) == 1
+    assert flights.do("key", lambda: 2) == 2
+    with pytest.raises(UpstreamError):
+        flights.do("key", lambda: (_ for _ in ()).throw(UpstreamError()))
+    assert flights.do("key", lambda: 3) == 3
+    assert flights.get_stats()["upstream_calls"] == 4
+
+
+def test_async_followers_share_result_and_exception():
+    async def run():
+        flights = AsyncSingleFlight()
+        calls = []
+
+        async def upstream(value):
+            calls.append(value)
+            await asyncio.sleep(0.01)
+            if isinstance(value, Exception):
+                raise value
+            return value
+
+        results = await asyncio.gather(*[flights.do("ok", upstream, "reply") for _ in range(FOLLOWERS + 1)])
+        assert results == ["reply"] * (FOLLOWERS + 1)
+
+        error = UpstreamError("timeout")
+        outcomes = await asyncio.gather(*[flights.do("bad", upstream, error) for _ in range(FOLLOWERS + 1)],
+                                        return_exceptions=True)
+        assert all(outcome is error for outcome in outcomes)
+        assert len(calls) == 2
+        assert flights.get_stats() == {"upstream_calls": 2, "coalesced": 2 * FOLLOWERS, "errors": 1, "in_flight": 0}
+
+    asyncio.run(run())
+
+
+def test_async_cancelled_waiter_does_not_cancel_the_shared_call():
+    async def run():
+        flights = AsyncSingleFlight()
+
+        async def upstream():
+            await asyncio.sleep(0.05)
+            return "reply"
+
+        leader = asyncio.ensure_future(flights.do("key", upstream))
+        follower = asyncio.ensure_future(flights.do("key", upstream))
+        await asyncio.sleep(0.01)
+        leader.cancel()
+        assert await follower == "reply"
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    asyncio.run(run())
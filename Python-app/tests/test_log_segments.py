@@ -0,0 +1,73 @@
+"""Sealing rotated log files and listing segments, sealed or still pending"""
+
+import json
+
+import pytest
+
+from log_segments import (
+    read_manifest, seal_pending, list_segments, open_listed_segment, segment_id, first_line_hash, overlaps,
+)
+
+
+def write_rows(path, timestamps):
+    with open(path, "w", encoding="utf-8") as f:
+        for stamp in timestamps:
+            f.write(json.dumps({"timestamp": stamp, "user_prompt": "hi"}) + "\n")
+
+
+@pytest.fixture
+def log(tmp_path):
+    write_rows(tmp_path / "chat_logs-20260101T000000000000.jsonl", ["2026-01-01T10:00:00Z", "2026-01-01T09:00:00Z"])
+    write_rows(tmp_path / "chat_logs-20260102T000000000000.jsonl", ["2026-01-02T10:00:00Z"])
+    write_rows(tmp_path / "chat_logs.jsonl", ["2026-01-03T10:00:00Z"])
+    return tmp_path / "chat_logs.jsonl"
+
+
+def test_seal_records_rows_bounds_and_head(log, tmp_path):
+    head = first_line_hash(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+    assert seal_pending(log) == 2
+    first, second = read_manifest(log)
+    assert first["file"] == "chat_logs-20260101T000000000000.jsonl.gz"
+    assert (first["rows"], first["first_timestamp"], first["last_timestamp"]) == \
+        (2, "2026-01-01T09:00:00Z", "2026-01-01T10:00:00Z")
+    assert first["head"] == head
+    assert second["rows"] == 1
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "chat_logs-20260101T000000000000.jsonl.gz", "chat_logs-20260102T000000000000.jsonl.gz",
+        "chat_logs.jsonl", "chat_logs.manifest.json", "chat_logs.seal.lock",
+    ]
+    assert seal_pending(log) == 0
+
+
+def test_list_segments_includes_pending_files_in_order(log, tmp_path):
+    (tmp_path / "chat_logs-20260101T000000000000.jsonl").rename(tmp_path / "first.jsonl")
+    seal_pending(log)
+    (tmp_path / "first.jsonl").rename(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+
+    segments = list_segments(log)
+    assert [segment["file"] for segment in segments] == [
+        "chat_logs-20260102T000000000000.jsonl.gz", "chat_logs-20260101T000000000000.jsonl",
+    ]
+    assert segments[1]["pending"] and not segments[0].get("pending")
+    assert segments[1]["head"] == first_line_hash(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+    assert all(overlaps(segment, end="2026-01-01T12:00:00Z") for segment in segments[1:])
+    assert not overlaps(segments[0], end="2026-01-01T12:00:00Z")
+
+
+def test_pending_segment_opens_after_it_was_sealed(log):
+    pending = list_segments(log)
+    assert [segment.get("pending") for segment in pending] == [True, True]
+    seal_pending(log)
+    assert [segment_id(segment["file"]) for segment in list_segments(log)] == [segment["file"] for segment in pending]
+    with open_listed_segment(log, pending[0]) as f:
+        assert len(f.readlines()) == 2
+    with pytest.raises(FileNotFoundError):
+        open_listed_segment(log, dict(pending[0], pending=False))
+
+
+def test_uncompressed_sealing_keeps_the_file(log):
+    assert seal_pending(log, compress="none") == 2
+    assert [segment["file"] for segment in list_segments(log)] == [
+        "chat_logs-20260101T000000000000.jsonl", "chat_logs-20260102T000000000000.jsonl",
+    ]
+    assert not any(segment.get("pending") for segment in list_segments(log))
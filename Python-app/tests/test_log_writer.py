@@ -0,0 +1,80 @@
+"""BackgroundLogWriter - batched appends, rotation by size, sealing and the rollup sync"""
+
+import json
+
+import pytest
+
+from log_writer import BackgroundLogWriter
+from log_segments import list_segments, open_listed_segment, read_manifest
+from rollups import ActivityRollup
+
+
+def entry(i):
+    return {"timestamp": f"2026-01-01T{i // 60 % 24:02d}:{i % 60:02d}:00Z", "user_email": f"user{i % 3}@example.com",
+            "user_prompt": f"question {i}", "agent_actions": [], "status": "success"}
+
+
+def logged_prompts(log_path):
+    prompts = []
+    for segment in list_segments(log_path):
+        with open_listed_segment(log_path, segment) as f:
+            prompts += [json.loads(line)["user_prompt"] for line in f]
+    with open(log_path, "rb") as f:
+        prompts += [json.loads(line)["user_prompt"] for line in f]
+    return prompts
+
+
+def test_rotated_files_are_sealed_in_order(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    writer = BackgroundLogWriter(log, batch_size=5, flush_interval=0.01, rotate_bytes=1000)
+    for i in range(100):
+        assert writer.submit(entry(i))
+    writer.close()
+
+    stats = writer.get_stats()
+    assert (stats["written"], stats["dropped"], stats["errors"]) == (100, 0, 0)
+    assert stats["rotations"] >= 2
+    assert stats["segments_sealed"] == stats["rotations"]
+    segments = read_manifest(log)
+    assert len(segments) == stats["rotations"]
+    assert all(segment["file"].endswith(".jsonl.gz") for segment in segments)
+    assert not list(tmp_path.glob("chat_logs-*.jsonl"))
+    assert logged_prompts(log) == [f"question {i}" for i in range(100)]
+
+
+def test_two_writers_share_one_log(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    writers = [BackgroundLogWriter(log, batch_size=3, flush_interval=0.01, rotate_bytes=2000, compress="none")
+               for _ in range(2)]
+    for i in range(120):
+        writers[i % 2].submit(entry(i))
+    for writer in writers:
+        writer.close()
+
+    prompts = logged_prompts(log)
+    assert sorted(prompts) == sorted(f"question {i}" for i in range(120))
+    assert sum(segment["rows"] for segment in read_manifest(log)) + sum(1 for _ in open(log)) == 120
+
+
+def test_rollup_is_synced_on_close(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    rollup = ActivityRollup(tmp_path / "chat_logs.rollup.json")
+    writer = BackgroundLogWriter(log, batch_size=10, flush_interval=0.01, rotate_bytes=1500, rollup=rollup)
+    for i in range(50):
+        writer.submit(entry(i))
+    writer.close()
+    assert rollup.rows == 50
+    assert ActivityRollup.load(tmp_path / "chat_logs.rollup.json").rows == 50
+
+
+def test_closed_writer_drops_entries(tmp_path):
+    writer = BackgroundLogWriter(tmp_path / "chat_logs.jsonl")
+    writer.close()
+    assert not writer.submit(entry(0))
+    assert writer.get_stats()["dropped"] == 1
+
+
+@pytest.mark.parametrize("options", [{"sync_policy": "none"}, {"compress": "zip"}])
+def test_invalid_options_are_rejected(tmp_path, options):
+    with pytest.raises(ValueError):
+        BackgroundLogWriter(tmp_path / "chat_logs.jsonl", **options)
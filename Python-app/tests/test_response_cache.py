@@ -0,0 +1,74 @@
+"""ResponseCache LRU/TTL/size bounds and make_cache_key normalization"""
+
+import pytest
+
+import response_cache
+from response_cache import ResponseCache, make_cache_key
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(response_cache.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_hit_and_miss_counted():
+    cache = ResponseCache()
+    assert cache.get("a") is None
+    cache.put("a", "reply")
+    assert cache.get("a") == "reply"
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ResponseCache(ttl=10)
+    cache.put("a", "reply")
+    clock[0] += 9.9
+    assert cache.get("a") == "reply"
+    clock[0] += 0.1
+    assert cache.get("a") is None
+    stats = cache.get_stats()
+    assert (stats["expirations"], stats["entries"], stats["bytes"]) == (1, 0, 0)
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = ResponseCache(max_entries=2)
+    cache.put("a", "1")
+    cache.put("b", "2")
+    cache.get("a")
+    cache.put("c", "3")
+    assert cache.get("b") is None
+    assert cache.get("a") == "1"
+    assert cache.get("c") == "3"
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_byte_bound_counts_utf8_and_skips_oversized_values():
+    cache = ResponseCache(max_bytes=10)
+    cache.put("a", "ééé")  # 6 bytes
+    cache.put("b", "abcd")
+    assert cache.get_stats()["bytes"] == 10
+    cache.put("c", "x")
+    assert cache.get("a") is None
+    cache.put("big", "x" * 11)
+    assert cache.get("big") is None
+    assert cache.get("b") == "abcd"
+
+
+def test_put_replaces_an_existing_entry():
+    cache = ResponseCache()
+    cache.put("a", "old reply")
+    cache.put("a", "new")
+    assert cache.get("a") == "new"
+    assert cache.get_stats()["bytes"] == 3
+
+
+def test_cache_key_ignores_whitespace_only_differences():
+    messages = [{"role": "system", "content": "Be brief."}, {"role": "user", "content": "Recommend  a\ncourse "}]
+    same = [{"role": "system", "content": " Be brief."}, {"role": "user", "content": "Recommend a course"}]
+    assert make_cache_key(messages, "improved") == make_cache_key(same, "improved")
+    assert make_cache_key(messages, "improved") != make_cache_key(messages, "naive")
+    assert make_cache_key(messages, "improved") != make_cache_key(messages[1:], "improved")
@@ -0,0 +1,130 @@
+"""ActivityRollup - counting, catch_up across crashes and rotation, persistence and saving only on change"""
+
+import os
+import json
+
+from rollups import ActivityRollup, backfill, rollup_path
+from log_segments import seal_pending
+
+
+def entry(i, status="success"):
+    return {"timestamp": f"2026-01-{1 + i // 24:02d}T{i % 24:02d}:30:00Z", "user_email": f"user{i % 4}@example.com",
+            "user_prompt": "hi", "model_response": "hello", "status": status,
+            "agent_actions": [{"type": "ADD_TO_CART"}] if i % 3 == 0 else []}
+
+
+def append(path, first, count):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(first, first + count):
+            f.write(json.dumps(entry(i)) + "\n")
+
+
+def test_counts():
+    rollup = ActivityRollup()
+    rollup.add_all(entry(i) for i in range(30))
+    rollup.add({"user_prompt": "no timestamp"})
+    assert rollup.rows == 30
+    assert rollup.unique_users() == 4
+    assert rollup.top_users(2) == [("user0@example.com", 8), ("user1@example.com", 8)]
+    assert (rollup.actions, rollup.with_actions["success"], rollup.action_types["ADD_TO_CART"]) == (10, 10, 10)
+    assert rollup.daily() == {"2026-01-01": 24, "2026-01-02": 6}
+    assert rollup.hourly()[0] == 2
+    assert (rollup.first_timestamp, rollup.last_timestamp) == ("2026-01-01T00:30:00Z", "2026-01-02T05:30:00Z")
+    assert rollup.prompt_chars == 60
+
+
+def test_saved_rollup_round_trips(tmp_path):
+    rollup = ActivityRollup(tmp_path / "chat_logs.rollup.json")
+    rollup.add_all(entry(i) for i in range(30))
+    rollup.save()
+    loaded = ActivityRollup.load(tmp_path / "chat_logs.rollup.json")
+    assert loaded.to_dict() == rollup.to_dict()
+    assert loaded.top_users(4) == rollup.top_users(4)
+
+
+def test_catch_up_counts_rows_written_after_the_last_save(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 10)
+    rollup = ActivityRollup(rollup_path(log))
+    assert rollup.sync(log) == 10
+
+    # Rows a crashed writer logged but never counted, and a line still being written
+    append(log, 10, 5)
+    with open(log, "a", encoding="utf-8") as f:
+        f.write('{"timestamp": "2026-01-')
+    rollup = ActivityRollup.load(rollup_path(log))
+    assert rollup.catch_up(log) == 5
+    assert rollup.rows == 15
+    assert rollup.catch_up(log) == 0
+
+
+def test_catch_up_follows_rotation_and_sealing(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 10)
+    rollup = ActivityRollup()
+    assert rollup.catch_up(log) == 10
+
+    append(log, 10, 2)
+    log.rename(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+    append(log, 12, 3)
+    assert rollup.catch_up(log) == 5
+
+    seal_pending(log)
+    append(log, 15, 1)
+    assert rollup.catch_up(log) == 1
+    assert rollup.rows == 16
+    assert rollup.to_dict() == backfill(log, save=False).to_dict()
+
+
+def test_truncated_log_is_recounted(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 10)
+    rollup = ActivityRollup()
+    rollup.catch_up(log)
+    log.unlink()
+    append(log, 100, 3)
+    assert rollup.catch_up(log) == 3
+    assert rollup.rows == 3
+
+
+def test_older_formats_are_recounted(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 6)
+    with open(rollup_path(log), "w", encoding="utf-8") as f:
+        json.dump({"format": 2, "position": {"segments": [], "head": None, "offset": 0}, "rows": 99,
+                   "users": {"someone@example.com": 99}}, f)
+    rollup = ActivityRollup.load(rollup_path(log))
+    assert rollup.position is None
+    rollup.sync(log)
+    assert (rollup.rows, rollup.unique_users()) == (6, 4)
+    with open(rollup_path(log), encoding="utf-8") as f:
+        saved = json.load(f)
+    assert saved["format"] == 3 and "users" not in saved
+
+
+def test_sync_rewrites_the_file_only_on_change(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    append(log, 0, 4)
+    rollup = ActivityRollup(rollup_path(log))
+    rollup.sync(log)
+    os.utime(rollup_path(log), ns=(0, 0))
+
+    # Reloads the touched file, finds nothing new and leaves it alone
+    assert rollup.sync(log) == 0
+    assert rollup_path(log).stat().st_mtime_ns == 0
+    append(log, 4, 1)
+    assert rollup.sync(log) == 1
+    assert ActivityRollup.load(rollup_path(log)).rows == 5
+
+
+def test_two_processes_share_the_saved_rollup(tmp_path):
+    log = tmp_path / "chat_logs.jsonl"
+    first, second = ActivityRollup(rollup_path(log)), ActivityRollup(rollup_path(log))
+    append(log, 0, 3)
+    first.sync(log)
+    append(log, 3, 2)
+    second.sync(log)
+    append(log, 5, 1)
+    first.sync(log)
+    assert first.rows == second.rows + 1 == 6
+    assert ActivityRollup.load(rollup_path(log)).rows == 6
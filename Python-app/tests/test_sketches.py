@@ -0,0 +1,96 @@
+"""HyperLogLog, KLLSketch and SpaceSaving - estimates stay within their documented bounds"""
+
+import random
+
+import pytest
+
+from sketches import HyperLogLog, KLLSketch, SpaceSaving
+
+
+def test_hyperloglog_estimate_within_error_bound():
+    hll = HyperLogLog(precision=12)
+    for i in range(20000):
+        hll.add(f"user{i}@example.com")
+    assert abs(hll.count() - 20000) <= 5 * hll.relative_error * 20000
+
+
+def test_hyperloglog_ignores_repeats():
+    hll = HyperLogLog()
+    for _ in range(50):
+        for i in range(100):
+            hll.add(i)
+    # Linear counting is near exact at small cardinalities
+    assert abs(hll.count() - 100) <= 2
+
+
+def test_hyperloglog_empty_and_precision_bounds():
+    assert HyperLogLog().count() == 0
+    for precision in (3, 19):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision)
+
+
+def test_kll_quantiles_within_rank_error():
+    n = 100_000
+    values = list(range(n))
+    random.Random(7).shuffle(values)
+    sketch = KLLSketch(k=200, seed=1)
+    for value in values:
+        sketch.add(value)
+
+    fractions = [0.01, 0.1, 0.25, 0.5, 0.75, 0.9, 0.99]
+    for fraction, estimate in zip(fractions, sketch.quantiles(fractions)):
+        # The value is its own rank here; allow a little over the 99% bound of 1.65% of n
+        assert abs(estimate - fraction * n) <= 0.02 * n, fraction
+    assert sketch.n == n
+    assert sketch.size < 4 * sketch.k
+
+
+def test_kll_extremes_and_empty():
+    sketch = KLLSketch(seed=3)
+    assert sketch.quantiles([0.5]) == [None]
+    for value in (5, 3, 9, 1):
+        sketch.add(value)
+    assert sketch.quantiles([0, 1]) == [1, 9]
+    assert sketch.quantiles([0.5]) == [3]
+
+
+def test_space_saving_exact_below_capacity():
+    top = SpaceSaving(capacity=10)
+    for value in "aababcabcd":
+        top.add(value)
+    assert top.top(2) == [("a", 4), ("b", 3)]
+    assert top.max_error == 0
+
+
+def test_space_saving_finds_heavy_hitters_with_bounded_overcount():
+    rng = random.Random(11)
+    stream = ["heavy1"] * 3000 + ["heavy2"] * 2000 + [f"rare{rng.randrange(5000)}" for _ in range(15000)]
+    rng.shuffle(stream)
+    top = SpaceSaving(capacity=100)
+    for value in stream:
+        top.add(value)
+
+    estimates = dict(top.top(2))
+    assert set(estimates) == {"heavy1", "heavy2"}
+    assert top.max_error == len(stream) // 100
+    for value, true_count in (("heavy1", 3000), ("heavy2", 2000)):
+        assert true_count <= estimates[value] <= true_count + top.max_error
+
+
+def test_hyperloglog_and_space_saving_round_trip():
+    hll, top = HyperLogLog(precision=10), SpaceSaving(capacity=5)
+    for i in range(300):
+        hll.add(i)
+        top.add(f"user{i % 3 if i % 2 else i}")
+    hll_copy, top_copy = HyperLogLog.from_dict(hll.to_dict()), SpaceSaving.from_dict(top.to_dict())
+    assert hll_copy.count() == hll.count()
+    assert (top_copy.top(5), top_copy.max_error) == (top.top(5), top.max_error)
+
+    # Restored sketches keep counting like the originals
+    for sketch in (top, top_copy):
+        for i in range(50):
+            sketch.add(f"new{i % 7}")
+    assert top_copy.top(5) == top.top(5)
+    with pytest.raises(ValueError):
+        HyperLogLog.from_dict(dict(hll.to_dict(), precision=11))
@@ -0,0 +1,105 @@
+"""TitleIndex - ranked fuzzy title lookup, checked against a brute-force scan of the catalog"""
+
+import random
+
+from title_index import TitleIndex, MIN_TOKEN_SCORE, normalize_title, title_tokens
+
+TITLES = [
+    "Python Basics",
+    "Advanced Python",
+    "Python for Data Science",
+    "Data Science with R",
+    "Intro to Machine Learning",
+    "Machine Learning with Python",
+    "Web Development Bootcamp",
+    "python basics",
+]
+
+
+def brute_force(index, query, limit):
+    """Score every title the way TitleIndex does, without posting lists or early stopping"""
+    query_tokens = set(title_tokens(normalize_title(query)))
+    query_weight = sum(index.idf.get(t, index.unknown_idf) for t in query_tokens)
+    exact_pos = index.exact.get(normalize_title(query), -1)
+    results = []
+    for pos, title in enumerate(index.normalized):
+        tokens = set(title_tokens(title))
+        shared_tokens = query_tokens & tokens
+        if not shared_tokens:
+            continue
+        shared = sum(index.idf[t] for t in sorted(shared_tokens))
+        score = shared / (query_weight + index.weights[pos] - shared)
+        count = len(shared_tokens)
+        if score >= MIN_TOKEN_SCORE or count >= 2 or count == len(query_tokens) or count == len(tokens):
+            results.append((-score, pos != exact_pos, pos))
+    return [pos for _, _, pos in sorted(results)[:limit]]
+
+
+def test_exact_match_wins_ties_case_and_whitespace_insensitive():
+    index = TitleIndex(TITLES)
+    assert index.best("  PYTHON   basics ") == 0
+    matches = index.match("python basics", limit=2)
+    assert [pos for pos, _ in matches] == [0, 7]
+    assert matches[0][1] == 1.0
+
+
+def test_token_overlap_ranks_titles():
+    index = TitleIndex(TITLES)
+    positions = [pos for pos, _ in index.match("python data science", limit=3)]
+    assert positions[0] == 2
+    assert 3 in positions
+
+
+def test_scores_are_bounded_and_limit_respected():
+    index = TitleIndex(TITLES)
+    matches = index.match("python", limit=3)
+    assert len(matches) == 3
+    assert all(0 < score <= 1 for _, score in matches)
+    assert [score for _, score in matches] == sorted((score for _, score in matches), reverse=True)
+
+
+def test_trigram_fallback_for_typos():
+    index = TitleIndex(TITLES)
+    # No query token is in the index, so titles are compared by character trigrams
+    assert [pos for pos, _ in index.match("Pyton Basic")] == [0, 7]
+    assert index.best("Webb Developmnt Bootcmp") == 6
+
+
+def test_no_match():
+    index = TitleIndex(TITLES)
+    assert index.match("quantum gastronomy") == []
+    assert index.best("quantum gastronomy") is None
+    assert index.match("") == []
+    assert index.match("python", limit=0) == []
+
+
+def test_matches_brute_force_on_a_larger_catalog():
+    rng = random.Random(5)
+    words = ["python", "data", "science", "web", "design", "advanced", "intro", "machine", "learning",
+             "cloud", "security", "java", "sql", "analytics", "react", "mobile", "devops", "ai"]
+    titles = [" ".join(rng.sample(words, rng.randint(1, 4))) for _ in range(3000)]
+    index = TitleIndex(titles)
+    for _ in range(200):
+        query = " ".join(rng.sample(words, rng.randint(1, 4)))
+        for limit in (1, 5):
+            assert [pos for pos, _ in index.match(query, limit)] == brute_force(index, query, limit), query
+
+
+def test_cart_action_title_is_resolved_against_the_catalog():
+    import app
+    courses = [{"id": 7, "title": "Python Basics", "rating": None}, {"id": 8, "title": "Advanced Python"}]
+    action = {"type": "ADD_TO_CART", "course_title": "Pyton Basic", "executed": False}
+    app.execute_actions([action], {"courses": courses}, "add python basics")
+    assert (action["course_title"], action["requested_title"], action["course_id"]) == ("Python Basics", "Pyton Basic", 7)
+
+
+def test_cart_action_survives_an_index_error(monkeypatch):
+    import app
+
+    def broken_index(courses, version=None):
+        raise TypeError("bad course record")
+
+    monkeypatch.setattr(app, "get_catalog_index", broken_index)
+    action = {"type": "ADD_TO_CART", "course_title": "Python Basics", "executed": False}
+    assert app.execute_actions([action], {"courses": [{"title": "Python Basics"}]}, "add python basics") == []
+    assert action["course_title"] == "Python Basics" and "course_id" not in action
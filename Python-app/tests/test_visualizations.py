@@ -0,0 +1,122 @@
+"""Watch mode - LiveChartData folded from appended rows matches the charts' full-frame data"""
+
+import json
+
+import numpy as np
+import matplotlib.pyplot as plt
+import pytest
+
+from analyze_logs import ChatLogAnalyzer
+from visualizations import ChatVisualizer, VISUALIZATION_COLUMNS
+
+PROMPTS = ["recommend a python course", "add Python Basics to my cart", "compare these two courses",
+           "hello there", "create a learning path for data science"]
+
+
+def entry(i):
+    return {
+        "timestamp": f"2026-01-{1 + i // 200:02d}T{i * 7 % 24:02d}:15:00Z",
+        "user_email": f"user{i % 6}@example.com" if i % 9 else None,
+        "user_prompt": PROMPTS[i % len(PROMPTS)] * (1 + i % 3),
+        "model_response": "Sure. " * (3 + i % 11),
+        "agent_actions": [{"type": "ADD_TO_CART"}] if i % 4 == 0 else [],
+        "status": "error" if i % 10 == 3 else "success",
+    }
+
+
+def append(path, first, count):
+    with open(path, "a", encoding="utf-8") as f:
+        for i in range(first, first + count):
+            f.write(json.dumps(entry(i)) + "\n")
+
+
+@pytest.fixture
+def visualizer(tmp_path, monkeypatch):
+    plt.switch_backend("Agg")
+    monkeypatch.chdir(tmp_path)
+    return ChatVisualizer(ChatLogAnalyzer(tmp_path / "chat_logs.jsonl"))
+
+
+def follow(visualizer):
+    new_rows = visualizer.analyzer.follow_logs(columns=VISUALIZATION_COLUMNS)
+    if new_rows:
+        visualizer._follow_live_data(new_rows)
+    return new_rows
+
+
+def assert_matches_full_frame(visualizer):
+    full = ChatVisualizer(ChatLogAnalyzer(visualizer.analyzer.log_file_path))
+    assert full.analyzer.load_logs()
+    live = visualizer.live
+
+    expected = full._query_type_distribution_data()
+    actual = live.query_type_distribution_data()
+    assert dict(zip(actual['labels'], actual['counts'])) == dict(zip(expected['labels'], expected['counts']))
+    assert live.agent_action_analytics_data() == full._agent_action_analytics_data()
+    assert live.user_activity_timeline_data() == full._user_activity_timeline_data()
+
+    expected, actual = full._response_analysis_data(), live.response_analysis_data()
+    for key in ('prompt_length', 'response_length'):
+        assert np.array_equal(actual[key], expected[key])
+    assert actual['mean_response_length'] == pytest.approx(expected['mean_response_length'])
+    assert np.allclose(actual['trend'], expected['trend'])
+
+    expected_table = full._evaluation_summary_table_data()['table_data']
+    actual_table = live.evaluation_summary_table_data()['table_data']
+    # The most common query type is only defined up to ties
+    assert actual_table[:7] + actual_table[8:] == expected_table[:7] + expected_table[8:]
+
+
+def test_live_aggregates_match_the_full_frame_after_appends(visualizer):
+    log = visualizer.analyzer.log_file_path
+    append(log, 0, 50)
+    assert follow(visualizer) == 50
+    assert_matches_full_frame(visualizer)
+
+    live = visualizer.live
+    for first, count in ((50, 7), (57, 1), (58, 1200)):
+        append(log, first, count)
+        assert follow(visualizer) == count
+        assert visualizer.live is live
+        assert_matches_full_frame(visualizer)
+
+
+def test_live_aggregates_follow_rotation(visualizer, tmp_path):
+    log = visualizer.analyzer.log_file_path
+    append(log, 0, 30)
+    follow(visualizer)
+    live = visualizer.live
+    log.rename(tmp_path / "chat_logs-20260101T000000000000.jsonl")
+    append(log, 30, 12)
+    assert follow(visualizer) == 12
+    assert visualizer.live is live and live.rows == 42
+    assert_matches_full_frame(visualizer)
+
+
+def test_rebuilt_frame_resets_the_aggregates(visualizer):
+    log = visualizer.analyzer.log_file_path
+    append(log, 0, 20)
+    follow(visualizer)
+    log.unlink()
+    append(log, 100, 5)
+    assert follow(visualizer) == 5
+    assert visualizer.live.rows == 5
+    assert_matches_full_frame(visualizer)
+
+
+def test_only_changed_charts_are_saved_again(visualizer):
+    log = visualizer.analyzer.log_file_path
+    append(log, 0, 40)
+    follow(visualizer)
+    figures = {}
+    try:
+        assert len(visualizer._refresh_live_charts(figures)) == len(ChatVisualizer.CHARTS)
+        assert all(path.exists() for path in (visualizer.output_dir / info[2] for info in ChatVisualizer.CHARTS.values()))
+        assert visualizer._refresh_live_charts(figures) == []
+
+        append(log, 40, 1)
+        follow(visualizer)
+        assert 0 < len(visualizer._refresh_live_charts(figures)) <= len(ChatVisualizer.CHARTS)
+    finally:
+        for fig, _, _ in figures.values():
+            plt.close(fig)
@@ -0,0 +1,183 @@
+"""Ranked fuzzy lookup of course titles - an IDF-weighted token index with a trigram fallback for typos"""
+
+import re
+import math
+import heapq
+import threading
+from collections import defaultdict
+
+import numpy as np
+
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+# Weighted token overlap a title needs when it neither contains nor is contained in the query
+MIN_TOKEN_SCORE = 0.5
+MIN_TRIGRAM_SCORE = 0.4
+# Trigrams in more titles than this only gather candidates when rarer ones found none
+MAX_TRIGRAM_POSTINGS = 2000
+TRIGRAM_CANDIDATES = 50
+# Below this many candidates, re-tokenizing their titles beats scanning long posting lists
+SMALL_CANDIDATE_SET = 256
+
+
+def normalize_title(title):
+    return " ".join((title or "").lower().split())
+
+
+def title_tokens(text):
+    return _TOKEN.findall(text.lower())
+
+
+def trigrams(text):
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TitleIndex:
+    """Find the catalog titles that best match a free-text title
+
+    Titles are scored by IDF-weighted Jaccard overlap of their tokens with
+    the query; an exact (case and whitespace insensitive) match wins its
+    ties. Posting lists are read rarest token first and reading stops once
+    no title outside the candidates could outscore the current top matches,
+    so a lookup touches a small part of a large catalog. When no token
+    matches, titles are compared by character trigrams instead.
+    """
+
+    def __init__(self, titles):
+        self.size = len(titles)
+        self.normalized = [normalize_title(t) for t in titles]
+        self.exact = {}
+        postings = defaultdict(list)
+        token_counts = []
+
+        for pos, title in enumerate(self.normalized):
+            self.exact.setdefault(title, pos)
+            tokens = set(title_tokens(title))
+            token_counts.append(len(tokens))
+            for token in tokens:
+                postings[token].append(pos)
+
+        self.postings = {token: np.array(p, dtype=np.int64) for token, p in postings.items()}
+        self.idf = {token: math.log(1 + self.size / len(p)) for token, p in postings.items()}
+        self.unknown_idf = math.log(1 + self.size)
+        self.token_counts = np.array(token_counts, dtype=np.int64)
+        self.weights = np.zeros(self.size)
+        for token, p in self.postings.items():
+            self.weights[p] += self.idf[token]
+        self._trigram_postings = None
+        self._trigram_lock = threading.Lock()
+
+    def match(self, query, limit=5):
+        """Up to `limit` (position, score) pairs for `query`, best first; scores are in [0, 1]"""
+        normalized = normalize_title(query)
+        if not normalized or limit < 1:
+            return []
+        positions, scores = self._token_matches(normalized, limit)
+        if not len(positions):
+            positions, scores = self._trigram_matches(normalized)
+        exact_pos = self.exact.get(normalized, -1)
+        order = np.lexsort((positions, positions != exact_pos, -scores))[:limit]
+        return list(zip(positions[order].tolist(), scores[order].tolist()))
+
+    def best(self, query):
+        """Position of the best match for `query`, or None"""
+        matches = self.match(query, limit=1)
+        return matches[0][0] if matches else None
+
+    def _score(self, candidates, shared, counts, query_weight, query_size):
+        scores = shared / (query_weight + self.weights[candidates] - shared)
+        # Same acceptance as the original matcher: containment either way or two shared words
+        accepted = ((scores >= MIN_TOKEN_SCORE) | (counts >= 2) | (counts == query_size)
+                    | (counts == self.token_counts[candidates]))
+        return scores, accepted
+
+    def _token_matches(self, normalized, limit):
+        query_tokens = set(title_tokens(normalized))
+        known = sorted((t for t in query_tokens if t in self.postings), key=lambda t: len(self.postings[t]))
+        if not known:
+            return np.empty(0, dtype=np.int64), np.empty(0)
+        query_weight = sum(self.idf.get(t, self.unknown_idf) for t in query_tokens)
+        unread = sum(self.idf[t] for t in known)
+
+        candidates = np.empty(0, dtype=np.int64)
+        shared = np.empty(0)
+        counts = np.empty(0)
+        for read, token in enumerate(known, 1):
+            postings = self.postings[token]
+            idf = self.idf[token]
+            merged, inverse = np.unique(np.concatenate([candidates, postings]), return_inverse=True)
+            shared = np.bincount(inverse, np.concatenate([shared, np.full(len(postings), idf)]), len(merged))
+            counts = np.bincount(inverse, np.concatenate([counts, np.ones(len(postings))]), len(merged))
+            candidates = merged
+            unread -= idf
+            if read == len(known):
+                break
+
+            # A title not yet seen shares only unread tokens, so it scores at most unread / query_weight.
+            # Few candidates are scored in full; many are judged on their partial (lower bound) scores.
+            small = len(candidates) <= SMALL_CANDIDATE_SET
+            if small:
+                full_shared, full_counts = self._with_unread(candidates, shared, counts, known[read:])
+            else:
+                full_shared, full_counts = shared, counts
+            scores, accepted = self._score(candidates, full_shared, full_counts, query_weight, len(query_tokens))
+            top = scores[accepted]
+            if len(top) >= limit and np.partition(top, len(top) - limit)[len(top) - limit] >= unread / query_weight:
+                if not small:
+                    full_shared, full_counts = self._with_unread(candidates, shared, counts, known[read:])
+                shared, counts = full_shared, full_counts
+                break
+
+        scores, accepted = self._score(candidates, shared, counts, query_weight, len(query_tokens))
+        return candidates[accepted], scores[accepted]
+
+    def _with_unread(self, candidates, shared, counts, tokens):
+        """Copies of shared/counts crediting candidates with query tokens whose postings were not read"""
+        shared = shared.copy()
+        counts = counts.copy()
+        if len(candidates) <= SMALL_CANDIDATE_SET:
+            for i, pos in enumerate(candidates.tolist()):
+                title_token_set = set(title_tokens(self.normalized[pos]))
+                for token in tokens:
+                    if token in title_token_set:
+                        shared[i] += self.idf[token]
+                        counts[i] += 1
+        else:
+            for token in tokens:
+                member = np.isin(candidates, self.postings[token], assume_unique=True)
+                shared += member * self.idf[token]
+                counts += member
+        return shared, counts
+
+    def _trigram_index(self):
+        with self._trigram_lock:
+            if self._trigram_postings is None:
+                postings = defaultdict(list)
+                for pos, title in enumerate(self.normalized):
+                    for gram in trigrams(title):
+                        postings[gram].append(pos)
+                self._trigram_postings = postings
+        return self._trigram_postings
+
+    def _trigram_matches(self, normalized):
+        postings = self._trigram_index()
+        query_grams = trigrams(normalized)
+        known = sorted((g for g in query_grams if g in postings), key=lambda g: len(postings[g]))
+
+        counts = defaultdict(int)
+        for gram in known:
+            if counts and len(postings[gram]) > MAX_TRIGRAM_POSTINGS:
+                break
+            for pos in postings[gram]:
+                counts[pos] += 1
+
+        positions = []
+        scores = []
+        for pos in heapq.nlargest(TRIGRAM_CANDIDATES, counts, key=counts.get):
+            title_grams = trigrams(self.normalized[pos])
+            shared = len(query_grams & title_grams)
+            score = shared / (len(query_grams) + len(title_grams) - shared)
+            if score >= MIN_TRIGRAM_SCORE:
+                positions.append(pos)
+                scores.append(score)
+        return np.array(positions, dtype=np.int64), np.array(scores)
@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 """AI Chatbot Visualizations - Creates charts and graphs for AB report evaluation"""
 
+import time
+import argparse
 import matplotlib.pyplot as plt
 import seaborn as sns
+import numpy as np
 import pandas as pd
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
 from analyze_logs import ChatLogAnalyzer
 
 plt.style.use('seaborn-v0_8')
@@ -12,182 +16,483 @@ sns.set_palette("husl")
 plt.rcParams['figure.figsize'] = (12, 8)
 plt.rcParams['font.size'] = 12
 
+# Columns the charts and summary table read from the analyzer frame
+VISUALIZATION_COLUMNS = ['timestamp', 'user_email', 'status', 'agent_actions', 'query_type', 'hour', 'date',
+                         'has_agent_action', 'action_count', 'prompt_length', 'response_length']
+# Charts that can be drawn from the analyzer's activity rollup when no frame is loaded
+ROLLUP_CHARTS = ['user_activity_timeline']
+# Seconds between checks of the log in watch mode
+WATCH_INTERVAL = 5.0
+
+# Chart functions take only pre-aggregated plain data so they can run in worker processes.
+# draw_* builds a figure and returns it with the artists that depend on the data;
+# update_* sets those artists from new data in place, returning False when the
+# figure's layout (number of bars, wedges or rows) no longer fits and it must be redrawn.
+
+def _save_figure(fig, output_path):
+    fig.savefig(output_path, dpi=300, bbox_inches='tight')
+    return output_path
+
+def _relayout(fig):
+    """tight_layout from the default subplot positions, as when the figure was drawn
+
+    tight_layout depends on the current positions (notably around the
+    equal-aspect pie), so repeating it on an updated figure would drift.
+    """
+    fig.subplots_adjust(**{key: plt.rcParams[f'figure.subplot.{key}']
+                           for key in ('left', 'right', 'bottom', 'top', 'wspace', 'hspace')})
+    fig.tight_layout()
+
+def _label_bars(ax, bars):
+    return [ax.text(bar.get_x() + bar.get_width()/2., bar.get_height() + 0.1,
+                    f'{int(bar.get_height())}', ha='center', va='bottom', fontweight='bold')
+            for bar in bars]
+
+def _set_bars(bars, texts, heights):
+    for bar, text, height in zip(bars, texts, heights):
+        bar.set_height(height)
+        text.set_y(height + 0.1)
+        text.set_text(f'{int(height)}')
+
+def draw_query_type_distribution(data):
+    fig, ax = plt.subplots(figsize=(10, 6))
+    
+    positions = range(len(data['labels']))
+    bars = ax.bar(positions, data['counts'],
+                  color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'])
+    
+    ax.set_title('Distribution of User Query Types', fontsize=16, fontweight='bold', pad=20)
+    ax.set_xlabel('Query Type', fontsize=12)
+    ax.set_ylabel('Number of Queries', fontsize=12)
+    ax.set_xticks(positions, data['labels'], rotation=45, ha='right')
+    
+    texts = _label_bars(ax, bars)
+    
+    ax.grid(axis='y', alpha=0.3)
+    fig.tight_layout()
+    return fig, {'ax': ax, 'bars': bars, 'texts': texts}
+
+def update_query_type_distribution(fig, artists, data):
+    ax = artists['ax']
+    if len(data['labels']) != len(artists['bars']):
+        return False
+    _set_bars(artists['bars'], artists['texts'], data['counts'])
+    ax.set_xticks(range(len(data['labels'])), data['labels'], rotation=45, ha='right')
+    ax.relim()
+    ax.autoscale_view()
+    _relayout(fig)
+    return True
+
+def draw_agent_action_analytics(data):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    wedges, labels, percents = ax1.pie(data['action_counts'], labels=['No Agent Action', 'Has Agent Action'],
+                                       colors=['#FF6B6B', '#4ECDC4'], autopct='%1.1f%%',
+                                       startangle=90, textprops={'fontsize': 12})
+    ax1.set_title('Agent Action Trigger Rate', fontsize=14, fontweight='bold')
+    
+    bars = ax2.bar(['Success', 'Error'],
+                  [data['success'], data['error']],
+                  color=['#4ECDC4', '#FF6B6B'])
+    
+    ax2.set_title('Agent Action Success Rate', fontsize=14, fontweight='bold')
+    ax2.set_ylabel('Number of Actions', fontsize=12)
+    
+    texts = _label_bars(ax2, bars)
+    
+    ax2.grid(axis='y', alpha=0.3)
+    fig.suptitle('Agent Action Analytics', fontsize=16, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return fig, {'wedges': wedges, 'labels': labels, 'percents': percents,
+                 'ax2': ax2, 'bars': bars, 'texts': texts}
+
+def update_agent_action_analytics(fig, artists, data):
+    counts = data['action_counts']
+    if len(counts) != len(artists['wedges']):
+        return False
+    # Same geometry as Axes.pie: wedges from 90 degrees counterclockwise,
+    # labels at 1.1 and percentages at 0.6 of the radius
+    theta1 = 90.0
+    total = float(sum(counts))
+    for wedge, label, percent, count in zip(artists['wedges'], artists['labels'], artists['percents'], counts):
+        fraction = count / total
+        theta2 = theta1 + 360.0 * fraction
+        wedge.set_theta1(theta1)
+        wedge.set_theta2(theta2)
+        middle = np.deg2rad((theta1 + theta2) / 2)
+        x, y = np.cos(middle), np.sin(middle)
+        label.set_position((1.1 * x, 1.1 * y))
+        label.set_horizontalalignment('left' if x > 0 else 'right')
+        percent.set_position((0.6 * x, 0.6 * y))
+        percent.set_text(f'{100 * fraction:.1f}%')
+        theta1 = theta2
+    
+    _set_bars(artists['bars'], artists['texts'], [data['success'], data['error']])
+    artists['ax2'].relim()
+    artists['ax2'].autoscale_view()
+    _relayout(fig)
+    return True
+
+def _mark_peak_hours(ax, activity_counts):
+    max_activity = max(activity_counts)
+    peak_hours = [i for i, count in enumerate(activity_counts) if count == max_activity]
+    lines = [ax.axvline(x=hour, color='red', linestyle='--', alpha=0.5, label=f'Peak: {hour}:00')
+             for hour in peak_hours]
+    ax.legend()
+    return lines
+
+def draw_user_activity_timeline(data):
+    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
+    
+    hours = list(range(24))
+    activity_counts = data['hourly_counts']
+    
+    bars = ax1.bar(hours, activity_counts, color='#45B7D1', alpha=0.7)
+    ax1.set_title('User Activity by Hour of Day', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Hour of Day', fontsize=12)
+    ax1.set_ylabel('Number of Conversations', fontsize=12)
+    ax1.set_xticks(range(0, 24, 2))
+    ax1.grid(axis='y', alpha=0.3)
+    
+    peak_lines = _mark_peak_hours(ax1, activity_counts)
+    
+    line, = ax2.plot(data['daily_dates'], data['daily_counts'],
+                     marker='o', linewidth=2, markersize=6, color='#4ECDC4')
+    ax2.set_title('Daily Conversation Trend', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Date', fontsize=12)
+    ax2.set_ylabel('Number of Conversations', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    
+    fig.suptitle('User Activity Timeline Analysis', fontsize=16, fontweight='bold', y=0.98)
+    fig.tight_layout()
+    return fig, {'ax1': ax1, 'bars': bars, 'peak_lines': peak_lines, 'ax2': ax2, 'line': line}
+
+def update_user_activity_timeline(fig, artists, data):
+    ax1, ax2 = artists['ax1'], artists['ax2']
+    activity_counts = data['hourly_counts']
+    for bar, count in zip(artists['bars'], activity_counts):
+        bar.set_height(count)
+    for peak_line in artists['peak_lines']:
+        peak_line.remove()
+    artists['peak_lines'] = _mark_peak_hours(ax1, activity_counts)
+    ax1.relim()
+    ax1.autoscale_view()
+    
+    artists['line'].set_data(data['daily_dates'], data['daily_counts'])
+    ax2.relim()
+    ax2.autoscale_view()
+    plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
+    _relayout(fig)
+    return True
+
+def draw_response_analysis(data):
+    fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
+    
+    _, _, patches = ax1.hist(data['response_length'], bins=20, color='#96CEB4',
+                             alpha=0.7, edgecolor='black')
+    ax1.set_title('Response Length Distribution', fontsize=14, fontweight='bold')
+    ax1.set_xlabel('Response Length (characters)', fontsize=12)
+    ax1.set_ylabel('Frequency', fontsize=12)
+    ax1.grid(axis='y', alpha=0.3)
+    
+    mean_length = data['mean_response_length']
+    mean_line = ax1.axvline(mean_length, color='red', linestyle='--', linewidth=2,
+                            label=f'Mean: {mean_length:.1f}')
+    ax1.legend()
+    
+    points = ax2.scatter(data['prompt_length'], data['response_length'],
+                         alpha=0.6, color='#FF6B6B')
+    ax2.set_title('Prompt vs Response Length', fontsize=14, fontweight='bold')
+    ax2.set_xlabel('Prompt Length (characters)', fontsize=12)
+    ax2.set_ylabel('Response Length (characters)', fontsize=12)
+    ax2.grid(True, alpha=0.3)
+    
+    p = np.poly1d(data['trend'])
+    trend_line, = ax2.plot(data['prompt_length'], p(data['prompt_length']),
+                           "r--", alpha=0.8, linewidth=2, label='Trend Line')
+    ax2.legend()
+    
+    fig.suptitle('Response Analysis', fontsize=16, fontweight='bold', y=1.02)
+    fig.tight_layout()
+    return fig, {'ax1': ax1, 'patches': patches, 'mean_line': mean_line,
+                 'ax2': ax2, 'points': points, 'trend_line': trend_line}
+
+def update_response_analysis(fig, artists, data):
+    ax1, ax2 = artists['ax1'], artists['ax2']
+    counts, edges = np.histogram(data['response_length'], bins=len(artists['patches']))
+    for patch, left, width, count in zip(artists['patches'], edges[:-1], np.diff(edges), counts):
+        patch.set_x(left)
+        patch.set_width(width)
+        patch.set_height(count)
+    mean_length = data['mean_response_length']
+    artists['mean_line'].set_xdata([mean_length, mean_length])
+    artists['mean_line'].set_label(f'Mean: {mean_length:.1f}')
+    ax1.legend()
+    ax1.relim()
+    ax1.autoscale_view()
+    
+    artists['points'].set_offsets(np.column_stack([data['prompt_length'], data['response_length']]))
+    p = np.poly1d(data['trend'])
+    artists['trend_line'].set_data(data['prompt_length'], p(data['prompt_length']))
+    # relim() only covers lines and patches; add the scatter points back in
+    ax2.relim()
+    ax2.update_datalim(artists['points'].get_offsets())
+    ax2.autoscale_view()
+    _relayout(fig)
+    return True
+
+def draw_evaluation_summary_table(data):
+    table_data = data['table_data']
+    
+    fig, ax = plt.subplots(figsize=(14, 8))
+    ax.axis('tight')
+    ax.axis('off')
+    
+    table = ax.table(cellText=table_data, loc='center', cellLoc='left',
+                    colWidths=[0.3, 0.2, 0.5])
+    table.auto_set_font_size(False)
+    table.set_fontsize(11)
+    table.scale(1, 2)
+    
+    for i in range(3):
+        table[(0, i)].set_facecolor('#4ECDC4')
+        table[(0, i)].set_text_props(weight='bold', color='white')
+    
+    for i in range(1, len(table_data)):
+        for j in range(3):
+            if i % 2 == 0:
+                table[(i, j)].set_facecolor('#f0f0f0')
+    
+    ax.set_title('Chatbot Evaluation Summary', fontsize=16, fontweight='bold', pad=20)
+    return fig, {'table': table, 'shape': (len(table_data), 3)}
+
+def update_evaluation_summary_table(fig, artists, data):
+    table_data = data['table_data']
+    if (len(table_data), len(table_data[0])) != artists['shape']:
+        return False
+    for i, row in enumerate(table_data):
+        for j, value in enumerate(row):
+            artists['table'][(i, j)].get_text().set_text(value)
+    return True
+
+def _render(draw, data, output_path):
+    fig, _ = draw(data)
+    try:
+        return _save_figure(fig, output_path)
+    finally:
+        plt.close(fig)
+
+def render_query_type_distribution(data, output_path):
+    return _render(draw_query_type_distribution, data, output_path)
+
+def render_agent_action_analytics(data, output_path):
+    return _render(draw_agent_action_analytics, data, output_path)
+
+def render_user_activity_timeline(data, output_path):
+    return _render(draw_user_activity_timeline, data, output_path)
+
+def render_response_analysis(data, output_path):
+    return _render(draw_response_analysis, data, output_path)
+
+def render_evaluation_summary_table(data, output_path):
+    return _render(draw_evaluation_summary_table, data, output_path)
+
+def _same_data(old, new):
+    """Whether two chart data dicts hold equal values, comparing arrays element-wise"""
+    if old.keys() != new.keys():
+        return False
+    for key, value in old.items():
+        if isinstance(value, np.ndarray) or isinstance(new[key], np.ndarray):
+            if not np.array_equal(value, new[key]):
+                return False
+        elif value != new[key]:
+            return False
+    return True
+
+class LiveChartData:
+    """Running aggregates behind the watch-mode charts, fed only the rows appended to the frame
+    
+    add() folds a batch of new rows into counts, sums and growing length
+    arrays; the *_data methods return the same dicts as the ChatVisualizer
+    data methods without another pass over the whole frame.
+    """
+    
+    def __init__(self):
+        self.rows = 0
+        self.query_types = {}
+        self.with_actions = 0
+        self.action_status = {'success': 0, 'error': 0}
+        self.successes = 0
+        self.hours = np.zeros(24, dtype=np.int64)
+        self.days = {}
+        self.users = set()
+        self.prompt_chars = 0
+        self.response_chars = 0
+        # Least-squares sums for the prompt -> response length trend line
+        self.sum_xx = 0.0
+        self.sum_xy = 0.0
+        self._lengths = np.empty((2, 1024), dtype=np.int64)
+    
+    def add(self, frame):
+        """Fold rows of the analyzer frame (VISUALIZATION_COLUMNS) into the aggregates"""
+        if frame is None or frame.empty:
+            return
+        for query_type, count in frame['query_type'].value_counts().items():
+            self.query_types[query_type] = self.query_types.get(query_type, 0) + int(count)
+        has_action = frame['has_agent_action'].to_numpy(dtype=bool)
+        self.with_actions += int(has_action.sum())
+        action_status = frame['status'][has_action]
+        for status in self.action_status:
+            self.action_status[status] += int((action_status == status).sum())
+        self.successes += int((frame['status'] == 'success').sum())
+        for hour, count in frame.groupby('hour').size().items():
+            self.hours[int(hour)] += count
+        for day, count in frame.groupby('date').size().items():
+            self.days[day] = self.days.get(day, 0) + int(count)
+        self.users.update(frame['user_email'].dropna().unique())
+        
+        prompt_length = frame['prompt_length'].to_numpy(dtype=np.int64)
+        response_length = frame['response_length'].to_numpy(dtype=np.int64)
+        size = self.rows + len(frame)
+        if size > self._lengths.shape[1]:
+            grown = np.empty((2, max(size, 2 * self._lengths.shape[1])), dtype=np.int64)
+            grown[:, :self.rows] = self._lengths[:, :self.rows]
+            self._lengths = grown
+        self._lengths[0, self.rows:size] = prompt_length
+        self._lengths[1, self.rows:size] = response_length
+        self.rows = size
+        self.prompt_chars += int(prompt_length.sum())
+        self.response_chars += int(response_length.sum())
+        self.sum_xx += float(np.dot(prompt_length, prompt_length))
+        self.sum_xy += float(np.dot(prompt_length, response_length))
+    
+    def _query_counts(self):
+        return sorted(self.query_types.items(), key=lambda item: -item[1])
+    
+    def query_type_distribution_data(self):
+        counts = self._query_counts()
+        return {'labels': [name for name, _ in counts], 'counts': [count for _, count in counts]}
+    
+    def agent_action_analytics_data(self):
+        action_counts = sorted((count for count in (self.rows - self.with_actions, self.with_actions) if count),
+                               reverse=True)
+        return {'action_counts': action_counts, **self.action_status}
+    
+    def user_activity_timeline_data(self):
+        days = sorted(self.days)
+        return {
+            'hourly_counts': self.hours.tolist(),
+            'daily_dates': days,
+            'daily_counts': [self.days[day] for day in days],
+        }
+    
+    def response_analysis_data(self):
+        prompt_length = self._lengths[0, :self.rows]
+        response_length = self._lengths[1, :self.rows]
+        n = self.rows
+        mean_x, mean_y = self.prompt_chars / n, self.response_chars / n
+        variance = self.sum_xx - n * mean_x * mean_x
+        slope = (self.sum_xy - n * mean_x * mean_y) / variance if variance else 0.0
+        return {
+            'prompt_length': prompt_length,
+            'response_length': response_length,
+            'mean_response_length': float(mean_y),
+            'trend': np.array([slope, mean_y - slope * mean_x]),
+        }
+    
+    def evaluation_summary_table_data(self):
+        query_counts = self._query_counts()
+        table_data = [
+            ['Metric', 'Value', 'Description'],
+            ['Total Conversations', str(self.rows), 'Total number of chat interactions'],
+            ['Unique Users', str(len(self.users)), 'Number of distinct users'],
+            ['Success Rate', f"{self.successes / self.rows:.1%}", 'Percentage of successful responses'],
+            ['Agent Actions Triggered', str(self.with_actions), 'Number of times agent actions were executed'],
+            ['Avg Prompt Length', f"{self.prompt_chars / self.rows:.1f} chars", 'Average user input length'],
+            ['Avg Response Length', f"{self.response_chars / self.rows:.1f} chars", 'Average AI response length'],
+            ['Most Common Query Type', query_counts[0][0] if query_counts else 'N/A', 'Most frequent type of user query'],
+            ['Peak Activity Hour', f"{int(self.hours.argmax())}:00", 'Hour with most user activity'],
+        ]
+        return {'table_data': table_data}
+
+def _init_render_worker():
+    plt.switch_backend('Agg')
+
+def _timed_render(render, data, output_path):
+    start = time.perf_counter()
+    render(data, output_path)
+    return time.perf_counter() - start
+
 class ChatVisualizer:
+    # chart name -> (data method, render function, file name, label for messages)
+    CHARTS = {
+        'query_type_distribution': ('_query_type_distribution_data', render_query_type_distribution,
+                                    "query_type_distribution.png", "Query type distribution chart"),
+        'agent_action_analytics': ('_agent_action_analytics_data', render_agent_action_analytics,
+                                   "agent_action_analytics.png", "Agent action analytics chart"),
+        'user_activity_timeline': ('_user_activity_timeline_data', render_user_activity_timeline,
+                                   "user_activity_timeline.png", "User activity timeline chart"),
+        'response_analysis': ('_response_analysis_data', render_response_analysis,
+                              "response_analysis.png", "Response analysis chart"),
+        'evaluation_summary_table': ('_evaluation_summary_table_data', render_evaluation_summary_table,
+                                     "evaluation_summary_table.png", "Evaluation summary table"),
+    }
+    # chart name -> (draw function, in-place update function) for watch mode
+    LIVE_CHARTS = {
+        'query_type_distribution': (draw_query_type_distribution, update_query_type_distribution),
+        'agent_action_analytics': (draw_agent_action_analytics, update_agent_action_analytics),
+        'user_activity_timeline': (draw_user_activity_timeline, update_user_activity_timeline),
+        'response_analysis': (draw_response_analysis, update_response_analysis),
+        'evaluation_summary_table': (draw_evaluation_summary_table, update_evaluation_summary_table),
+    }
+    
     def __init__(self, analyzer=None):
         self.analyzer = analyzer or ChatLogAnalyzer()
         self.output_dir = Path("analysis_results/charts")
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.render_times = {}
+        self.live = None
     
-    def create_query_type_distribution(self):
-        """Create bar chart showing query type distribution"""
-        if self.analyzer.df is None:
-            print("ERROR: No data loaded")
-            return None
-        
+    def _query_type_distribution_data(self):
         query_counts = self.analyzer.df['query_type'].value_counts()
-        fig, ax = plt.subplots(figsize=(10, 6))
-        
-        bars = ax.bar(query_counts.index, query_counts.values, 
-                      color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7'])
-        
-        ax.set_title('Distribution of User Query Types', fontsize=16, fontweight='bold', pad=20)
-        ax.set_xlabel('Query Type', fontsize=12)
-        ax.set_ylabel('Number of Queries', fontsize=12)
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                   f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-        
-        plt.xticks(rotation=45, ha='right')
-        ax.grid(axis='y', alpha=0.3)
-        plt.tight_layout()
-        
-        output_path = self.output_dir / "query_type_distribution.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Query type distribution chart saved to {output_path}")
-        return output_path
+        return {'labels': list(query_counts.index), 'counts': query_counts.values.tolist()}
     
-    def create_agent_action_analytics(self):
-        """Create pie chart and bar chart for agent actions"""
-        if self.analyzer.df is None:
-            print("ERROR: No data loaded")
-            return None
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        action_counts = self.analyzer.df['has_agent_action'].value_counts()
-        ax1.pie(action_counts.values, labels=['No Agent Action', 'Has Agent Action'], 
-               colors=['#FF6B6B', '#4ECDC4'], autopct='%1.1f%%',
-               startangle=90, textprops={'fontsize': 12})
-        ax1.set_title('Agent Action Trigger Rate', fontsize=14, fontweight='bold')
-        
-        action_success = self.analyzer.df[self.analyzer.df['has_agent_action']]['status'].value_counts()
-        bars = ax2.bar(['Success', 'Error'], 
-                      [action_success.get('success', 0), action_success.get('error', 0)],
-                      color=['#4ECDC4', '#FF6B6B'])
-        
-        ax2.set_title('Agent Action Success Rate', fontsize=14, fontweight='bold')
-        ax2.set_ylabel('Number of Actions', fontsize=12)
-        
-        for bar in bars:
-            height = bar.get_height()
-            ax2.text(bar.get_x() + bar.get_width()/2., height + 0.1,
-                    f'{int(height)}', ha='center', va='bottom', fontweight='bold')
-        
-        ax2.grid(axis='y', alpha=0.3)
-        plt.suptitle('Agent Action Analytics', fontsize=16, fontweight='bold', y=1.02)
-        plt.tight_layout()
-        
-        output_path = self.output_dir / "agent_action_analytics.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Agent action analytics chart saved to {output_path}")
-        return output_path
+    def _agent_action_analytics_data(self):
+        df = self.analyzer.df
+        action_success = df[df['has_agent_action']]['status'].value_counts()
+        return {
+            'action_counts': df['has_agent_action'].value_counts().values.tolist(),
+            'success': int(action_success.get('success', 0)),
+            'error': int(action_success.get('error', 0)),
+        }
     
-    def create_user_activity_timeline(self):
-        """Create timeline chart showing user activity patterns"""
+    def _user_activity_timeline_data(self):
         if self.analyzer.df is None:
-            print("ERROR: No data loaded")
-            return None
-        
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(15, 10))
-        
-        hourly_activity = self.analyzer.df.groupby('hour').size()
-        hours = list(range(24))
-        activity_counts = [hourly_activity.get(hour, 0) for hour in hours]
-        
-        ax1.bar(hours, activity_counts, color='#45B7D1', alpha=0.7)
-        ax1.set_title('User Activity by Hour of Day', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Hour of Day', fontsize=12)
-        ax1.set_ylabel('Number of Conversations', fontsize=12)
-        ax1.set_xticks(range(0, 24, 2))
-        ax1.grid(axis='y', alpha=0.3)
-        
-        max_activity = max(activity_counts)
-        peak_hours = [i for i, count in enumerate(activity_counts) if count == max_activity]
-        for hour in peak_hours:
-            ax1.axvline(x=hour, color='red', linestyle='--', alpha=0.5, label=f'Peak: {hour}:00')
-        ax1.legend()
-        
-        daily_activity = self.analyzer.df.groupby('date').size()
-        ax2.plot(daily_activity.index, daily_activity.values, 
-                marker='o', linewidth=2, markersize=6, color='#4ECDC4')
-        ax2.set_title('Daily Conversation Trend', fontsize=14, fontweight='bold')
-        ax2.set_xlabel('Date', fontsize=12)
-        ax2.set_ylabel('Number of Conversations', fontsize=12)
-        ax2.grid(True, alpha=0.3)
-        plt.setp(ax2.xaxis.get_majorticklabels(), rotation=45, ha='right')
-        
-        plt.suptitle('User Activity Timeline Analysis', fontsize=16, fontweight='bold', y=0.98)
-        plt.tight_layout()
-        
-        output_path = self.output_dir / "user_activity_timeline.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"User activity timeline chart saved to {output_path}")
-        return output_path
+            activity = self.analyzer.analyze_user_activity()
+            hourly_activity, daily_activity = activity['hourly_activity'], activity['daily_activity']
+        else:
+            hourly_activity = self.analyzer.df.groupby('hour').size()
+            daily_activity = self.analyzer.df.groupby('date').size()
+        return {
+            'hourly_counts': [int(hourly_activity.get(hour, 0)) for hour in range(24)],
+            'daily_dates': list(daily_activity.index),
+            'daily_counts': daily_activity.values.tolist(),
+        }
     
-    def create_response_analysis(self):
-        """Create analysis of response lengths and patterns"""
-        if self.analyzer.df is None:
-            print("ERROR: No data loaded")
-            return None
-        
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(15, 6))
-        
-        ax1.hist(self.analyzer.df['response_length'], bins=20, color='#96CEB4', 
-                alpha=0.7, edgecolor='black')
-        ax1.set_title('Response Length Distribution', fontsize=14, fontweight='bold')
-        ax1.set_xlabel('Response Length (characters)', fontsize=12)
-        ax1.set_ylabel('Frequency', fontsize=12)
-        ax1.grid(axis='y', alpha=0.3)
-        
-        mean_length = self.analyzer.df['response_length'].mean()
-        ax1.axvline(mean_length, color='red', linestyle='--', linewidth=2, 
-                   label=f'Mean: {mean_length:.1f}')
-        ax1.legend()
-        
-        ax2.scatter(self.analyzer.df['prompt_length'], self.analyzer.df['response_length'], 
-                   alpha=0.6, color='#FF6B6B')
-        ax2.set_title('Prompt vs Response Length', fontsize=14, fontweight='bold')
-        ax2.set_xlabel('Prompt Length (characters)', fontsize=12)
-        ax2.set_ylabel('Response Length (characters)', fontsize=12)
-        ax2.grid(True, alpha=0.3)
-        
-        z = np.polyfit(self.analyzer.df['prompt_length'], self.analyzer.df['response_length'], 1)
-        p = np.poly1d(z)
-        ax2.plot(self.analyzer.df['prompt_length'], p(self.analyzer.df['prompt_length']), 
-                "r--", alpha=0.8, linewidth=2, label='Trend Line')
-        ax2.legend()
-        
-        plt.suptitle('Response Analysis', fontsize=16, fontweight='bold', y=1.02)
-        plt.tight_layout()
-        
-        output_path = self.output_dir / "response_analysis.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        print(f"Response analysis chart saved to {output_path}")
-        return output_path
+    def _response_analysis_data(self):
+        prompt_length = self.analyzer.df['prompt_length'].to_numpy()
+        response_length = self.analyzer.df['response_length'].to_numpy()
+        return {
+            'prompt_length': prompt_length,
+            'response_length': response_length,
+            'mean_response_length': float(response_length.mean()),
+            'trend': np.polyfit(prompt_length, response_length, 1),
+        }
     
-    def create_evaluation_summary_table(self):
-        """Create a summary table for evaluation metrics"""
-        if self.analyzer.df is None:
-            print("ERROR: No data loaded")
-            return None
-        
+    def _evaluation_summary_table_data(self):
         stats = self.analyzer.generate_basic_stats()
         query_analysis = self.analyzer.analyze_query_types()
-        action_stats, action_types = self.analyzer.analyze_agent_actions()
-        
-        fig, ax = plt.subplots(figsize=(14, 8))
-        ax.axis('tight')
-        ax.axis('off')
         
         table_data = [
             ['Metric', 'Value', 'Description'],
@@ -200,57 +505,199 @@ class ChatVisualizer:
             ['Most Common Query Type', query_analysis.index[0] if query_analysis is not None else 'N/A', 'Most frequent type of user query'],
             ['Peak Activity Hour', str(self.analyzer.df.groupby('hour').size().idxmax()) + ':00', 'Hour with most user activity'],
         ]
+        return {'table_data': table_data}
+    
+    def _create_chart(self, name):
+        if self.analyzer.df is None and not (name in ROLLUP_CHARTS and self.analyzer.rollup is not None):
+            print("ERROR: No data loaded")
+            return None
         
-        table = ax.table(cellText=table_data, loc='center', cellLoc='left',
-                        colWidths=[0.3, 0.2, 0.5])
-        table.auto_set_font_size(False)
-        table.set_fontsize(11)
-        table.scale(1, 2)
-        
-        for i in range(3):
-            table[(0, i)].set_facecolor('#4ECDC4')
-            table[(0, i)].set_text_props(weight='bold', color='white')
-        
-        for i in range(1, len(table_data)):
-            for j in range(3):
-                if i % 2 == 0:
-                    table[(i, j)].set_facecolor('#f0f0f0')
-        
-        plt.title('Chatbot Evaluation Summary', fontsize=16, fontweight='bold', pad=20)
-        
-        output_path = self.output_dir / "evaluation_summary_table.png"
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        data_method, render, file_name, label = self.CHARTS[name]
+        output_path = self.output_dir / file_name
+        self.render_times[name] = _timed_render(render, getattr(self, data_method)(), output_path)
         
-        print(f"Evaluation summary table saved to {output_path}")
+        print(f"{label} saved to {output_path}")
         return output_path
     
-    def generate_all_visualizations(self):
-        """Generate all visualizations"""
+    def create_query_type_distribution(self):
+        """Create bar chart showing query type distribution"""
+        return self._create_chart('query_type_distribution')
+    
+    def create_agent_action_analytics(self):
+        """Create pie chart and bar chart for agent actions"""
+        return self._create_chart('agent_action_analytics')
+    
+    def create_user_activity_timeline(self):
+        """Create timeline chart showing user activity patterns"""
+        return self._create_chart('user_activity_timeline')
+    
+    def create_response_analysis(self):
+        """Create analysis of response lengths and patterns"""
+        return self._create_chart('response_analysis')
+    
+    def create_evaluation_summary_table(self):
+        """Create a summary table for evaluation metrics"""
+        return self._create_chart('evaluation_summary_table')
+    
+    def _render_parallel(self, max_workers=None):
+        """Render every chart in a process pool; returns {name: path} for the charts that succeeded"""
+        rendered = {}
+        with ProcessPoolExecutor(max_workers=max_workers or len(self.CHARTS),
+                                 initializer=_init_render_worker) as pool:
+            futures = {}
+            for name, (data_method, render, file_name, label) in self.CHARTS.items():
+                output_path = self.output_dir / file_name
+                futures[name] = (pool.submit(_timed_render, render, getattr(self, data_method)(), output_path),
+                                 output_path, label)
+            for name, (future, output_path, label) in futures.items():
+                try:
+                    self.render_times[name] = future.result()
+                    rendered[name] = output_path
+                    print(f"{label} saved to {output_path}")
+                except Exception as e:
+                    print(f"Warning: Parallel rendering of {name} failed: {e}")
+        return rendered
+    
+    def _follow_live_data(self, new_rows):
+        """Fold the rows follow_logs just appended to the frame into self.live"""
+        df = self.analyzer.df
+        if self.live is None or new_rows == len(df):
+            # First load, or follow_logs rebuilt the frame
+            self.live = LiveChartData()
+            self.live.add(df)
+        elif new_rows:
+            self.live.add(df.iloc[len(df) - new_rows:])
+    
+    def _refresh_live_charts(self, figures):
+        """Update and re-save the open figures whose data changed; returns the paths saved
+
+        Chart data comes from the running aggregates in self.live, so only
+        new rows are ever read. figures maps chart name -> (figure, artists, data it shows) and is
+        updated in place. A figure whose layout no longer fits the data is
+        closed and drawn again.
+        """
+        saved = []
+        for name, (_, _, file_name, label) in self.CHARTS.items():
+            try:
+                data = getattr(self.live, f'{name}_data')()
+                current = figures.get(name)
+                if current is not None and _same_data(current[2], data):
+                    continue
+                
+                start = time.perf_counter()
+                draw, update = self.LIVE_CHARTS[name]
+                if current is not None and update(current[0], current[1], data):
+                    fig, artists = current[0], current[1]
+                else:
+                    if current is not None:
+                        plt.close(current[0])
+                    fig, artists = draw(data)
+                figures[name] = (fig, artists, data)
+                output_path = _save_figure(fig, self.output_dir / file_name)
+                self.render_times[name] = time.perf_counter() - start
+                print(f"{label} saved to {output_path}")
+                saved.append(output_path)
+            except Exception as e:
+                print(f"Warning: Refreshing {name} failed: {e}")
+        return saved
+    
+    def watch(self, interval=WATCH_INTERVAL, max_checks=None):
+        """Follow the conversation log and keep the chart files up to date
+        
+        Each check ingests only the rows appended since the previous one
+        (ChatLogAnalyzer.follow_logs) and folds only those into running chart
+        aggregates (LiveChartData). The figures stay open between checks:
+        charts whose data changed get their artists updated in place and only
+        their files are saved again. Between checks the loop sleeps, and an
+        unchanged log costs a single stat. Runs until interrupted, or for
+        max_checks checks.
+        """
+        figures = {}
+        checks = 0
+        print(f"Watching {self.analyzer.log_file_path} every {interval:g}s (Ctrl+C to stop)...")
+        try:
+            while max_checks is None or checks < max_checks:
+                if checks:
+                    time.sleep(interval)
+                checks += 1
+                new_rows = self.analyzer.follow_logs(columns=VISUALIZATION_COLUMNS)
+                if not new_rows or self.analyzer.df is None:
+                    continue
+                
+                self._follow_live_data(new_rows)
+                self.render_times = {}
+                saved = self._refresh_live_charts(figures)
+                print(f"{new_rows} new conversation logs; re-saved {len(saved)} of {len(self.CHARTS)} charts")
+        except KeyboardInterrupt:
+            print("\nStopped watching")
+        finally:
+            for fig, _, _ in figures.values():
+                plt.close(fig)
+        return checks
+    
+    def generate_all_visualizations(self, parallel=False, max_workers=None):
+        """Generate all visualizations
+        
+        With parallel=True charts are rendered in a process pool using the Agg
+        backend; any chart that fails there is rendered serially instead.
+        """
         print("Generating all visualizations...")
         
         if self.analyzer.df is None:
             if not self.analyzer.load_logs():
                 return False
         
-        charts = [
-            self.create_query_type_distribution(),
-            self.create_agent_action_analytics(),
-            self.create_user_activity_timeline(),
-            self.create_response_analysis(),
-            self.create_evaluation_summary_table()
-        ]
+        self.render_times = {}
+        rendered = {}
+        if parallel:
+            try:
+                rendered = self._render_parallel(max_workers)
+            except Exception as e:
+                print(f"Warning: Parallel rendering unavailable, falling back to serial: {e}")
         
+        charts = [rendered.get(name) or self._create_chart(name) for name in self.CHARTS]
+        
+        for name, seconds in self.render_times.items():
+            print(f"  {name}: {seconds:.2f}s")
         successful_charts = [chart for chart in charts if chart is not None]
         print(f"Generated {len(successful_charts)} visualizations in {self.output_dir}")
         return successful_charts
 
 def main():
     """Main function to generate all visualizations"""
+    parser = argparse.ArgumentParser(description="Generate chatbot analysis charts")
+    parser.add_argument("--parallel", action="store_true", help="Render charts in a process pool")
+    parser.add_argument("--workers", type=int, default=None, help="Number of render processes")
+    parser.add_argument("--rollup", action="store_true",
+                        help="Only draw the activity timeline, from the write-time rollup instead of the log")
+    parser.add_argument("--watch", action="store_true",
+                        help="Keep following the log, re-saving charts whose data changed")
+    parser.add_argument("--interval", type=float, default=WATCH_INTERVAL,
+                        help="Seconds between log checks in watch mode")
+    args = parser.parse_args()
+    
     print("Starting Visualization Generation...")
     
-    visualizer = ChatVisualizer()
-    charts = visualizer.generate_all_visualizations()
+    analyzer = ChatLogAnalyzer()
+    if args.watch:
+        # Figures stay open between refreshes; they never need a window
+        plt.switch_backend('Agg')
+        ChatVisualizer(analyzer).watch(args.interval)
+        return
+    if args.rollup:
+        if not analyzer.load_rollup():
+            print("\nFailed to generate visualizations")
+            return
+        if ChatVisualizer(analyzer).create_user_activity_timeline() is None:
+            print("\nFailed to generate visualizations")
+        return
+    
+    if not analyzer.load_logs(use_cache=True, columns=VISUALIZATION_COLUMNS):
+        print("\nFailed to generate visualizations")
+        return
+    
+    visualizer = ChatVisualizer(analyzer)
+    charts = visualizer.generate_all_visualizations(parallel=args.parallel, max_workers=args.workers)
     
     if charts:
         print(f"\nAll visualizations generated successfully!")
@@ -259,5 +706,4 @@ def main():
         print("\nFailed to generate visualizations")
 
 if __name__ == "__main__":
-    import numpy as np
     main()